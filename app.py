@@ -8,6 +8,11 @@ ARCHITECTURE:
 2. Check if session exists (FAISS index check)
 3. IF session exists → resume (NO LOADERS)
 4. IF new session → fetch, split, embed, save
+
+Usage:
+    python app.py            # normal
+    python app.py --profile  # per-stage timing breakdown + spans in the session's traces.jsonl
+    python app.py --summary-memory  # older turns folded into a rolling summary (flat prompt size)
 """
 
 import sys
@@ -22,21 +27,29 @@ from rich.console import Console
 from rich.markdown import Markdown
 
 from querynest.config.gemini import get_llm
+from querynest.ingestion.checkpoint import IngestCheckpoint
+from querynest.ingestion.pipeline import ingest_source
 from querynest.loaders.pdf_loader import load_pdfs
 from querynest.loaders.web_loader import load_web_pages
 
 # YouTube loader removed - YouTube now blocks transcript requests
 # from querynest.loaders.youtube_loader import load_youtube_documents
 from querynest.memory.chat_memory import ChatMemory
-from querynest.processor.text_splitter import split_documents
+from querynest.memory.summary_memory import SummaryMemory
 from querynest.rag.rag_chain import build_rag_chain
+from querynest.retriever.adaptive import RETRIEVAL_LOG_FILE, AdaptiveK
+from querynest.retriever.scope import Scope
+from querynest.sessions.identity import resolve_session_id
 from querynest.sessions.session_meta import (
     SessionMeta,
+    SessionOptions,
     load_session_meta,
-    save_session_meta,
+    update_session_meta,
 )
-from querynest.utils.hashing import generate_session_id
+from querynest.sessions.usage import commit_usage
+from querynest.utils import tracing
 from querynest.utils.paths import ensure_base_dirs, get_session_dir
+from querynest.utils.tracing import span
 from querynest.vector_store.faiss_store import FaissStore
 
 # Initialize Rich console
@@ -94,7 +107,7 @@ def collect_source_metadata():
         sys.exit(1)
 
 
-def fetch_source_documents(source_type: str, source_key: str):
+def fetch_source_documents(source_type: str, source_key: str, session_id: str):
     """
     Fetches documents based on source type
     """
@@ -110,7 +123,7 @@ def fetch_source_documents(source_type: str, source_key: str):
     elif source_type == "web":
         # Split by comma if multiple URLs provided
         urls = [url.strip() for url in source_key.split(",") if url.strip()]
-        return load_web_pages(urls)
+        return load_web_pages(urls, session_id)
 
     else:
         raise ValueError(f"Unknown source type: {source_type}")
@@ -133,8 +146,45 @@ def check_for_config_commands():
         print("\nAPI key updated. Continuing...\n")
 
 
+def print_progress(done: int, total: int):
+    print(f"\rEmbedded {done}/{total} chunks", end="" if done < total else "\n", flush=True)
+
+
+def ingest(store, session_id, source_type, session_key, options, checkpoint):
+    """
+    Fetch → split → embed + index, har stage ke baad checkpoint
+    (jo stage checkpoint mein complete hai wo dubara nahi chalta - pipeline.ingest_source).
+    Returns: build stats (meta.build)
+    """
+    build = ingest_source(
+        store,
+        session_id,
+        source_type,
+        session_key,
+        options,
+        checkpoint,
+        load=lambda: fetch_source_documents(source_type, session_key, session_id),
+        progress=print_progress,
+    )
+    print("Vector store built successfully")
+    return build
+
+
+def print_traces(traces: list):
+    """
+    --profile: har completed trace ka per-stage breakdown
+    """
+    for spans in traces:
+        print()
+        print(tracing.format_breakdown(spans))
+        print()
+    traces.clear()
+
+
 def main():
     ensure_base_dirs()
+    profile = "--profile" in sys.argv[1:]
+    summary_memory = "--summary-memory" in sys.argv[1:]
 
     # Config commands check
     check_for_config_commands()
@@ -143,27 +193,60 @@ def main():
     source_type, session_key = collect_source_metadata()
 
     # STEP 2: Compute session ID and check existence of session
-    session_id = generate_session_id(session_key)
+    session_id = resolve_session_id(session_key, source_type)
     session_dir = get_session_dir(session_id)
 
     print(f"\nSession ID: {session_id[:8]}...")
 
+    traces = []
+    if profile:
+        tracer = tracing.enable(session_dir / "traces.jsonl")
+        tracer.on_trace(traces.append)
+
     # STEP 3: Check if FAISS index exists
     store = FaissStore()
     session_exists = store.load(session_id)
 
+    compacted = None if session_exists else load_session_meta(session_dir)
+    if compacted and compacted.compacted_at:
+        # sessions gc ne index hataya tha - checkpoint ke chunk text se sirf re-embed
+        print("Session was compacted by 'sessions gc' - rebuilding its index")
+        options = compacted.options.model_copy()
+        checkpoint = IngestCheckpoint(session_dir)
+        if not checkpoint.resume(compacted.source, options):
+            checkpoint.start(compacted.name, compacted.source, options)
+
+        try:
+            build = ingest(store, session_id, source_type, session_key, options, checkpoint)
+        except Exception as e:
+            print(f"\nRebuild failed: {e}")
+            sys.exit(1)
+        build.kind = "restore"
+        build.pages = build.pages or (compacted.build.pages if compacted.build else 0)
+
+        def restored(m):
+            m.options = options
+            m.compacted_at = None
+            m.build = build
+
+        commit_usage(session_dir, update_session_meta(session_dir, restored), "restore")
+        checkpoint.clear()
+        session_exists = True
+
     # BRANCHING: Resume vs New Session
     if session_exists:
         # SESSION RESUME PATH
         print("Session resumed from disk")
 
-        # Load existing metadata
-        existing_meta = load_session_meta(session_dir)
+        # Load existing metadata + last_used_at update (lock ke andar disk ke fresh meta par)
+        existing_meta = update_session_meta(
+            session_dir, lambda m: setattr(m, "last_used_at", SessionMeta.now())
+        )
+        # turns ka token usage isi meta mein add hota hai
+        meta = existing_meta
+        options = existing_meta.options if existing_meta else SessionOptions()
 
         if existing_meta:
-            # Update last_used_at timestamp
-            existing_meta.last_used_at = SessionMeta.now()
-            save_session_meta(session_dir, existing_meta)
             print(f"Session name: {existing_meta.name}")
             print(f"Source type: {existing_meta.source_type.upper()}")
         else:
@@ -172,33 +255,40 @@ def main():
     else:
         # NEW SESSION - Ask for name
         print("New session – setting up...")
-        session_name = input(
-            "Enter a name for this session (optional, press Enter to use default): "
-        ).strip()
+        options = SessionOptions()
+        checkpoint = IngestCheckpoint(session_dir)
 
-        # Use default name if user didn't provide one
-        if not session_name:
-            if source_type == "pdf":
-                # Use filename or directory name
-                session_name = session_key.rstrip("/").split("/")[-1]
-            else:
-                # Use first 50 chars of URL
-                session_name = session_key[:50]
+        if checkpoint.resume(session_key, options):
+            # pichli baar ingestion beech mein ruk gayi thi
+            session_name = checkpoint.session_name
+            print(f"Resuming interrupted ingestion (stage: {checkpoint.stage})")
+        else:
+            session_name = input(
+                "Enter a name for this session (optional, press Enter to use default): "
+            ).strip()
 
-        print(f"\nSession name: {session_name}")
+            # Use default name if user didn't provide one
+            if not session_name:
+                if source_type == "pdf":
+                    # Use filename or directory name
+                    session_name = session_key.rstrip("/").split("/")[-1]
+                else:
+                    # Use first 50 chars of URL
+                    session_name = session_key[:50]
 
-        # STEP 4: Fetch documents
-        documents = fetch_source_documents(source_type, session_key)
+            checkpoint.start(session_name, session_key, options)
 
-        # STEP 5: Split documents into chunks
-        print("Splitting documents into chunks...")
-        chunks = split_documents(documents)
-        print(f"Created {len(chunks)} chunks")
+        print(f"\nSession name: {session_name}")
 
-        # STEP 6: Build FAISS index with embeddings
-        print("Building FAISS vector store (this may take a moment)...")
-        store.build(chunks, session_id)
-        print("Vector store built successfully")
+        try:
+            build = ingest(store, session_id, source_type, session_key, options, checkpoint)
+        except KeyboardInterrupt:
+            print("\nIngestion interrupted. Progress is saved - run again with the same source to resume.")
+            sys.exit(130)
+        except Exception as e:
+            print(f"\nIngestion failed: {e}")
+            print("Progress is saved - run again with the same source to resume.")
+            sys.exit(1)
 
         # STEP 7: Create and save session metadata
         meta = SessionMeta(
@@ -208,42 +298,75 @@ def main():
             source_type=source_type,
             created_at=SessionMeta.now(),
             last_used_at=SessionMeta.now(),
+            options=options,
+            build=build,
         )
-        save_session_meta(session_dir, meta)
+        commit_usage(session_dir, meta, "ingest")
+        checkpoint.clear()
         print(f"Session saved: {session_name}")
 
-    # Chat memory (both paths)
-    memory = ChatMemory(session_id)
+    print_traces(traces)
 
     # LLM + RAG chain (both paths)
     llm = get_llm()
-    retriever = store.get_retriever(k=6)
+
+    # Chat memory (both paths) - --summary-memory: purane turns rolling summary mein
+    memory = SummaryMemory(session_id, llm) if summary_memory else ChatMemory(session_id)
+    retriever = store.get_retriever(
+        k=6,
+        rescore=options.rescore,
+        candidates=options.rescore_candidates,
+        lexical_weight=options.lexical_weight,
+        adaptive=AdaptiveK.from_options(options),
+        log_path=session_dir / RETRIEVAL_LOG_FILE,
+    )
     rag_chain = build_rag_chain(llm, retriever)
 
-    print("\nChat started! Ask questions (type 'exit' to quit)\n")
+    print("\nChat started! Ask questions (type 'exit' to quit, '/scope' to limit the search)\n")
 
     # Chatting loop
     while True:
         query = input("You: ").strip()
 
         if query.lower() in {"exit", "quit"}:
+            # summary ka aakhri fold disk par pahunch jaaye (uske tokens bhi meta mein)
+            memory.flush()
+            if summary_memory:
+                commit_usage(session_dir, meta, "summary")
             print("Bye!!!")
             break
 
         if not query:
             continue
 
+        # /scope source=<file> pages=<a>-<b> type=pdf|web  (/scope clear → poora session)
+        command, _, scope_args = query.partition(" ")
+        if command == "/scope":
+            try:
+                scope = Scope() if scope_args.strip() == "clear" else Scope.parse(scope_args)
+            except ValueError as e:
+                print(f"{e}\n")
+                continue
+            store.set_scope(scope)
+            chunks = int(store.metadata_index().mask(scope).sum())
+            print(f"Scope: {scope.describe()} ({chunks} chunks)\n")
+            continue
+
         memory.add_user_message(query)
 
         # Inject chat history into query
         chat_context = memory.get_context()
         final_query = f"{chat_context}\nUser: {query}"
 
-        answer = rag_chain.invoke(final_query)
+        with span("chat.turn"):
+            answer = rag_chain.invoke(final_query)
 
         console.print("\n[bold green]Assistant[/bold green]")
         console.print(Markdown(answer))
         console.print()  # spacing
+        print_traces(traces)
+
+        commit_usage(session_dir, meta, "turn")
 
         memory.add_assistant_message(answer)
 
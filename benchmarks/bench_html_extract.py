@@ -0,0 +1,132 @@
+"""
+HTML extraction benchmark
+
+- benchmarks/html_corpus/ ke saved pages par dono engines chalata hai
+  (readability = current path, fast = single-pass lxml path)
+- Har page ke liye throughput (ms/page, MB/s) aur
+  readability output ke against text similarity report karta hai
+
+Usage:
+    python benchmarks/bench_html_extract.py
+    python benchmarks/bench_html_extract.py --repeat 50 --corpus /path/to/html --json results.json
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from querynest.loaders.web_loader import EXTRACTORS
+
+DEFAULT_CORPUS = Path(__file__).parent / "html_corpus"
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _similarity(reference: str, candidate: str) -> dict:
+    """
+    Word-level similarity:
+    - recall    : reference words jo candidate mein bhi hain
+    - precision : candidate words jo reference mein bhi hain
+    - jaccard   : unique word sets ka overlap
+    """
+    ref_words = _WORD_RE.findall(reference.lower())
+    cand_words = _WORD_RE.findall(candidate.lower())
+
+    ref_set, cand_set = set(ref_words), set(cand_words)
+    common = ref_set & cand_set
+
+    return {
+        "recall": len(common) / len(ref_set) if ref_set else 1.0,
+        "precision": len(common) / len(cand_set) if cand_set else 1.0,
+        "jaccard": len(common) / len(ref_set | cand_set) if ref_set | cand_set else 1.0,
+        "length_ratio": len(cand_words) / len(ref_words) if ref_words else 1.0,
+    }
+
+
+def _time_extractor(fn, html: str, repeat: int) -> tuple[float, str]:
+    # warm-up (imports, regex compile etc.)
+    text = fn(html)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / repeat, text
+
+
+def run(corpus: Path, repeat: int) -> list[dict]:
+    pages = sorted(corpus.glob("*.html"))
+    if not pages:
+        raise SystemExit(f"No .html files found in {corpus}")
+
+    results = []
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        size_mb = len(html.encode("utf-8")) / 1_000_000
+
+        texts = {}
+        row = {"page": page.name, "bytes": len(html.encode("utf-8"))}
+
+        for name, fn in EXTRACTORS.items():
+            seconds, texts[name] = _time_extractor(fn, html, repeat)
+            row[name] = {
+                "ms_per_page": seconds * 1000,
+                "mb_per_s": size_mb / seconds if seconds else 0.0,
+                "chars": len(texts[name]),
+            }
+
+        row["similarity"] = _similarity(texts["readability"], texts["fast"])
+        results.append(row)
+
+    return results
+
+
+def _print_report(results: list[dict]):
+    header = (
+        f"{'page':<22}{'KB':>7}{'readab ms':>11}{'fast ms':>9}"
+        f"{'speedup':>9}{'recall':>8}{'prec':>7}{'jacc':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    total_r, total_f = 0.0, 0.0
+    for row in results:
+        r_ms = row["readability"]["ms_per_page"]
+        f_ms = row["fast"]["ms_per_page"]
+        sim = row["similarity"]
+        total_r += r_ms
+        total_f += f_ms
+
+        print(
+            f"{row['page']:<22}{row['bytes'] / 1024:>7.1f}{r_ms:>11.2f}{f_ms:>9.2f}"
+            f"{r_ms / f_ms if f_ms else 0:>8.1f}x"
+            f"{sim['recall']:>8.2f}{sim['precision']:>7.2f}{sim['jaccard']:>7.2f}"
+        )
+
+    print("-" * len(header))
+    print(
+        f"{'total':<22}{'':>7}{total_r:>11.2f}{total_f:>9.2f}"
+        f"{total_r / total_f if total_f else 0:>8.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction engines")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.corpus, args.repeat)
+    _print_report(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+End-to-end RAG pipeline benchmark (fully offline)
+
+- Synthetic PDF / HTML / text corpora generate karta hai (seeded, configurable size)
+- Fake embedding + LLM providers use karta hai (deterministic, configurable latency)
+- In stages ka timing leta hai:
+    load_pdfs, extract_html.<engine>, split.<splitter>,
+    faiss_build.cold (sab embed), faiss_build.warm (segment store hit),
+    faiss_load, retrieve (per query), rag_invoke (per query)
+    (--rescore ho toh retrieve.candidates / retrieve.rescore bhi)
+- Results JSON mein likhta hai (min / median / p95 / mean per stage),
+  aur --compare se pichle run ke against regressions dikhata hai
+
+Saara state ek temporary QUERYNEST_HOME mein rehta hai - ~/.querynest ko touch nahi karta
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --mb 5 --embed-latency 0.05 --llm-latency 0.3 --json run.json
+    python benchmarks/bench_pipeline.py --json new.json --compare run.json --fail-on-regression
+"""
+
+import os
+import tempfile
+
+# querynest imports se pehle set hona chahiye (paths import time par resolve hote hain)
+_HOME = tempfile.mkdtemp(prefix="querynest-bench-")
+os.environ["QUERYNEST_HOME"] = _HOME
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from corpora import make_corpus, make_html_pages, write_pdf_corpus
+from fakes import FakeChatModel, FakeEmbeddings
+from querynest.loaders.pdf_loader import load_pdfs
+from querynest.loaders.web_loader import EXTRACTORS
+from querynest.processor.text_splitter import SPLITTERS, split_documents
+from querynest.ingestion.pipeline import split_children
+from querynest.rag.rag_chain import build_rag_chain
+from querynest.retriever.adaptive import AdaptiveK
+from querynest.retriever.scope import Scope
+from querynest.sessions.session_meta import SessionOptions
+from querynest.storage.segment_store import SegmentStore
+from querynest.utils import tracing
+from querynest.utils.paths import ensure_base_dirs
+from querynest.vector_store.compression import PRECISIONS
+from querynest.vector_store.faiss_store import FaissStore
+
+RESULTS_SCHEMA = 1
+
+_QUERIES = [
+    "what is the retrieval latency of the index",
+    "how does the session cache refresh storage",
+    "explain chunk overlap and token budget",
+    "which model is used for embedding documents",
+    "describe the search similarity score",
+    "what happens to memory during batch parsing",
+    "summarize the header and footer section",
+    "how are prompt and context combined for an answer",
+]
+
+
+def _stats(samples: list[float], **extra) -> dict:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "runs": len(samples),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": p95,
+        "mean": statistics.fmean(ordered),
+        **extra,
+    }
+
+
+def _timed(fn, repeat: int) -> tuple[list[float], object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def _quiet(fn):
+    """
+    load_pdfs jaise functions print karte hain - timing output saaf rakhne ke liye
+    """
+
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return fn()
+
+    return wrapper
+
+
+def run(args) -> dict:
+    ensure_base_dirs()
+    work = Path(_HOME) / "corpus"
+    stages: dict[str, dict] = {}
+
+    def log(name: str):
+        row = stages[name]
+        print(f"  {name:<26}median {row['median'] * 1000:>10.2f} ms   p95 {row['p95'] * 1000:>10.2f} ms")
+
+    print("Generating corpora...")
+    pages = write_pdf_corpus(work / "pdfs", args.pdf_files, args.pdf_pages)
+    html_pages = make_html_pages(args.html_pages)
+    documents = make_corpus(args.mb, args.pages)
+    corpus_mb = sum(len(d.page_content.encode("utf-8")) for d in documents) / 1_000_000
+
+    print("Running stages:")
+
+    # 1. PDF loading - parse (page cache off) aur page cache hit
+    samples, loaded = _timed(
+        _quiet(lambda: load_pdfs(str(work / "pdfs"), use_cache=False)), args.repeat
+    )
+    stages["load_pdfs"] = _stats(samples, pages=pages, loaded_pages=len(loaded))
+    log("load_pdfs")
+
+    _quiet(lambda: load_pdfs(str(work / "pdfs")))()  # page cache warm
+    samples, loaded = _timed(_quiet(lambda: load_pdfs(str(work / "pdfs"))), args.repeat)
+    stages["load_pdfs.cached"] = _stats(samples, pages=pages, loaded_pages=len(loaded))
+    log("load_pdfs.cached")
+
+    # 2. HTML extraction (ek sample = poora HTML corpus)
+    html_mb = sum(len(h.encode("utf-8")) for h in html_pages) / 1_000_000
+    for name, fn in EXTRACTORS.items():
+        samples, _ = _timed(lambda: [fn(h) for h in html_pages], args.repeat)
+        stages[f"extract_html.{name}"] = _stats(samples, pages=len(html_pages), mb=html_mb)
+        log(f"extract_html.{name}")
+
+    # 3. Splitting
+    chunks = []
+    for name in SPLITTERS:
+        samples, result = _timed(
+            lambda: split_documents(
+                documents,
+                chunk_size=args.chunk_size,
+                chunk_overlap=args.chunk_overlap,
+                splitter=name,
+            ),
+            args.repeat,
+        )
+        stages[f"split.{name}"] = _stats(samples, mb=corpus_mb, chunks=len(result))
+        log(f"split.{name}")
+        if name == args.splitter:
+            chunks = result
+
+    # parent-child: children index hote hain, parents prompt mein jaate hain
+    parents = {}
+    if args.parent_child:
+        options = SessionOptions(
+            splitter=args.splitter,
+            parent_child=True,
+            child_chunk_size=args.child_chunk_size,
+            child_chunk_overlap=max(0, args.child_chunk_size // 5),
+        )
+        samples, (chunks, parents) = _timed(lambda: split_children(chunks, options), args.repeat)
+        stages["split.children"] = _stats(samples, parents=len(parents), chunks=len(chunks))
+        log("split.children")
+
+    embeddings = FakeEmbeddings(
+        dim=args.dim,
+        latency=args.embed_latency,
+        text_latency=args.embed_text_latency,
+        batch_size=args.embed_batch,
+    )
+
+    # 4. Index build - cold (har run ka naya segment store) aur warm (vectors reuse)
+    cold = []
+    for i in range(args.repeat):
+        store = FaissStore(embeddings=embeddings)
+        store.segments = SegmentStore(Path(_HOME) / f"cold-{i}.db")
+        start = time.perf_counter()
+        store.build(
+            chunks,
+            f"bench-cold-{i}",
+            precision=args.precision,
+            parents=parents,
+            shard_size=args.shard_size,
+        )
+        cold.append(time.perf_counter() - start)
+    stages["faiss_build.cold"] = _stats(
+        cold, chunks=len(chunks), precision=args.precision, shard_size=args.shard_size
+    )
+    log("faiss_build.cold")
+
+    # bench session shared segment store mein (warm builds + load isi ko use karte hain)
+    build = dict(precision=args.precision, parents=parents, shard_size=args.shard_size)
+    FaissStore(embeddings=embeddings).build(chunks, "bench", **build)
+
+    samples, _ = _timed(
+        lambda: FaissStore(embeddings=embeddings).build(chunks, "bench", **build),
+        args.repeat,
+    )
+    stages["faiss_build.warm"] = _stats(
+        samples, chunks=len(chunks), precision=args.precision, shard_size=args.shard_size
+    )
+    log("faiss_build.warm")
+
+    def load():
+        store = FaissStore(embeddings=embeddings)
+        if not store.load("bench"):
+            raise RuntimeError("Benchmark session failed to load")
+        return store
+
+    samples, store = _timed(load, args.repeat)
+    stages["faiss_load"] = _stats(samples, chunks=len(chunks))
+    log("faiss_load")
+
+    # 5. Retrieval + end-to-end chain (ek sample = ek query)
+    # --scope: filtered search (FAISS id selector)
+    store.set_scope(Scope.parse(args.scope))
+    retriever = store.get_retriever(
+        k=args.k,
+        rescore=args.rescore,
+        candidates=args.candidates,
+        lexical_weight=args.lexical_weight,
+        adaptive=AdaptiveK(max_k=args.k) if args.adaptive_k else None,
+    )
+    queries = [_QUERIES[i % len(_QUERIES)] for i in range(args.queries)]
+
+    # --rescore: dono stages ke spans bhi collect karo (recall vs latency tuning ke liye)
+    stage_samples: dict[str, list[float]] = {}
+    if args.rescore:
+        tracer = tracing.enable()
+        tracer.on_trace(
+            lambda spans: [
+                stage_samples.setdefault(s.name, []).append(s.duration)
+                for s in spans
+                if s.name.startswith("retrieve.")
+            ]
+        )
+
+    samples, returned, context = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        docs = retriever.invoke(query)
+        samples.append(time.perf_counter() - start)
+        returned.append(len(docs))
+        context.append(sum(len(doc.page_content) for doc in docs))
+    tracing.disable()
+    stages["retrieve"] = _stats(
+        samples,
+        k=args.k,
+        rescore=args.rescore,
+        candidates=args.candidates if args.rescore else None,
+        adaptive_k=args.adaptive_k,
+        mean_chunks=statistics.fmean(returned),
+        mean_context_chars=statistics.fmean(context),
+        parent_child=args.parent_child,
+        scope=store.scope.describe(),
+        scoped_chunks=int(store.metadata_index().mask(store.scope).sum()),
+        shard_size=args.shard_size,
+    )
+    log("retrieve")
+    for name, durations in stage_samples.items():
+        stages[name] = _stats(durations)
+        log(name)
+
+    llm = FakeChatModel(
+        latency=args.llm_latency,
+        token_latency=args.llm_token_latency,
+        answer_tokens=args.answer_tokens,
+    )
+    rag_chain = build_rag_chain(llm, retriever)
+
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        rag_chain.invoke(query)
+        samples.append(time.perf_counter() - start)
+    stages["rag_invoke"] = _stats(samples, k=args.k)
+    log("rag_invoke")
+
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {k: v for k, v in vars(args).items() if k not in {"json", "compare", "threshold", "fail_on_regression"}},
+        "stages": stages,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Median latency compare karta hai. Returns: regressed stage names
+    """
+    if baseline.get("config") != current.get("config"):
+        print("\nWarning: baseline was run with a different config - numbers may not be comparable")
+
+    print(f"\n{'stage':<26}{'baseline ms':>13}{'current ms':>13}{'change':>10}")
+    regressions = []
+
+    for name, row in current["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            print(f"{name:<26}{'-':>13}{row['median'] * 1000:>13.2f}{'new':>10}")
+            continue
+
+        change = (row["median"] - old["median"]) / old["median"] if old["median"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+
+        print(
+            f"{name:<26}{old['median'] * 1000:>13.2f}{row['median'] * 1000:>13.2f}"
+            f"{change * 100:>+9.1f}%{flag}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the full RAG pipeline offline")
+
+    corpus = parser.add_argument_group("corpus")
+    corpus.add_argument("--pdf-files", type=int, default=5)
+    corpus.add_argument("--pdf-pages", type=int, default=20, help="Pages per PDF")
+    corpus.add_argument("--html-pages", type=int, default=20)
+    corpus.add_argument("--mb", type=float, default=2.0, help="Text corpus size in MB")
+    corpus.add_argument("--pages", type=int, default=500, help="Text corpus pages")
+
+    pipeline = parser.add_argument_group("pipeline")
+    pipeline.add_argument("--splitter", choices=SPLITTERS, default="recursive")
+    pipeline.add_argument("--chunk-size", type=int, default=1500)
+    pipeline.add_argument("--chunk-overlap", type=int, default=300)
+    pipeline.add_argument("--parent-child", action="store_true")
+    pipeline.add_argument("--child-chunk-size", type=int, default=400)
+    pipeline.add_argument("--precision", choices=PRECISIONS, default="float32")
+    pipeline.add_argument(
+        "--shard-size", type=int, default=0, help="Chunks per index shard (0 = one index)"
+    )
+    pipeline.add_argument("--rescore", action="store_true", help="Two-stage retrieval")
+    pipeline.add_argument("--candidates", type=int, default=200, help="--rescore candidate set")
+    pipeline.add_argument("--lexical-weight", type=float, default=0.3)
+    pipeline.add_argument(
+        "--adaptive-k", action="store_true", help="Score-based k (up to --k chunks per query)"
+    )
+    pipeline.add_argument(
+        "--scope", default="", help='Retrieval filter, e.g. "pages=1-50" (see /scope)'
+    )
+    pipeline.add_argument("--k", type=int, default=4)
+    pipeline.add_argument("--queries", type=int, default=20)
+
+    fakes = parser.add_argument_group("fake providers")
+    fakes.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    fakes.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per embed call")
+    fakes.add_argument("--embed-text-latency", type=float, default=0.0, help="Seconds per text")
+    fakes.add_argument("--embed-batch", type=int, default=100)
+    fakes.add_argument("--llm-latency", type=float, default=0.0, help="Seconds to first token")
+    fakes.add_argument("--llm-token-latency", type=float, default=0.0, help="Seconds per token")
+    fakes.add_argument("--answer-tokens", type=int, default=64)
+
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        results = run(args)
+    finally:
+        shutil.rmtree(_HOME, ignore_errors=True)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"\n{len(regressions)} stage(s) regressed more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
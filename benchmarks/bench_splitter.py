@@ -0,0 +1,97 @@
+"""
+Text splitter benchmark
+
+- Multi-MB synthetic corpus (paragraphs, sentences, lists) generate karta hai
+- "recursive" (LangChain) aur "fast" (native offsets) splitters compare karta hai
+  ("fast_records" = sirf offset records, Documents banaye bina):
+  time, MB/s, chunk count, average chunk size
+
+Usage:
+    python benchmarks/bench_splitter.py
+    python benchmarks/bench_splitter.py --mb 20 --pages 2000 --json splitter.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from corpora import make_corpus
+from querynest.processor.text_splitter import SPLITTERS, split_documents, split_records
+
+
+def run(documents: list[Document], chunk_size: int, chunk_overlap: int, repeat: int) -> dict:
+    total_bytes = sum(len(d.page_content.encode("utf-8")) for d in documents)
+    results = {"corpus_mb": total_bytes / 1_000_000, "documents": len(documents)}
+
+    for name in SPLITTERS:
+        best = float("inf")
+        chunks = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            chunks = split_documents(
+                documents,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                splitter=name,
+            )
+            best = min(best, time.perf_counter() - start)
+
+        sizes = [len(c.page_content) for c in chunks]
+        results[name] = {
+            "seconds": best,
+            "mb_per_s": results["corpus_mb"] / best if best else 0.0,
+            "chunks": len(chunks),
+            "avg_chunk_chars": sum(sizes) / len(sizes) if sizes else 0,
+            "max_chunk_chars": max(sizes, default=0),
+        }
+
+    # sirf offset records (Documents materialize kiye bina)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = split_records(documents, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        best = min(best, time.perf_counter() - start)
+
+    results["fast_records"] = {
+        "seconds": best,
+        "mb_per_s": results["corpus_mb"] / best if best else 0.0,
+        "chunks": len(records),
+        "avg_chunk_chars": sum(r.end - r.start for r in records) / len(records) if records else 0,
+        "max_chunk_chars": max((r.end - r.start for r in records), default=0),
+    }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text splitters")
+    parser.add_argument("--mb", type=float, default=5.0, help="Corpus size in MB")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=1500)
+    parser.add_argument("--chunk-overlap", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    documents = make_corpus(args.mb, args.pages)
+    results = run(documents, args.chunk_size, args.chunk_overlap, args.repeat)
+
+    print(f"Corpus: {results['corpus_mb']:.1f} MB in {results['documents']} documents\n")
+    print(f"{'splitter':<14}{'seconds':>10}{'MB/s':>10}{'chunks':>10}{'avg chars':>12}")
+    for name in (*SPLITTERS, "fast_records"):
+        row = results[name]
+        print(
+            f"{name:<14}{row['seconds']:>10.3f}{row['mb_per_s']:>10.1f}"
+            f"{row['chunks']:>10}{row['avg_chunk_chars']:>12.0f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
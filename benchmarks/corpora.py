@@ -0,0 +1,178 @@
+"""
+Synthetic corpora (benchmarks ke liye, fully offline + seeded)
+
+- make_corpus      : text pages as Documents (PDF pages jaisa)
+- write_pdf_corpus : asli PDF files (minimal PDF writer, koi extra dependency nahi)
+- make_html_pages  : article-style HTML pages (nav / sidebar / footer boilerplate ke saath)
+"""
+
+import random
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+_WORDS = (
+    "index vector query session embedding retrieval document chunk overlap token "
+    "model latency throughput cache refresh storage memory prompt context answer "
+    "search similarity score batch parser page section header footer the a of and "
+    "to in is for on with that by as from at this be are was it an which or can"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(_WORDS, k=rng.randint(6, 22))).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 8)))
+
+
+def make_page_text(rng: random.Random, size: int) -> str:
+    parts, total = [], 0
+    while total < size:
+        if rng.random() < 0.15:
+            block = "\n".join(
+                f"- {' '.join(rng.choices(_WORDS, k=rng.randint(4, 10)))}"
+                for _ in range(rng.randint(2, 6))
+            )
+        else:
+            block = _paragraph(rng)
+        parts.append(block)
+        total += len(block) + 2
+
+    return "\n\n".join(parts)
+
+
+def make_corpus(total_mb: float, pages: int, seed: int = 42) -> list[Document]:
+    """
+    Roughly total_mb MB text, `pages` Documents mein baanta hua (PDF pages jaisa)
+    """
+    rng = random.Random(seed)
+    per_page = int(total_mb * 1_000_000 / pages)
+
+    return [
+        Document(
+            page_content=make_page_text(rng, per_page),
+            metadata={"source": "synthetic.pdf", "page": page},
+        )
+        for page in range(pages)
+    ]
+
+
+# PDF
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int = 90) -> list[str]:
+    lines = []
+    for para in text.split("\n"):
+        current = ""
+        for word in para.split():
+            if current and len(current) + 1 + len(word) > width:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        lines.append(current)
+    return lines
+
+
+def write_pdf(path: Path, pages: list[str]):
+    """
+    Har page ka text Helvetica mein likhta hai (PDF 1.4, uncompressed streams).
+    pypdf isse normal PDF ki tarah padhta hai
+    """
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for text in pages:
+        # ek page par ~60 lines fit hoti hain, baaki truncate
+        lines = _wrap(text)[:60]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        ops += [f"({_pdf_escape(line)}) '" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_obj, font, content)
+            )
+        )
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog,
+        xref,
+    )
+
+    path.write_bytes(bytes(out))
+
+
+def write_pdf_corpus(directory: Path, files: int, pages_per_file: int, seed: int = 42) -> int:
+    """
+    `directory` mein `files` PDFs likhta hai. Returns: total pages
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for i in range(files):
+        pages = [make_page_text(rng, 4000) for _ in range(pages_per_file)]
+        write_pdf(directory / f"doc_{i:03d}.pdf", pages)
+
+    return files * pages_per_file
+
+
+# HTML
+
+
+def make_html_page(rng: random.Random, paragraphs: int) -> str:
+    nav = "".join(f'<li><a href="/p{i}">{rng.choice(_WORDS)}</a></li>' for i in range(12))
+    body = "".join(
+        f"<h2>{_sentence(rng)}</h2><p>{_paragraph(rng)}</p>"
+        if i % 4 == 0
+        else f"<p>{_paragraph(rng)}</p>"
+        for i in range(paragraphs)
+    )
+    sidebar = "".join(f"<p>{_sentence(rng)}</p>" for _ in range(4))
+
+    return (
+        "<!DOCTYPE html><html><head><title>Synthetic article</title>"
+        "<script>var tracking = {id: 1};</script><style>body{margin:0}</style></head>"
+        f'<body><header><nav class="menu"><ul>{nav}</ul></nav></header>'
+        f"<main><article><h1>{_sentence(rng)}</h1>{body}</article></main>"
+        f'<aside class="sidebar">{sidebar}</aside>'
+        "<footer><p>Copyright synthetic corp. All rights reserved.</p></footer>"
+        "</body></html>"
+    )
+
+
+def make_html_pages(count: int, paragraphs: int = 40, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    return [make_html_page(rng, paragraphs) for _ in range(count)]
@@ -0,0 +1,132 @@
+"""
+Offline fake providers (benchmarks ke liye)
+
+- FakeEmbeddings : deterministic hashed bag-of-words vectors
+  (same text → same vector, similar texts → close vectors, isliye retrieval meaningful rehta hai)
+- FakeChatModel  : deterministic answer, configurable first-token + per-token latency
+
+Dono network ke bina chalte hain, latency `time.sleep` se simulate hoti hai
+"""
+
+import hashlib
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _bucket(word: str, dim: int) -> tuple[int, float]:
+    digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class FakeEmbeddings(Embeddings):
+    """
+    latency       : har embed call ka fixed cost (network round-trip jaisa)
+    text_latency  : har text ka extra cost
+    batch_size    : itne texts ek call mein (Gemini jaisi batching)
+    """
+
+    def __init__(
+        self,
+        dim: int = 768,
+        latency: float = 0.0,
+        text_latency: float = 0.0,
+        batch_size: int = 100,
+    ):
+        self.dim = dim
+        self.latency = latency
+        self.text_latency = text_latency
+        self.batch_size = batch_size
+        # segment keys isi naam se bante hain (real model ke segments se alag)
+        self.model = f"fake-hash-{dim}"
+        self.calls = 0
+        self.texts = 0
+
+    def _vector(self, text: str) -> List[float]:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for word in _WORD_RE.findall(text.lower()):
+            i, sign = _bucket(word, self.dim)
+            vec[i] += sign
+
+        norm = np.linalg.norm(vec)
+        if norm:
+            vec /= norm
+        return vec.tolist()
+
+    def _sleep(self, n: int):
+        self.calls += 1
+        self.texts += n
+        delay = self.latency + self.text_latency * n
+        if delay:
+            time.sleep(delay)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i : i + self.batch_size]
+            self._sleep(len(batch))
+            vectors.extend(self._vector(t) for t in batch)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        self._sleep(1)
+        return self._vector(text)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    latency       : first token aane tak ka time
+    token_latency : har agle token ka time
+    answer_tokens : answer kitne tokens ka ho
+    """
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+    answer_tokens: int = 64
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = "\n".join(str(m.content) for m in messages)
+        words = _WORD_RE.findall(prompt.lower()) or ["empty"]
+
+        # prompt ke hash se deterministic word choice
+        seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "little")
+        return [words[(seed + i * 7919) % len(words)] for i in range(self.answer_tokens)]
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        for i, token in enumerate(self._tokens(messages)):
+            time.sleep(self.latency if i == 0 else self.token_latency)
+            text = token if i == 0 else f" {token}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = "".join(c.message.content for c in self._stream(messages, stop, run_manager))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
@@ -1,33 +1,517 @@
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
 
 import typer
 from rich.console import Console
 from rich.markdown import Markdown
+from rich.progress import Progress
+from rich.table import Table
 
 from querynest.config.gemini import get_llm
+from querynest.ingestion.checkpoint import IngestCheckpoint
+from querynest.ingestion.pipeline import ingest_source, load_documents
 from querynest.loaders.pdf_loader import load_pdfs
-from querynest.loaders.web_loader import load_web_page
+from querynest.loaders.web_loader import EXTRACTORS, load_web_page
+from querynest.processor.text_splitter import SPLITTERS
+from querynest.vector_store.compression import PRECISIONS
 from querynest.memory.chat_memory import ChatMemory
-from querynest.processor.text_splitter import split_documents
+from querynest.memory.summary_memory import MEMORY_MODES, SummaryMemory
 from querynest.rag.rag_chain import build_rag_chain
+from querynest.retriever.adaptive import RETRIEVAL_LOG_FILE, AdaptiveK
+from querynest.retriever.progressive import ProgressiveIndex
+from querynest.retriever.scope import Scope
+from querynest.sessions.gc import MB, auto_gc
+from querynest.sessions.identity import IDENTITY_MODES, resolve_session_id, save_alias
 from querynest.sessions.session_meta import (
+    BuildStats,
     SessionMeta,
+    SessionOptions,
     load_session_meta,
-    save_session_meta,
+    update_session_meta,
 )
-from querynest.utils.hashing import generate_session_id
+from querynest.sessions.usage import commit_usage
+from querynest.utils import tracing
 from querynest.utils.paths import get_session_dir
+from querynest.utils.timing import StageTimer
+from querynest.utils.tracing import TRACE_FILE, span
 from querynest.vector_store.faiss_store import FaissStore
 
 app = typer.Typer()
 console = Console()
 
+# --profile spans yahan append hote hain (session folder ke andar)
+
+# /scope listing mein itne sources tak
+SCOPE_LIST_LIMIT = 30
+
+
+def _print_traces(traces: List[list]):
+    """
+    Har completed trace ka per-stage breakdown table print karke list khaali kar deta hai
+    """
+    for spans in traces:
+        table = Table(show_header=True, header_style="bold magenta", box=None)
+        table.add_column("Stage", style="cyan")
+        table.add_column("ms", justify="right")
+        table.add_column("%", justify="right", style="dim")
+
+        for name, seconds, pct in tracing.breakdown(spans):
+            table.add_row(name, f"{seconds * 1000:.1f}", f"{pct:.1f}")
+
+        console.print(table)
+        console.print()
+
+    traces.clear()
+
+
+def _ingest(
+    store: FaissStore,
+    session_id: str,
+    source_type: str,
+    source_key: str,
+    options: SessionOptions,
+    checkpoint: IngestCheckpoint,
+    live: ProgressiveIndex | None = None,
+    documents: List | None = None,
+    timer: StageTimer | None = None,
+) -> BuildStats:
+    """
+    pipeline.ingest_source chat ke UI ke saath: messages terminal mein, embedding
+    progress bar mein
+
+    live (--progressive): background thread se chalta hai - messages terminal
+    ki jagah live.status mein, aur har embedded batch partial index mein.
+    documents / timer: main thread par pehle hi load hue documents (_load_in_foreground)
+
+    Returns: build stats (meta.build) - pages 0 agar chunks checkpoint se aaye
+    """
+
+    def load():
+        return _load(source_type, source_key, session_id, options, quiet=live is not None)
+
+    if live:
+
+        def say(message: str):
+            live.status = message
+
+        def on_chunks(chunks, parents):
+            live.total = len(chunks)
+            live.parents = parents
+
+        return ingest_source(
+            store,
+            session_id,
+            source_type,
+            source_key,
+            options,
+            checkpoint,
+            load,
+            say=say,
+            on_batch=live.add,
+            on_chunks=on_chunks,
+            documents=documents,
+            timer=timer,
+        )
+
+    def say(message: str):
+        typer.secho(message, fg=typer.colors.CYAN)
+
+    with _embedding_progress() as progress:
+        return ingest_source(
+            store,
+            session_id,
+            source_type,
+            source_key,
+            options,
+            checkpoint,
+            load,
+            say=say,
+            progress=progress,
+        )
+
+
+def _load(
+    source_type: str,
+    source_key: str,
+    session_id: str,
+    options: SessionOptions,
+    quiet: bool = False,
+) -> List:
+    if source_type == "web":
+        return [load_web_page(source_key, session_id, options.extractor, not quiet)]
+    return load_pdfs(source_key, show_progress=not quiet)
+
+
+def _load_in_foreground(
+    session_id: str,
+    source_type: str,
+    source_key: str,
+    options: SessionOptions,
+    checkpoint: IngestCheckpoint,
+    timer: StageTimer,
+) -> List | None:
+    """
+    --progressive: load stage main thread par - loaders ke messages / errors (sys.exit)
+    chat prompt ke saath race nahi karte; background thread sirf split + embed karta hai.
+    Returns: documents, ya None agar checkpoint mein pehle se hain
+    """
+    if checkpoint.stage != "started":
+        return None
+
+    typer.secho("Loading documents...", fg=typer.colors.CYAN)
+    try:
+        return load_documents(
+            source_type, lambda: _load(source_type, source_key, session_id, options), timer
+        )
+    except typer.Exit:
+        raise
+    except (KeyboardInterrupt, Exception) as e:
+        raise _report_ingest_failure(e)
+
+
+@contextmanager
+def _embedding_progress():
+    """
+    Embedding progress bar - pehli progress call (load / split ke baad) par hi dikhta hai
+    """
+    bar = Progress(console=console, transient=True)
+    task = None
+
+    def progress(done: int, total: int):
+        nonlocal task
+        if task is None:
+            bar.start()
+            task = bar.add_task("Embedding", total=total)
+            if done:
+                console.print(f"Reusing {done} already embedded chunks")
+        bar.update(task, completed=done, total=total)
+
+    try:
+        yield progress
+    finally:
+        bar.stop()
+
+
+def _ingest_in_background(
+    live: ProgressiveIndex,
+    store: FaissStore,
+    session_id: str,
+    source_type: str,
+    source_key: str,
+    options: SessionOptions,
+    checkpoint: IngestCheckpoint,
+    documents: List | None,
+    timer: StageTimer,
+):
+    """
+    --progressive: thread target. Poora index save hone ke baad retriever swap
+    (meta / usage commit chat loop karta hai, main thread se)
+    """
+    try:
+        live.build_stats = _ingest(
+            store, session_id, source_type, source_key, options, checkpoint, live, documents, timer
+        )
+    except (Exception, SystemExit) as e:
+        # loaders galat path par sys.exit karte hain - thread mein wo chup-chaap khatam ho jaata
+        live.fail(e)
+        return
+
+    live.complete(_get_retriever(store, options, get_session_dir(session_id), k=live.k))
+
+
+def _get_retriever(store: FaissStore, options: SessionOptions, session_dir: Path, k: int = 4):
+    return store.get_retriever(
+        k=k,
+        rescore=options.rescore,
+        candidates=options.rescore_candidates,
+        lexical_weight=options.lexical_weight,
+        adaptive=AdaptiveK.from_options(options),
+        log_path=session_dir / RETRIEVAL_LOG_FILE,
+    )
+
+
+def _set_scope(store: FaissStore, live: ProgressiveIndex | None, scope: Scope):
+    store.set_scope(scope)
+    if live:
+        live.scope = scope
+
+    if store.store is None:
+        # --progressive: index abhi ban raha hai, counts baad mein
+        typer.secho(f"Scope: {scope.describe()}", fg=typer.colors.GREEN)
+        return
+
+    metadata = store.metadata_index()
+    chunks = int(metadata.mask(scope).sum())
+    color = typer.colors.GREEN if chunks else typer.colors.YELLOW
+    typer.secho(f"Scope: {scope.describe()} ({chunks}/{metadata.size} chunks)", fg=color)
+    if scope.sources:
+        for source in metadata.matching_sources(scope.sources)[:SCOPE_LIST_LIMIT]:
+            typer.secho(f"  {source}", fg=typer.colors.WHITE)
+    if not chunks:
+        typer.secho("No chunks match - answers will have no context", fg=typer.colors.YELLOW)
+
+
+def _scope_command(store: FaissStore, live: ProgressiveIndex | None, args: str):
+    """
+    /scope                                  → current scope + session ke sources
+    /scope clear                            → poora session
+    /scope source=a.pdf,b.pdf pages=3-9 type=pdf
+    """
+    args = args.strip()
+
+    if args in ("clear", "all", "off"):
+        _set_scope(store, live, Scope())
+        return
+
+    if args:
+        try:
+            scope = Scope.parse(args)
+        except ValueError as e:
+            typer.secho(f"{e}", fg=typer.colors.RED)
+            typer.echo("Usage: /scope source=<file>[,<file>] pages=<first>-<last> type=pdf|web")
+            return
+        _set_scope(store, live, scope)
+        return
+
+    typer.secho(f"Scope: {store.scope.describe()}", fg=typer.colors.BLUE)
+    if store.store is None:
+        return
+
+    counts = store.metadata_index().counts()
+    table = Table(show_header=True, header_style="bold magenta", box=None)
+    table.add_column("Source", style="cyan")
+    table.add_column("Chunks", justify="right")
+    for source, chunks in sorted(counts.items())[:SCOPE_LIST_LIMIT]:
+        table.add_row(source, str(chunks))
+    console.print(table)
+    if len(counts) > SCOPE_LIST_LIMIT:
+        typer.secho(f"... and {len(counts) - SCOPE_LIST_LIMIT} more", fg=typer.colors.WHITE)
+
+
+def _report_ingest_failure(error: BaseException) -> typer.Exit:
+    if isinstance(error, SystemExit):
+        # loader apna error already print kar chuka hai
+        return typer.Exit(error.code if isinstance(error.code, int) else 1)
+
+    if isinstance(error, KeyboardInterrupt):
+        typer.secho(
+            "\nIngestion interrupted. Progress is saved - run the same command to resume.",
+            fg=typer.colors.YELLOW,
+        )
+        return typer.Exit(130)
+
+    typer.secho(f"\nIngestion failed: {error}", fg=typer.colors.RED)
+    typer.secho("Progress is saved - run the same command to resume.", fg=typer.colors.YELLOW)
+    return typer.Exit(1)
+
+
+def _ingest_or_exit(*args) -> BuildStats:
+    try:
+        return _ingest(*args)
+    except typer.Exit:
+        raise
+    except (KeyboardInterrupt, Exception) as e:
+        raise _report_ingest_failure(e)
+
+
+def _create_session_meta(
+    session_id: str,
+    session_name: str,
+    source_type: str,
+    source_key: str,
+    options: SessionOptions,
+    checkpoint: IngestCheckpoint,
+    build: BuildStats | None,
+    turns: int = 0,
+) -> SessionMeta:
+    """
+    Index save hone ke baad session ko final karta hai: meta (+ build stats) + ingestion
+    usage, checkpoint cleanup, content alias.
+    turns: --progressive mein ingestion ke dauraan hue chat turns
+    (unka LLM usage bhi isi "ingest" drain mein aa jaata hai)
+    """
+    meta = SessionMeta(
+        id=session_id,
+        name=session_name,
+        source=source_key,
+        source_type=source_type,
+        created_at=SessionMeta.now(),
+        last_used_at=SessionMeta.now(),
+        options=options,
+        build=build,
+    )
+    meta.usage.turns = turns
+    commit_usage(get_session_dir(session_id), meta, "ingest")
+    checkpoint.clear()
+    if options.identity == "content":
+        save_alias(source_key, session_id)
+    return meta
+
+
+def _restore_compacted(
+    store: FaissStore, session_id: str, source_type: str, source_key: str, meta: SessionMeta
+):
+    """
+    sessions gc ne is session ka index hataya tha - checkpoint ke chunk text se
+    sirf re-embed (checkpoint na ho toh source se poori ingestion)
+    """
+    typer.secho(
+        "Session was compacted by 'sessions gc' - rebuilding its index", fg=typer.colors.YELLOW
+    )
+
+    session_dir = get_session_dir(session_id)
+    options = meta.options.model_copy()
+    checkpoint = IngestCheckpoint(session_dir)
+    if not checkpoint.resume(meta.source, options):
+        checkpoint.start(meta.name, meta.source, options)
+
+    build = _ingest_or_exit(store, session_id, source_type, source_key, options, checkpoint)
+    build.kind = "restore"
+    # chunks checkpoint se aaye - pages pichle build ke
+    build.pages = build.pages or (meta.build.pages if meta.build else 0)
+
+    def restored(m: SessionMeta):
+        m.options = options
+        m.compacted_at = None
+        m.build = build
+
+    commit_usage(session_dir, update_session_meta(session_dir, restored), "restore")
+    checkpoint.clear()
+
 
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
     web: Optional[str] = typer.Option(None, "--web", help="Web page URL"),
     pdf: Optional[str] = typer.Option(None, "--pdf", help="PDF file or directory path"),
+    extractor: str = typer.Option(
+        "readability",
+        "--extractor",
+        help="HTML extraction engine for new web sessions (readability / fast)",
+    ),
+    identity: str = typer.Option(
+        "source",
+        "--identity",
+        help="Session identity for PDFs: source (path string) / content (file or directory hash)",
+    ),
+    splitter: str = typer.Option(
+        "recursive",
+        "--splitter",
+        help="Text splitter for new sessions (recursive / fast)",
+    ),
+    chunk_size: int = typer.Option(1500, "--chunk-size", help="Max characters per chunk"),
+    chunk_overlap: int = typer.Option(
+        300, "--chunk-overlap", help="Characters shared by consecutive chunks"
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None,
+        "--max-tokens",
+        help="Also cap chunks at this many tokens (fast splitter only)",
+    ),
+    parent_child: bool = typer.Option(
+        False,
+        "--parent-child/--flat",
+        help="Search small child chunks, answer with their parent chunks (--chunk-size)",
+    ),
+    child_chunk_size: int = typer.Option(
+        400, "--child-chunk-size", help="Max characters per child chunk (--parent-child)"
+    ),
+    child_chunk_overlap: int = typer.Option(
+        80, "--child-chunk-overlap", help="Characters shared by consecutive child chunks"
+    ),
+    precision: str = typer.Option(
+        "float32",
+        "--precision",
+        help="Vector index precision for new sessions (float32 / float16 / int8 / pq) - saves RAM, not disk",
+    ),
+    shard_size: int = typer.Option(
+        0,
+        "--shard-size",
+        help="Split the index into shards of this many chunks, built and searched in parallel (0 = one index)",
+    ),
+    rescore: bool = typer.Option(
+        False,
+        "--rescore/--no-rescore",
+        help="Two-stage retrieval: re-score a large candidate set with full-precision vectors + lexical overlap",
+    ),
+    candidates: int = typer.Option(
+        200, "--candidates", help="First-stage candidate set size for --rescore"
+    ),
+    lexical_weight: float = typer.Option(
+        0.3,
+        "--lexical-weight",
+        help="Weight of query-term overlap in --rescore scoring (0 = vectors only)",
+    ),
+    adaptive_k: bool = typer.Option(
+        False,
+        "--adaptive-k/--fixed-k",
+        help="Pick how many chunks to send per question from their similarity scores",
+    ),
+    min_k: int = typer.Option(2, "--min-k", help="Adaptive k: always keep at least this many"),
+    max_k: int = typer.Option(8, "--max-k", help="Adaptive k: never keep more than this many"),
+    score_threshold: float = typer.Option(
+        0.0,
+        "--score-threshold",
+        help="Adaptive k: drop chunks below this similarity (0 = off)",
+    ),
+    score_gap: float = typer.Option(
+        0.1,
+        "--score-gap",
+        help="Adaptive k: stop when the score drops by more than this fraction (0 = off)",
+    ),
+    dedup: bool = typer.Option(
+        False,
+        "--dedup/--no-dedup",
+        help="Drop near-duplicate chunks (headers, footers, boilerplate) before embedding",
+    ),
+    dedup_distance: int = typer.Option(
+        3,
+        "--dedup-distance",
+        help="Max SimHash bit difference for two chunks to count as near-duplicates (0 = exact only)",
+    ),
+    dedup_mode: str = typer.Option(
+        "drop",
+        "--dedup-mode",
+        help="What to do with duplicates: drop / collapse (record them on the kept chunk)",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print a per-stage timing breakdown and export spans (OTLP JSON lines)",
+    ),
+    trace_file: Optional[Path] = typer.Option(
+        None,
+        "--trace-file",
+        help=f"Where --profile writes spans (default: the session's {TRACE_FILE})",
+    ),
+    memory_mode: str = typer.Option(
+        "window",
+        "--memory",
+        help="Chat memory: 'window' (last turns verbatim) or 'summary' (older turns folded into a rolling summary)",
+    ),
+    recent_turns: int = typer.Option(
+        4, "--recent-turns", help="Turns kept verbatim in the prompt"
+    ),
+    summary_tokens: int = typer.Option(
+        400, "--summary-tokens", help="Summary memory: max tokens of the rolling summary"
+    ),
+    history_tokens: int = typer.Option(
+        1500,
+        "--history-tokens",
+        help="Summary memory: max tokens of verbatim turns (older ones are folded early)",
+    ),
+    progressive: bool = typer.Option(
+        False,
+        "--progressive",
+        help="New sessions: index in the background and answer from the partial index meanwhile",
+    ),
+    scope: Optional[str] = typer.Option(
+        None,
+        "--scope",
+        help='Only search part of the session, e.g. "source=manual.pdf pages=10-20 type=pdf" (change with /scope)',
+    ),
 ):
     """
     Start a chat session with a web page or PDF.
@@ -48,69 +532,237 @@ def main(
         typer.secho("Error: Use only one source at a time", fg=typer.colors.RED)
         raise typer.Exit(1)
 
+    if extractor not in EXTRACTORS:
+        typer.secho(
+            f"Error: Unknown extractor '{extractor}' (choose from {', '.join(EXTRACTORS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if identity not in IDENTITY_MODES:
+        typer.secho(
+            f"Error: Unknown identity mode '{identity}' (choose from {', '.join(IDENTITY_MODES)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if splitter not in SPLITTERS:
+        typer.secho(
+            f"Error: Unknown splitter '{splitter}' (choose from {', '.join(SPLITTERS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if chunk_overlap >= chunk_size:
+        typer.secho(
+            "Error: --chunk-overlap must be smaller than --chunk-size", fg=typer.colors.RED
+        )
+        raise typer.Exit(1)
+
+    if parent_child and not child_chunk_overlap < child_chunk_size < chunk_size:
+        typer.secho(
+            "Error: need --child-chunk-overlap < --child-chunk-size < --chunk-size",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if max_tokens is not None and splitter != "fast":
+        typer.secho("Error: --max-tokens requires --splitter fast", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if precision not in PRECISIONS:
+        typer.secho(
+            f"Error: Unknown precision '{precision}' (choose from {', '.join(PRECISIONS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if shard_size < 0:
+        typer.secho("Error: --shard-size must be 0 or more", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if candidates < 1:
+        typer.secho("Error: --candidates must be at least 1", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not 0.0 <= lexical_weight <= 1.0:
+        typer.secho("Error: --lexical-weight must be between 0 and 1", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not 1 <= min_k <= max_k:
+        typer.secho("Error: need 1 <= --min-k <= --max-k", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not 0.0 <= score_gap < 1.0:
+        typer.secho("Error: --score-gap must be between 0 and 1", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if dedup_mode not in {"drop", "collapse"}:
+        typer.secho("Error: --dedup-mode must be 'drop' or 'collapse'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not 0 <= dedup_distance <= 63:
+        typer.secho("Error: --dedup-distance must be between 0 and 63", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if memory_mode not in MEMORY_MODES:
+        typer.secho(
+            f"Error: Unknown memory mode '{memory_mode}' (choose from {', '.join(MEMORY_MODES)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if recent_turns < 1 or summary_tokens < 1 or history_tokens < 1:
+        typer.secho(
+            "Error: --recent-turns, --summary-tokens and --history-tokens must be at least 1",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    try:
+        initial_scope = Scope.parse(scope or "")
+    except ValueError as e:
+        typer.secho(f"Error: --scope: {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
     source_type = "web" if web else "pdf"
     source_key = web if web else pdf
 
     typer.secho(f"Source: {source_key[:80]}...", fg=typer.colors.BLUE)
 
-    session_id = generate_session_id(source_key)
+    session_id = resolve_session_id(source_key, source_type, identity)
     session_dir = get_session_dir(session_id)
 
+    traces: List[list] = []
+    if profile:
+        tracer = tracing.enable(trace_file or session_dir / TRACE_FILE)
+        tracer.on_trace(traces.append)
+
     store = FaissStore()
     resumed = store.load(session_id)
 
     if not resumed:
-        # NEW SESSION - Ask for name
-        typer.echo()
-        session_name = typer.prompt(
-            "Enter a name for this session (optional, press Enter to use default)",
-            default="",
-            show_default=False,
-        ).strip()
-
-        # Use default name if user didn't provide one
-        if not session_name:
-            if source_type == "pdf":
-                # Use filename or directory name
-                session_name = source_key.rstrip("/").split("/")[-1]
-            else:
-                # Use first 50 chars of URL
-                session_name = source_key[:50]
+        compacted = load_session_meta(session_dir)
+        if compacted and compacted.compacted_at:
+            _restore_compacted(store, session_id, source_type, source_key, compacted)
+            resumed = True
 
-        typer.secho(f"\nSession name: {session_name}", fg=typer.colors.BLUE)
-        typer.secho("Loading documents...", fg=typer.colors.CYAN)
+    # --progressive background ingestion (naye session ke liye)
+    live: ProgressiveIndex | None = None
 
-        if source_type == "web":
-            documents = [load_web_page(source_key)]
-        else:
-            documents = load_pdfs(source_key)
+    if not resumed:
+        options = SessionOptions(
+            identity=identity,
+            extractor=extractor,
+            splitter=splitter,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            max_tokens=max_tokens,
+            dedup=dedup,
+            dedup_max_distance=dedup_distance,
+            dedup_mode=dedup_mode,
+            parent_child=parent_child,
+            child_chunk_size=child_chunk_size,
+            child_chunk_overlap=child_chunk_overlap,
+            precision=precision,
+            shard_size=shard_size,
+            rescore=rescore,
+            rescore_candidates=candidates,
+            lexical_weight=lexical_weight,
+            adaptive_k=adaptive_k,
+            min_k=min_k,
+            max_k=max_k,
+            score_threshold=score_threshold,
+            score_gap=score_gap,
+        )
 
-        typer.secho("Splitting into chunks...", fg=typer.colors.CYAN)
-        chunks = split_documents(documents)
+        checkpoint = IngestCheckpoint(session_dir)
 
-        typer.secho(
-            f"Building vector index ({len(chunks)} chunks)...", fg=typer.colors.CYAN
-        )
-        store.build(chunks, session_id)
+        if checkpoint.resume(source_key, options):
+            # pichli baar ingestion beech mein ruk gayi thi
+            session_name = checkpoint.session_name
+            typer.secho(
+                f"\nResuming interrupted ingestion (stage: {checkpoint.stage})",
+                fg=typer.colors.YELLOW,
+            )
+        else:
+            # NEW SESSION - Ask for name
+            typer.echo()
+            session_name = typer.prompt(
+                "Enter a name for this session (optional, press Enter to use default)",
+                default="",
+                show_default=False,
+            ).strip()
+
+            # Use default name if user didn't provide one
+            if not session_name:
+                if source_type == "pdf":
+                    # Use filename or directory name
+                    session_name = source_key.rstrip("/").split("/")[-1]
+                else:
+                    # Use first 50 chars of URL
+                    session_name = source_key[:50]
+
+            checkpoint.start(session_name, source_key, options)
 
-        meta = SessionMeta(
-            id=session_id,
-            name=session_name,
-            source=source_key,
-            source_type=source_type,
-            created_at=SessionMeta.now(),
-            last_used_at=SessionMeta.now(),
-        )
-        save_session_meta(session_dir, meta)
-        typer.secho("New session created", fg=typer.colors.GREEN)
+        typer.secho(f"\nSession name: {session_name}", fg=typer.colors.BLUE)
+
+        if progressive:
+            timer = StageTimer()
+            documents = _load_in_foreground(
+                session_id, source_type, source_key, options, checkpoint, timer
+            )
+            # partial index par bhi final retriever wale retrieval options
+            live = ProgressiveIndex(
+                store.embeddings,
+                rescore=options.rescore,
+                candidates=options.rescore_candidates,
+                lexical_weight=options.lexical_weight,
+                adaptive=AdaptiveK.from_options(options),
+                log_path=session_dir / RETRIEVAL_LOG_FILE,
+            )
+            threading.Thread(
+                target=_ingest_in_background,
+                args=(
+                    live,
+                    store,
+                    session_id,
+                    source_type,
+                    source_key,
+                    options,
+                    checkpoint,
+                    documents,
+                    timer,
+                ),
+                daemon=True,
+            ).start()
+            typer.secho(
+                "Indexing in the background - answers use the chunks indexed so far",
+                fg=typer.colors.CYAN,
+            )
+        else:
+            build = _ingest_or_exit(
+                store, session_id, source_type, source_key, options, checkpoint
+            )
+            meta = _create_session_meta(
+                session_id, session_name, source_type, source_key, options, checkpoint, build
+            )
+            typer.secho("New session created", fg=typer.colors.GREEN)
     else:
         # resumed session case - Load and display existing name
-        existing_meta = load_session_meta(session_dir)
+        # last_used_at update (lock ke andar disk ke fresh meta par)
+        existing_meta = update_session_meta(
+            session_dir, lambda m: setattr(m, "last_used_at", SessionMeta.now())
+        )
+        # turns ka token usage isi meta mein add hota hai
+        meta = existing_meta
+        options = existing_meta.options if existing_meta else SessionOptions()
 
         if existing_meta:
-            # Update last_used_at timestamp
-            existing_meta.last_used_at = SessionMeta.now()
-            save_session_meta(session_dir, existing_meta)
+
+            # moved / copied corpus se resume hua - naya path bhi alias kar do
+            if source_type == "pdf" and existing_meta.options.identity == "content":
+                save_alias(source_key, session_id)
 
             typer.secho("Resuming existing session", fg=typer.colors.GREEN)
             typer.secho(f"Session name: {existing_meta.name}", fg=typer.colors.BLUE)
@@ -123,19 +775,79 @@ def main(
                 "Resuming existing session (metadata not found)", fg=typer.colors.YELLOW
             )
 
-    memory = ChatMemory(session_id)
-    retriever = store.get_retriever()
+    # config auto_gc: budget se upar ho toh purane sessions compact (ye wala nahi)
+    collected = auto_gc(exclude=[session_id])
+    if collected:
+        typer.secho(
+            f"Storage over budget: compacted {len(collected.evicted)} least recently used "
+            f"sessions (freed {collected.freed / MB:,.1f} MB)",
+            fg=typer.colors.WHITE,
+        )
+
+    _print_traces(traces)
+
+    if initial_scope.active:
+        _set_scope(store, live, initial_scope)
+
+    if live:
+        retriever = live.as_retriever()
+    else:
+        retriever = _get_retriever(store, options, session_dir)
     llm = get_llm()
+
+    if memory_mode == "summary":
+        memory = SummaryMemory(
+            session_id,
+            llm,
+            recent_turns=recent_turns,
+            summary_tokens=summary_tokens,
+            history_tokens=history_tokens,
+        )
+    else:
+        memory = ChatMemory(session_id, window_size=recent_turns)
     rag_chain = build_rag_chain(llm, retriever)
 
     typer.secho(
-        "\nChat started! (type 'exit' or 'quit' to end)\n",
+        "\nChat started! (type 'exit' or 'quit' to end, '/scope' to limit the search)\n",
         fg=typer.colors.YELLOW,
         bold=True,
     )
 
+    # --progressive: index complete hone tak ke turns (meta tab tak disk par nahi hai)
+    pending_turns = 0
+
+    def poll_ingestion():
+        nonlocal live, meta
+        if not live.done:
+            console.print(
+                f"[dim]Indexing: {live.indexed}/{live.total or '?'} chunks - {live.status}[/dim]"
+            )
+            return
+
+        if live.error:
+            raise _report_ingest_failure(live.error)
+
+        meta = _create_session_meta(
+            session_id,
+            session_name,
+            source_type,
+            source_key,
+            options,
+            checkpoint,
+            live.build_stats,
+            pending_turns,
+        )
+        typer.secho(
+            f"Index complete ({live.total} chunks) - new session created", fg=typer.colors.GREEN
+        )
+        live = None
+
     try:
         while True:
+            if live:
+                poll_ingestion()
+                console.print()
+
             question = typer.prompt("You")
 
             if question.lower().strip() in {"exit", "quit"}:
@@ -145,6 +857,12 @@ def main(
             if not question.strip():
                 continue
 
+            command, _, args = question.strip().partition(" ")
+            if command == "/scope":
+                _scope_command(store, live, args)
+                console.print()
+                continue
+
             memory.add_user_message(question)
             context = memory.get_context()
 
@@ -152,12 +870,50 @@ def main(
 
             typer.secho("Thinking...", fg=typer.colors.CYAN)
 
-            answer = rag_chain.invoke(final_query)
+            with span("chat.turn"):
+                answer = rag_chain.invoke(final_query)
 
             console.print("\n[bold green]Assistant[/bold green]")
             console.print(Markdown(answer))
             console.print()  # spacing
+            _print_traces(traces)
+
+            if live:
+                # usage session ke create hone par "ingest" ke saath commit hoga
+                pending_turns += 1
+                memory.add_assistant_message(answer)
+                continue
+
+            turn_usage = commit_usage(session_dir, meta, "turn")
+            if profile:
+                console.print(
+                    f"[dim]Tokens: prompt {turn_usage.prompt_tokens}, "
+                    f"completion {turn_usage.completion_tokens}, "
+                    f"query embedding {turn_usage.embed_tokens}[/dim]\n"
+                )
 
             memory.add_assistant_message(answer)
     except (KeyboardInterrupt, EOFError):
         typer.echo("\n\nSession saved. Goodbye!")
+
+    if live and live.done and not live.error:
+        # exit ke beech complete ho gaya - session abhi finalize karo
+        poll_ingestion()
+
+    # summary memory ka aakhri background fold - summary disk par aur uske tokens meta mein
+    memory.flush()
+    if isinstance(memory, SummaryMemory):
+        if memory.fold_error:
+            typer.secho(
+                f"Could not update the conversation summary ({memory.fold_error}) - "
+                "older turns are kept and folded next time.",
+                fg=typer.colors.YELLOW,
+            )
+        if not live:
+            commit_usage(session_dir, meta, "summary")
+
+    if live:
+        typer.secho(
+            "Indexing was still running - progress is saved, run the same command to resume.",
+            fg=typer.colors.YELLOW,
+        )
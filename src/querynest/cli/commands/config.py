@@ -1,6 +1,6 @@
 
 import typer
-from querynest.config.config_loader import update_api_key
+from querynest.config.config_loader import update_api_key, update_storage_settings
 
 app = typer.Typer()
 
@@ -13,3 +13,27 @@ def set_api_key():
     typer.secho("API key updated successfully", fg=typer.colors.GREEN)
 
 
+
+@app.command()
+def set_storage_budget(
+    budget_mb: int = typer.Argument(..., help="Disk budget for ~/.querynest in MB (0 = no budget)"),
+    auto: bool = typer.Option(
+        None, "--auto/--no-auto", help="Run 'sessions gc' automatically whenever a chat starts"
+    ),
+):
+    """Set the storage budget used by 'sessions gc'"""
+    if budget_mb < 0:
+        typer.secho("Budget must be 0 or more", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    try:
+        config = update_storage_settings(budget_mb, auto)
+    except RuntimeError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if config.storage_budget_mb:
+        typer.secho(f"Storage budget: {config.storage_budget_mb} MB", fg=typer.colors.GREEN)
+    else:
+        typer.secho("Storage budget removed", fg=typer.colors.GREEN)
+    typer.secho(f"Automatic gc: {'on' if config.auto_gc else 'off'}", fg=typer.colors.WHITE)
@@ -1,9 +1,18 @@
 import typer
 import json
+import time
 from typing import Optional
 
-from querynest.utils.hashing import generate_session_id
-from querynest.utils.paths import get_chat_path
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from querynest.sessions.identity import resolve_session_id
+from querynest.sessions.session_meta import load_session_meta
+from querynest.storage.history_index import MATCH_END, MATCH_START, HistoryIndex
+from querynest.utils.paths import SESSIONS_DIR, get_chat_path
+
+console = Console()
 
 app = typer.Typer()
 
@@ -43,7 +52,7 @@ def show(
         sid = session_id
     else:
         source = web if web else pdf
-        sid = generate_session_id(source)
+        sid = resolve_session_id(source, "web" if web else "pdf")
 
     chat_path = get_chat_path(sid)
 
@@ -58,3 +67,70 @@ def show(
         role = msg["role"].upper()
         color = typer.colors.CYAN if role == "USER" else typer.colors.WHITE
         typer.secho(f"{role}: {msg['content']}", fg=color)
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(
+        ..., help='Words to find - all must match, "embed*" matches a prefix'
+    ),
+    session_id: Optional[str] = typer.Option(
+        None, "--session-id", help="Only this session (full ID or prefix)"
+    ),
+    role: Optional[str] = typer.Option(
+        None, "--role", help="Only 'user' or 'assistant' messages"
+    ),
+    limit: int = typer.Option(20, "--limit", help="Max number of hits"),
+):
+    """Search chat history across all sessions"""
+
+    if role and role not in {"user", "assistant"}:
+        typer.secho("--role must be 'user' or 'assistant'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    index = HistoryIndex()
+    # index se pehle ke sessions (ek hi baar) - baaki ki koi chat file nahi khulti
+    index.sync()
+
+    start = time.perf_counter()
+    try:
+        hits = index.search(query, session_id=session_id, role=role, limit=limit)
+    except ValueError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(1)
+    elapsed = time.perf_counter() - start
+
+    if not hits:
+        typer.secho("No matching messages found", fg=typer.colors.YELLOW)
+        return
+
+    # sirf hit wale sessions ke names
+    names = {}
+    for hit in hits:
+        if hit.session_id not in names:
+            meta = load_session_meta(SESSIONS_DIR / hit.session_id)
+            names[hit.session_id] = meta.name if meta else "(deleted)"
+
+    table = Table(title=f"History Search Results for '{escape(query)}'")
+    table.add_column("Session ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Time", style="blue")
+    table.add_column("Role", style="magenta")
+    table.add_column("Match")
+
+    for hit in hits:
+        snippet = (
+            escape(" ".join(hit.snippet.split()))
+            .replace(MATCH_START, "[bold yellow]")
+            .replace(MATCH_END, "[/bold yellow]")
+        )
+        table.add_row(
+            hit.session_id[:12],
+            names[hit.session_id],
+            hit.at[:19].replace("T", " "),
+            hit.role.upper(),
+            snippet,
+        )
+
+    console.print(table)
+    console.print(f"[dim]{len(hits)} hits in {elapsed * 1000:.1f} ms[/dim]")
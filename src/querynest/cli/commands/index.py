@@ -0,0 +1,274 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from querynest.ingestion.batch import (
+    CREATED,
+    FAILED,
+    REBUILT,
+    UP_TO_DATE,
+    IndexJob,
+    IndexResult,
+    apply_settings,
+    index_source,
+    init_worker,
+    load_manifest,
+    stale_reason,
+)
+from querynest.sessions.gc import MB, auto_gc
+from querynest.sessions.identity import resolve_session_id
+from querynest.sessions.session_meta import SessionMeta
+from querynest.storage.atomic import atomic_write_json
+
+console = Console()
+
+STATUS_COLORS = {
+    CREATED: "green",
+    REBUILT: "cyan",
+    UP_TO_DATE: "white",
+    FAILED: "red",
+}
+
+
+def _print_result(done: int, total: int, result: IndexResult):
+    if result.status == FAILED:
+        typer.secho(
+            f"[{done}/{total}] failed: {result.name} ({result.reason})", fg=typer.colors.RED
+        )
+        return
+
+    typer.secho(
+        f"[{done}/{total}] {result.status}: {result.name} "
+        f"({result.chunks:,} chunks, {result.embedded:,} embedded, {result.seconds:.1f}s)",
+        fg=STATUS_COLORS[result.status],
+    )
+
+
+def _run(pending: List[tuple], jobs: int) -> Dict[str, IndexResult]:
+    """
+    Pending (job, reason) parallel worker processes mein. Returns: session id → result
+    """
+    workers = min(jobs, len(pending))
+    # har worker ko cores ka barabar hissa (faiss threads + shard builds)
+    cpus = max(1, (os.cpu_count() or 1) // workers)
+
+    results: Dict[str, IndexResult] = {}
+    # spawn: faiss / OpenMP threads fork ke saath safe nahi hain (shards.py jaisa)
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=init_worker, initargs=(cpus,)
+    )
+    interrupted = False
+    try:
+        futures = {pool.submit(index_source, job, reason): job for job, reason in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # worker process mar gaya (OOM kill / segfault) - pool ke baaki pending
+                # sources bhi yahi dete hain; summary phir bhi banti hai, re-run resume karta hai
+                result = IndexResult(
+                    job.source, job.display_name, job.session_id, FAILED, "worker process died"
+                )
+            except Exception as e:
+                result = IndexResult(
+                    job.source, job.display_name, job.session_id, FAILED, str(e) or type(e).__name__
+                )
+            results[result.session_id] = result
+            _print_result(done, len(pending), result)
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        # interrupt par running workers ka wait nahi - unka progress checkpoint mein hai
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+
+    if interrupted:
+        typer.secho(
+            "\nIndexing interrupted. Progress is saved - run the same command to resume.",
+            fg=typer.colors.YELLOW,
+        )
+        raise typer.Exit(130)
+    return results
+
+
+def _print_summary(jobs: List[IndexJob], results: Dict[str, IndexResult], wall: float):
+    table = Table(title="QueryNest Index")
+    table.add_column("Name", style="green")
+    table.add_column("Status")
+    table.add_column("Pages", justify="right")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Embedded", justify="right")
+    table.add_column("Time", justify="right", style="yellow")
+    table.add_column("Details", style="white")
+
+    for job in jobs:
+        r = results[job.session_id]
+        built = r.status in (CREATED, REBUILT)
+        color = STATUS_COLORS[r.status]
+        table.add_row(
+            r.name,
+            f"[{color}]{r.status}[/{color}]",
+            f"{r.pages:,}" if built else "-",
+            f"{r.chunks:,}" if built else "-",
+            f"{r.embedded:,}" if built else "-",
+            f"{r.seconds:,.1f}s" if r.seconds else "-",
+            r.reason,
+        )
+    console.print(table)
+
+    counts = {status: 0 for status in STATUS_COLORS}
+    stages: Dict[str, float] = {}
+    for r in results.values():
+        counts[r.status] += 1
+        for name, seconds in r.stages.items():
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    busy = sum(r.seconds for r in results.values())
+    typer.secho(
+        f"\n{len(jobs)} sources: "
+        + ", ".join(f"{count} {status}" for status, count in counts.items())
+        + f" in {wall:.1f}s",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+    if busy:
+        typer.secho(
+            f"Chunks: {sum(r.chunks for r in results.values()):,} indexed, "
+            f"{sum(r.embedded for r in results.values()):,} embedded "
+            f"({sum(r.embed_tokens for r in results.values()):,} tokens)",
+            fg=typer.colors.WHITE,
+        )
+        typer.secho(
+            "Stages: "
+            + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in stages.items())
+            + f" (total worker time {busy:.1f}s)",
+            fg=typer.colors.WHITE,
+        )
+
+
+def index_sources(
+    manifest: Path = typer.Argument(
+        ..., help="Sources to index: YAML (.yaml / .yml), JSON or CSV manifest"
+    ),
+    jobs: int = typer.Option(
+        min(4, os.cpu_count() or 1),
+        "--jobs",
+        "-j",
+        help="Max sources ingested at once (parsing and embedding share these slots)",
+    ),
+    force: bool = typer.Option(False, "--force", help="Rebuild sources that are up to date"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only show what would be indexed and why"
+    ),
+    report: Optional[Path] = typer.Option(
+        None, "--report", help="Also write the summary as JSON to this file"
+    ),
+):
+    """
+    Create or update sessions for every source in a manifest, non-interactively.
+    """
+
+    if jobs < 1:
+        typer.secho("Error: --jobs must be at least 1", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not manifest.is_file():
+        typer.secho(f"Manifest not found: {manifest}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    try:
+        index_jobs = load_manifest(manifest)
+    except (ValueError, OSError) as e:
+        typer.secho(f"Invalid manifest: {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    seen: Dict[str, IndexJob] = {}
+    for job in index_jobs:
+        # sirf id compute hoti hai (koi alias save nahi) - dry run bhi safe;
+        # alias build ya apply_settings ke baad save hota hai
+        job.session_id = resolve_session_id(job.source, job.source_type, job.options.identity)
+        if job.session_id in seen:
+            typer.secho(
+                f"Invalid manifest: {job.source} is listed twice "
+                f"(same session as {seen[job.session_id].source})",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(1)
+        seen[job.session_id] = job
+
+    pending, results = [], {}
+    for job in index_jobs:
+        reason = "forced" if force else stale_reason(job)
+        if reason:
+            pending.append((job, reason))
+            continue
+
+        updated = False if dry_run else apply_settings(job)
+        results[job.session_id] = IndexResult(
+            job.source,
+            job.display_name,
+            job.session_id,
+            UP_TO_DATE,
+            "settings updated" if updated else "",
+        )
+
+    if dry_run:
+        table = Table(title="QueryNest Index (dry run)")
+        table.add_column("Name", style="green")
+        table.add_column("Action")
+        table.add_column("Reason", style="white")
+        for job, reason in pending:
+            table.add_row(job.display_name, "[cyan]index[/cyan]", reason)
+        for result in results.values():
+            table.add_row(result.name, "skip", "up to date")
+        console.print(table)
+        return
+
+    typer.secho(
+        f"{len(index_jobs)} sources: {len(pending)} to index, {len(results)} up to date",
+        fg=typer.colors.BLUE,
+    )
+
+    start = time.perf_counter()
+    if pending:
+        results.update(_run(pending, jobs))
+    wall = time.perf_counter() - start
+
+    # config auto_gc: budget se upar ho toh purane sessions compact (manifest wale nahi)
+    collected = auto_gc(exclude=[job.session_id for job in index_jobs])
+    if collected:
+        typer.secho(
+            f"Storage over budget: compacted {len(collected.evicted)} least recently used "
+            f"sessions (freed {collected.freed / MB:,.1f} MB)",
+            fg=typer.colors.WHITE,
+        )
+
+    console.print()
+    _print_summary(index_jobs, results, wall)
+
+    if report:
+        atomic_write_json(
+            report,
+            {
+                "manifest": str(manifest),
+                "finished_at": SessionMeta.now(),
+                "wall_seconds": round(wall, 3),
+                "jobs": jobs,
+                "results": [asdict(results[job.session_id]) for job in index_jobs],
+            },
+            indent=2,
+        )
+        typer.secho(f"Report written to {report}", fg=typer.colors.WHITE)
+
+    if any(r.status == FAILED for r in results.values()):
+        raise typer.Exit(1)
@@ -1,28 +1,71 @@
 import json
-import shutil
+from pathlib import Path
 
-from querynest.utils.hashing import generate_session_id
+import requests
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from querynest.loaders.http_cache import (
+    fetch_page,
+    load_cached_response,
+    save_cached_response,
+)
+from querynest.loaders.pdf_loader import load_cached_pdfs
+from querynest.loaders.web_loader import build_web_document
+from querynest.ingestion.checkpoint import IngestCheckpoint
+from querynest.ingestion.pipeline import prepare_chunks, split_children
+from querynest.sessions.archive import ARCHIVE_SUFFIX, export_session, import_session
+from querynest.sessions.build_stats import collect_build_stats
+from querynest.sessions.gc import GC_LOCK_PATH, GC_MODES, MB, evict_session, plan_gc, run_gc
+from querynest.sessions.identity import resolve_session_id
+from querynest.processor.text_splitter import SPLITTERS
+from querynest.sessions.session_meta import (
+    BuildStats,
+    SessionUsage,
+    load_session_meta,
+    update_session_meta,
+)
+from querynest.sessions.usage import PRICES_PER_MILLION, commit_usage, estimate_cost
+from querynest.config.config_loader import load_config
+from querynest.storage.atomic import atomic_write_json, file_lock, session_lock
+from querynest.storage.segment_store import SegmentStore
 from querynest.utils.paths import SESSIONS_DIR
+from querynest.utils.timing import StageTimer
+from querynest.vector_store.faiss_store import FaissStore
 
 console = Console()
 
 app = typer.Typer()
 
 
+# sessions list --sort ke keys (meta.build se; build stats ke bina wale sessions aakhir mein)
+BUILD_SORT_KEYS = {
+    "chunks": lambda b: b.chunks,
+    "pages": lambda b: b.pages,
+    "size": lambda b: b.disk_bytes,
+    "build-time": lambda b: b.seconds,
+    "embed-time": lambda b: b.stages.get("embed", 0.0),
+    "throughput": lambda b: b.chunks_per_second,
+}
+
+
 @app.command("list")
 def list_sessions(
     all: bool = typer.Option(False, "--all", help="Show full metadata"),
     recent: bool = typer.Option(False, "--recent", help="Sort by last used (newest first)"),
     oldest: bool = typer.Option(False, "--oldest", help="Sort by created time (oldest first)"),
     name: bool = typer.Option(False, "--name", help="Sort alphabetically by name"),
+    sort: str = typer.Option(
+        None,
+        "--sort",
+        help=f"Sort by build stats (largest first): {' / '.join(BUILD_SORT_KEYS)}",
+    ),
+    ascending: bool = typer.Option(False, "--asc", help="With --sort: smallest first"),
 ):
     """List all QueryNest sessions"""
 
-    sort_flags = [recent, oldest, name]
+    sort_flags = [recent, oldest, name, sort is not None]
     if sum(sort_flags) > 1:
         typer.secho(
             "Please use only one sorting flag at a time",
@@ -30,6 +73,13 @@ def list_sessions(
         )
         raise typer.Exit(1)
 
+    if sort is not None and sort not in BUILD_SORT_KEYS:
+        typer.secho(
+            f"Unknown sort key '{sort}' (choose from {', '.join(BUILD_SORT_KEYS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
     if not SESSIONS_DIR.exists():
         typer.secho("No sessions found", fg=typer.colors.YELLOW)
         return
@@ -47,33 +97,54 @@ def list_sessions(
         typer.secho("No sessions found", fg=typer.colors.YELLOW)
         return
 
+    # session id → build stats (purane sessions mein nahi)
+    builds = {
+        meta.get("id"): BuildStats(**meta["build"]) for meta in sessions if meta.get("build")
+    }
+
     if recent:
         sessions.sort(key=lambda m: m.get("last_used_at", ""), reverse=True)
     elif oldest:
         sessions.sort(key=lambda m: m.get("created_at", ""))
     elif name:
         sessions.sort(key=lambda m: m.get("name", "").lower())
+    elif sort:
+        key = BUILD_SORT_KEYS[sort]
+        with_stats = [m for m in sessions if m.get("id") in builds]
+        with_stats.sort(key=lambda m: key(builds[m["id"]]), reverse=not ascending)
+        sessions = with_stats + [m for m in sessions if m.get("id") not in builds]
 
     table = Table(title="QueryNest Sessions")
 
     table.add_column("Session ID", style="cyan")
     table.add_column("Name", style="green")
     table.add_column("Type", style="yellow")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Build", justify="right", style="yellow")
 
     if all:
+        table.add_column("Pages", justify="right")
+        table.add_column("Chunks/s", justify="right")
         table.add_column("Source", style="white")
         table.add_column("Created At", style="magenta")
         table.add_column("Last Used", style="blue")
 
     for meta in sessions:
+        build = builds.get(meta.get("id"))
         row = [
             meta.get("id", ""),
             meta.get("name", ""),
             meta.get("source_type", "").upper(),
+            f"{build.chunks:,}" if build else "-",
+            _mb(build.disk_bytes) if build else "-",
+            f"{build.seconds:,.1f}s" if build else "-",
         ]
 
         if all:
             row.extend([
+                f"{build.pages:,}" if build else "-",
+                f"{build.chunks_per_second:,.0f}" if build else "-",
                 meta.get("source", ""),
                 meta.get("created_at", ""),
                 meta.get("last_used_at", ""),
@@ -99,8 +170,11 @@ def delete_session(session_id: str = typer.Argument(..., help="Session ID to del
         typer.secho("Aborted", fg=typer.colors.YELLOW)
         raise typer.Exit()
 
-    shutil.rmtree(session_path)
+    reclaimed = evict_session(session_path)
+
     typer.secho("Session deleted", fg=typer.colors.GREEN)
+    if reclaimed:
+        typer.secho(f"Reclaimed {reclaimed} unreferenced segments", fg=typer.colors.WHITE)
 
 @app.command("info")
 def session_info(
@@ -134,7 +208,9 @@ def session_info(
         raise typer.Exit(1)
 
     if source:
-        session_id = generate_session_id(source)
+        # local path hai toh PDF source (aliases bhi check hote hain)
+        source_type = "pdf" if Path(source).expanduser().exists() else "web"
+        session_id = resolve_session_id(source, source_type)
         if not session_id:
             typer.secho(
                 "No session found for given source",
@@ -163,7 +239,153 @@ def session_info(
     typer.secho("─" * 40, fg=typer.colors.BLUE)
 
     for key, value in meta.items():
-        typer.secho(f"{key}: {value}", fg=typer.colors.WHITE)
+        if key == "build":
+            # neeche readable form mein
+            continue
+        if isinstance(value, dict):
+            # options / usage jaise nested sections
+            typer.secho(f"{key}:", fg=typer.colors.WHITE)
+            for sub_key, sub_value in value.items():
+                typer.secho(f"  {sub_key}: {sub_value}", fg=typer.colors.WHITE)
+        else:
+            typer.secho(f"{key}: {value}", fg=typer.colors.WHITE)
+
+    if "usage" in meta:
+        usage = SessionUsage(**meta["usage"])
+        typer.secho(
+            f"  total_tokens: {usage.total_tokens}\n"
+            f"  estimated_cost_usd: {estimate_cost(usage):.4f}",
+            fg=typer.colors.WHITE,
+        )
+
+    if meta.get("build"):
+        _print_build_stats(BuildStats(**meta["build"]))
+    else:
+        typer.secho("build: (not recorded - run 'sessions rechunk' to rebuild)", fg=typer.colors.WHITE)
+
+
+def _print_build_stats(build: BuildStats):
+    stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in build.stages.items())
+    chunks = f"{build.chunks:,}" + (f" ({build.parents:,} parents)" if build.parents else "")
+    throughput = f"{build.chunks_per_second:,.0f} chunks/s"
+    if build.embed_per_second:
+        throughput += f", embedding {build.embed_per_second:,.0f} chunks/s"
+
+    typer.secho("build:", fg=typer.colors.WHITE)
+    typer.secho(
+        f"  built_at: {build.built_at} ({build.kind})\n"
+        f"  pages: {build.pages:,}\n"
+        f"  chunks: {chunks}\n"
+        f"  embedded: {build.embedded:,} (the rest reused from the segment store)\n"
+        f"  embedding_model: {build.embedding_model} ({build.dim} dims)\n"
+        f"  index: {build.index_type}\n"
+        f"  disk_size: {_mb(build.disk_bytes)}\n"
+        f"  stages: {stages} (total {build.seconds:.2f}s)\n"
+        f"  throughput: {throughput}",
+        fg=typer.colors.WHITE,
+    )
+
+
+# sessions usage --sort ke keys
+USAGE_SORT_KEYS = {
+    "total": lambda u: u.total_tokens,
+    "embed": lambda u: u.embed_tokens,
+    "prompt": lambda u: u.prompt_tokens,
+    "completion": lambda u: u.completion_tokens,
+    "avg-prompt": lambda u: u.prompt_tokens / u.llm_calls if u.llm_calls else 0,
+    "max-prompt": lambda u: u.max_prompt_tokens,
+    "turns": lambda u: u.turns,
+    "ingestions": lambda u: u.ingestions,
+    "cost": estimate_cost,
+}
+
+
+@app.command("usage")
+def usage_report(
+    sort: str = typer.Option(
+        "total",
+        "--sort",
+        help=f"Sort by: {' / '.join(USAGE_SORT_KEYS)}",
+    ),
+    limit: int = typer.Option(None, "--limit", "-n", help="Show only the top N sessions"),
+    ascending: bool = typer.Option(False, "--asc", help="Smallest first"),
+):
+    """Token usage and estimated cost across all sessions"""
+
+    if sort not in USAGE_SORT_KEYS:
+        typer.secho(
+            f"Unknown sort key '{sort}' (choose from {', '.join(USAGE_SORT_KEYS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    rows = []
+    if SESSIONS_DIR.exists():
+        for session_dir in SESSIONS_DIR.iterdir():
+            meta = load_session_meta(session_dir)
+            if meta:
+                rows.append(meta)
+
+    if not rows:
+        typer.secho("No sessions found", fg=typer.colors.YELLOW)
+        return
+
+    rows.sort(key=lambda m: USAGE_SORT_KEYS[sort](m.usage), reverse=not ascending)
+    shown = rows[:limit] if limit else rows
+
+    table = Table(title=f"QueryNest Token Usage (sorted by {sort})")
+    table.add_column("Session ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Turns", justify="right")
+    table.add_column("Ingests", justify="right")
+    table.add_column("Embed tok", justify="right")
+    table.add_column("Prompt tok", justify="right")
+    table.add_column("Completion tok", justify="right")
+    table.add_column("Avg prompt", justify="right")
+    table.add_column("Max prompt", justify="right", style="yellow")
+    table.add_column("Est. $", justify="right", style="magenta")
+
+    total = SessionUsage()
+    for meta in rows:
+        total.merge(meta.usage)
+
+    for meta in shown:
+        u = meta.usage
+        table.add_row(
+            meta.id[:12],
+            meta.name,
+            str(u.turns),
+            str(u.ingestions),
+            f"{u.embed_tokens:,}",
+            f"{u.prompt_tokens:,}",
+            f"{u.completion_tokens:,}",
+            f"{USAGE_SORT_KEYS['avg-prompt'](u):,.0f}",
+            f"{u.max_prompt_tokens:,}",
+            f"{estimate_cost(u):.4f}",
+        )
+
+    table.add_section()
+    table.add_row(
+        f"all ({len(rows)})",
+        "",
+        str(total.turns),
+        str(total.ingestions),
+        f"{total.embed_tokens:,}",
+        f"{total.prompt_tokens:,}",
+        f"{total.completion_tokens:,}",
+        f"{USAGE_SORT_KEYS['avg-prompt'](total):,.0f}",
+        f"{total.max_prompt_tokens:,}",
+        f"{estimate_cost(total):.4f}",
+    )
+
+    console.print(table)
+    typer.secho(
+        "Costs are estimates at "
+        + ", ".join(f"${price}/1M {kind}" for kind, price in PRICES_PER_MILLION.items())
+        + " tokens",
+        fg=typer.colors.WHITE,
+        dim=True,
+    )
 
 
 @app.command("rename")
@@ -186,14 +408,15 @@ def rename_session(
         typer.secho("Metadata not found for this session", fg=typer.colors.RED)
         raise typer.Exit(1)
 
-    with open(meta_path, "r", encoding="utf-8") as f:
-        meta = json.load(f)
+    # lock ke andar raw JSON read-modify-write (atomic replace)
+    with session_lock(session_dir):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
 
-    old_name = meta.get("name", "Unknown")
-    meta["name"] = new_name
+        old_name = meta.get("name", "Unknown")
+        meta["name"] = new_name
 
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2)
+        atomic_write_json(meta_path, meta, indent=2)
 
     typer.secho("Session renamed successfully", fg=typer.colors.GREEN)
     typer.secho(f"Old name: {old_name}", fg=typer.colors.WHITE)
@@ -262,3 +485,519 @@ def search_sessions(
         )
 
     console.print(table)
+
+
+@app.command("refresh")
+def refresh_session(
+    session_id: str = typer.Argument(..., help="Web session ID to refresh"),
+):
+    """
+    Re-fetch a web session's pages and re-embed only the ones that changed.
+    """
+
+    session_dir = SESSIONS_DIR / session_id
+
+    if not session_dir.exists():
+        typer.secho("Session not found", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    # load → diff → save ek hi lock mein - beech mein chat / gc ki generation
+    # ya usage update overwrite na ho
+    with session_lock(session_dir):
+        meta = load_session_meta(session_dir)
+        if not meta:
+            typer.secho("Metadata not found for this session", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+        if meta.source_type != "web":
+            typer.secho("Only web sessions can be refreshed", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+        store = FaissStore()
+        if not store.load(session_id):
+            if meta.compacted_at:
+                typer.secho(
+                    "Session was compacted by 'sessions gc' - open it with chat (or rechunk it) first",
+                    fg=typer.colors.RED,
+                )
+            else:
+                typer.secho("Vector index not found for this session", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+        # app.py multiple URLs comma-separated store karta hai
+        urls = [url.strip() for url in meta.source.split(",") if url.strip()]
+
+        unchanged, updated, failed = 0, 0, 0
+        # naye validators index save hone ke baad hi persist (fail ho toh agla refresh retry kare)
+        fetched = []
+        timer = StageTimer()
+
+        for url in urls:
+            try:
+                with timer.stage("load"):
+                    result = fetch_page(session_id, url)
+            except requests.exceptions.RequestException as e:
+                typer.secho(f"Failed: {url} ({e})", fg=typer.colors.RED)
+                failed += 1
+                continue
+
+            if result.status_code not in (200, 304):
+                typer.secho(
+                    f"Failed: {url} (status {result.status_code})", fg=typer.colors.RED
+                )
+                failed += 1
+                continue
+
+            if not result.changed:
+                reason = "304 Not Modified" if result.not_modified else "content unchanged"
+                typer.secho(f"Skipped: {url} ({reason})", fg=typer.colors.WHITE)
+                fetched.append(result)
+                unchanged += 1
+                continue
+
+            with timer.stage("load"):
+                document = build_web_document(url, result.html, meta.options.extractor)
+            if not document.page_content:
+                typer.secho(f"Failed: {url} (no readable content)", fg=typer.colors.RED)
+                failed += 1
+                continue
+
+            removed = store.remove_source(url)
+            with timer.stage("split"):
+                # baaki pages ke already indexed chunks ke against bhi dedup hota hai
+                chunks, dedup_report = prepare_chunks(
+                    [document], meta.options, reference=store.parent_documents()
+                )
+                children, parents = split_children(chunks, meta.options)
+            with timer.stage("embed"):
+                store.add_documents(children, parents)
+
+            typer.secho(
+                f"Updated: {url} ({removed} old chunks -> {len(children)} new chunks)",
+                fg=typer.colors.GREEN,
+            )
+            if dedup_report and dedup_report.removed:
+                typer.secho(f"  {dedup_report.summary()}", fg=typer.colors.CYAN)
+            fetched.append(result)
+            updated += 1
+
+        if updated:
+            with timer.stage("save"):
+                store.save(session_id)
+
+            # sirf changed pages ki timings - pages / chunks poore session ke
+            build = collect_build_stats(store, session_id, "refresh", timer.stages, len(urls))
+            meta = update_session_meta(session_dir, lambda m: setattr(m, "build", build))
+
+        for result in fetched:
+            save_cached_response(session_id, result)
+
+        # re-embedding ka token usage
+        commit_usage(session_dir, meta, "refresh")
+
+    typer.secho(
+        f"\nRefresh complete: {updated} updated, {unchanged} unchanged, {failed} failed",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+
+
+def _cached_source_documents(meta, reparse: bool = False) -> list:
+    """
+    Session ke source documents bina parse / fetch kiye:
+    PDF → page cache (miss wali PDFs sirf reparse=True par parse), web → HTTP cache ka stored body
+    """
+    if meta.source_type == "pdf":
+        if not Path(meta.source).exists():
+            typer.secho(f"Source not found: {meta.source}", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+        documents, missing = load_cached_pdfs(meta.source, parse_missing=reparse)
+        if missing and not reparse:
+            typer.secho(
+                f"{len(missing)} PDF(s) not in the page cache (e.g. {missing[0].name}) - "
+                "rerun with --reparse to parse them again",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(1)
+        if missing:
+            typer.secho(
+                f"Parsed {len(missing)} PDF(s) missing from the page cache", fg=typer.colors.YELLOW
+            )
+        return documents
+
+    documents = []
+    for url in [url.strip() for url in meta.source.split(",") if url.strip()]:
+        # is version se pehle bane sessions ka body purane URL-only cache mein hai
+        cached = load_cached_response(meta.id, url, legacy=True)
+        if cached is None:
+            typer.secho(
+                f"No cached copy of {url} - run 'sessions refresh' first", fg=typer.colors.RED
+            )
+            raise typer.Exit(1)
+        _, body = cached
+        documents.append(build_web_document(url, body, meta.options.extractor))
+    return documents
+
+
+@app.command("rechunk")
+def rechunk_session(
+    session_id: str = typer.Argument(..., help="Session ID to rechunk"),
+    splitter: str = typer.Option(None, "--splitter", help="recursive / fast"),
+    chunk_size: int = typer.Option(None, "--chunk-size", help="Max characters per chunk"),
+    chunk_overlap: int = typer.Option(
+        None, "--chunk-overlap", help="Characters shared by consecutive chunks"
+    ),
+    max_tokens: int = typer.Option(
+        None, "--max-tokens", help="Also cap chunks at this many tokens (fast splitter only)"
+    ),
+    parent_child: bool = typer.Option(
+        None, "--parent-child/--flat", help="Switch between parent-child and flat chunks"
+    ),
+    child_chunk_size: int = typer.Option(
+        None, "--child-chunk-size", help="Max characters per child chunk"
+    ),
+    child_chunk_overlap: int = typer.Option(
+        None, "--child-chunk-overlap", help="Characters shared by consecutive child chunks"
+    ),
+    dedup: bool = typer.Option(None, "--dedup/--no-dedup", help="Near-duplicate removal"),
+    shard_size: int = typer.Option(
+        None, "--shard-size", help="Chunks per index shard (0 = one index)"
+    ),
+    reparse: bool = typer.Option(
+        False, "--reparse", help="Parse PDFs that are missing from the page cache again"
+    ),
+):
+    """
+    Rebuild a session's chunks and vectors from cached pages with new chunking settings.
+    Options not given keep the session's current value.
+    """
+
+    session_dir = SESSIONS_DIR / session_id
+
+    if not session_dir.exists():
+        typer.secho("Session not found", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    meta = load_session_meta(session_dir)
+    if not meta:
+        typer.secho("Metadata not found for this session", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    changes = {
+        "splitter": splitter,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "max_tokens": max_tokens,
+        "parent_child": parent_child,
+        "child_chunk_size": child_chunk_size,
+        "child_chunk_overlap": child_chunk_overlap,
+        "dedup": dedup,
+        "shard_size": shard_size,
+    }
+    options = meta.options.model_copy(
+        update={key: value for key, value in changes.items() if value is not None}
+    )
+
+    if options.splitter not in SPLITTERS:
+        typer.secho(
+            f"Unknown splitter '{options.splitter}' (choose from {', '.join(SPLITTERS)})",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if options.chunk_overlap >= options.chunk_size:
+        typer.secho("--chunk-overlap must be smaller than --chunk-size", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if options.parent_child and not (
+        options.child_chunk_overlap < options.child_chunk_size < options.chunk_size
+    ):
+        typer.secho(
+            "Need --child-chunk-overlap < --child-chunk-size < --chunk-size",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if options.max_tokens is not None and options.splitter != "fast":
+        typer.secho("--max-tokens requires --splitter fast", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if options.shard_size < 0:
+        typer.secho("--shard-size must be 0 or more", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    old_store = FaissStore()
+    old_chunks = len(old_store.documents()) if old_store.load(session_id) else 0
+
+    timer = StageTimer()
+    with timer.stage("load"):
+        documents = _cached_source_documents(meta, reparse)
+
+    with timer.stage("split"):
+        chunks, dedup_report = prepare_chunks(documents, options)
+        children, parents = split_children(chunks, options)
+    if dedup_report and dedup_report.removed:
+        typer.secho(dedup_report.summary(), fg=typer.colors.CYAN)
+
+    # khali pages / body - build ko kuch nahi milta, session jaisa hai waisa rehta hai
+    if not children:
+        typer.secho(
+            "No text left to index with these settings - session left unchanged",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    # pehla progress call: (segment store mein mile, unique total)
+    reused = []
+
+    def progress(done: int, total: int):
+        if not reused:
+            reused.extend((done, total - done))
+
+    # same text ke chunks (kisi bhi session ke) segment store se reuse - sirf naye embed hote hain
+    store = FaissStore()
+    report = store.build(
+        children,
+        session_id,
+        precision=options.precision,
+        progress=progress,
+        parents=parents,
+        shard_size=options.shard_size,
+        timer=timer,
+    )
+    if report:
+        typer.secho(report.summary(), fg=typer.colors.CYAN)
+        options.precision = report.precision
+
+    build = collect_build_stats(
+        store,
+        session_id,
+        "rechunk",
+        timer.stages,
+        len(documents),
+        pdf_source=meta.source if meta.source_type == "pdf" else None,
+    )
+
+    def rechunked(m):
+        m.options = options
+        # compacted session ka index bhi isi se wapas ban gaya
+        m.compacted_at = None
+        m.build = build
+
+    meta = update_session_meta(session_dir, rechunked)
+    IngestCheckpoint(session_dir).clear()
+    commit_usage(session_dir, meta, "rechunk")
+
+    typer.secho(
+        f"\nRechunk complete: {old_chunks} -> {len(children)} chunks "
+        f"({reused[0]} vectors reused, {reused[1]} embedded)",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+
+
+def _mb(size: int) -> str:
+    return f"{size / MB:,.1f} MB"
+
+
+@app.command("gc")
+def gc_sessions(
+    budget_mb: int = typer.Option(
+        None, "--budget-mb", help="Disk budget in MB (default: config storage budget)"
+    ),
+    mode: str = typer.Option(
+        "compact",
+        "--mode",
+        help="compact (drop vectors, keep chunk text) / delete (remove whole sessions)",
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be evicted"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask before deleting sessions"),
+):
+    """
+    Bring ~/.querynest under the storage budget by compacting or deleting
+    the least recently used sessions.
+    """
+
+    if mode not in GC_MODES:
+        typer.secho(
+            f"Unknown mode '{mode}' (choose from {', '.join(GC_MODES)})", fg=typer.colors.RED
+        )
+        raise typer.Exit(1)
+
+    if budget_mb is None:
+        config = load_config()
+        budget_mb = config.storage_budget_mb if config else None
+    if not budget_mb or budget_mb < 0:
+        typer.secho(
+            "No storage budget - pass --budget-mb or run 'querynest config set-storage-budget'",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    segments = SegmentStore()
+
+    # plan aur run ek hi gc lock ke andar (auto gc dusre terminal mein chal raha ho sakta hai)
+    with file_lock(GC_LOCK_PATH):
+        plan = plan_gc(budget_mb * MB, mode, segments=segments)
+
+        typer.secho(
+            f"Storage: {_mb(plan.total)} used, budget {_mb(plan.budget)}",
+            fg=typer.colors.BLUE,
+            bold=True,
+        )
+        typer.secho(
+            "  "
+            + ", ".join(f"{part} {_mb(size)}" for part, size in plan.usage.items()),
+            fg=typer.colors.WHITE,
+        )
+
+        evicting = {footprint.meta.id for footprint in plan.evict}
+
+        table = Table(title="Sessions (least recently used first)")
+        table.add_column("Session ID", style="cyan")
+        table.add_column("Name", style="green")
+        table.add_column("Last Used", style="blue")
+        table.add_column("Size", justify="right")
+        table.add_column("Frees", justify="right", style="yellow")
+        table.add_column("Action", style="magenta")
+
+        for footprint in plan.sessions:
+            size = footprint.index_bytes + footprint.kept_bytes + footprint.segment_bytes
+            if footprint.meta.id in evicting:
+                action = mode
+            else:
+                action = "compacted" if footprint.compacted else "keep"
+            table.add_row(
+                footprint.meta.id[:12],
+                footprint.meta.name,
+                footprint.meta.last_used_at[:19].replace("T", " "),
+                _mb(size),
+                _mb(footprint.reclaimable(mode)) if footprint.meta.id in evicting else "",
+                action,
+            )
+
+        if plan.sessions:
+            console.print(table)
+
+        for stale in plan.stale:
+            typer.secho(
+                f"Abandoned ingestion {stale.session_dir.name[:12]}: no activity for "
+                f"{stale.age_days:.0f} days ({_mb(stale.size)}) - remove",
+                fg=typer.colors.WHITE,
+            )
+        if plan.orphan_bytes:
+            typer.secho(
+                f"Unreferenced segments from abandoned ingestions: {_mb(plan.orphan_bytes)} - remove",
+                fg=typer.colors.WHITE,
+            )
+
+        if plan.projected > plan.budget:
+            typer.secho(
+                f"Still over budget after evicting every eligible session (~{_mb(plan.projected)}) - "
+                "the page / HTTP caches and segments shared with kept sessions are never evicted",
+                fg=typer.colors.YELLOW,
+            )
+
+        if not plan.evict and not plan.garbage:
+            if plan.total <= plan.budget:
+                typer.secho("Within budget - nothing to do", fg=typer.colors.GREEN)
+            return
+
+        if dry_run:
+            typer.secho(
+                f"\nDry run: would {mode} {len(plan.evict)} sessions, remove "
+                f"{len(plan.stale)} abandoned ingestions and free "
+                f"~{_mb(plan.reclaimable)} (-> ~{_mb(plan.projected)})",
+                fg=typer.colors.BLUE,
+                bold=True,
+            )
+            return
+
+        if mode == "delete" and plan.evict and not yes:
+            if not typer.confirm(f"Delete {len(plan.evict)} sessions permanently?"):
+                typer.secho("Aborted", fg=typer.colors.YELLOW)
+                raise typer.Exit()
+
+        result = run_gc(plan, segments)
+
+    done = "Compacted" if mode == "compact" else "Deleted"
+    typer.secho(
+        f"\n{done} {len(result.evicted)} sessions, removed {len(result.removed_ingests)} "
+        f"abandoned ingestions: freed {_mb(result.freed)} "
+        f"(now {_mb(result.after)}, {result.reclaimed_segments} segments reclaimed)",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+    if mode == "compact" and result.evicted:
+        typer.secho(
+            "Compacted sessions rebuild their index (re-embed only) the next time you chat with them",
+            fg=typer.colors.WHITE,
+        )
+
+
+@app.command("export")
+def export_archive(
+    session_id: str = typer.Argument(..., help="Session ID to export"),
+    output: Path = typer.Argument(
+        None, help=f"Archive path (default: <session name>{ARCHIVE_SUFFIX})"
+    ),
+    history: bool = typer.Option(
+        True, "--history/--no-history", help="Include the chat history"
+    ),
+):
+    """
+    Pack a session (vectors, chunks, metadata, chat) into a single portable archive.
+    """
+
+    session_dir = SESSIONS_DIR / session_id
+    meta = load_session_meta(session_dir)
+    if not meta:
+        typer.secho("Session not found", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if output is None:
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in meta.name)
+        output = Path(f"{safe_name or session_id[:12]}{ARCHIVE_SUFFIX}")
+
+    try:
+        summary = export_session(session_id, output, include_history=history)
+    except ValueError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    typer.secho(f"Exported '{meta.name}' to {output}", fg=typer.colors.GREEN)
+    typer.secho(
+        f"{summary['chunks']} chunks, {summary['precision']} index, "
+        f"{_mb(summary['bytes'])}",
+        fg=typer.colors.WHITE,
+    )
+
+
+@app.command("import")
+def import_archive(
+    archive: Path = typer.Argument(..., help="Archive created by 'sessions export'"),
+    replace: bool = typer.Option(
+        False, "--replace", help="Overwrite an existing session with the same ID"
+    ),
+):
+    """
+    Create a session from an exported archive (no re-embedding).
+    """
+
+    if not archive.exists():
+        typer.secho(f"Archive not found: {archive}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    try:
+        meta = import_session(archive, replace=replace)
+    except FileExistsError as e:
+        typer.secho(f"{e} - use --replace to overwrite it", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    except (ValueError, RuntimeError) as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    typer.secho(f"Imported session '{meta.name}'", fg=typer.colors.GREEN)
+    typer.secho(f"Session ID: {meta.id}", fg=typer.colors.WHITE)
+    typer.secho(f"Source: {meta.source}", fg=typer.colors.WHITE)
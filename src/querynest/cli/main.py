@@ -7,7 +7,7 @@ warnings.filterwarnings(
 )
 
 
-from querynest.cli.commands import chat, config, history
+from querynest.cli.commands import chat, config, history, index
 from querynest.config.bootstrap import bootstrap
 from querynest.cli.commands import sessions
 
@@ -31,6 +31,8 @@ app.add_typer(chat.app, name="chat", help="Chat with a PDF or Web page")
 app.add_typer(config.app, name="config", help="Manage configuration")
 app.add_typer(history.app, name="history", help="View chat history")
 app.add_typer(sessions.app, name="sessions", help="Manage sessions")
+# index ek hi command hai (positional manifest argument - group callback mein nahi chalta)
+app.command("index", help="Index many sources from a manifest (non-interactive)")(index.index_sources)
 
 
 
@@ -1,5 +1,6 @@
 import json
 from querynest.config.config_model import AppConfig
+from querynest.storage.atomic import atomic_write_json
 from querynest.utils.paths import CONFIG_PATH, ensure_base_dirs
 
 
@@ -17,11 +18,28 @@ def load_config() -> AppConfig | None:
 def save_config(config: AppConfig):
     ensure_base_dirs()
 
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(config.model_dump(), f, indent=2)
+    atomic_write_json(CONFIG_PATH, config.model_dump(), indent=2)
 
 
 def update_api_key(new_key: str):
-    # It overwrites the existing Gemini API key
-    config = AppConfig(gemini_api_key=new_key)
+    # It overwrites the existing Gemini API key (baaki settings waise hi rehti hain)
+    config = load_config()
+    settings = config.model_dump() if config else {}
+    save_config(AppConfig(**{**settings, "gemini_api_key": new_key}))
+
+
+def update_storage_settings(budget_mb: int | None, auto_gc: bool | None) -> AppConfig:
+    """
+    None = jo set hai wahi rehne do; budget 0 = budget hatao
+    """
+    config = load_config()
+    if config is None:
+        raise RuntimeError("QueryNest is not configured yet - set the API key first")
+
+    if budget_mb is not None:
+        config.storage_budget_mb = budget_mb or None
+    if auto_gc is not None:
+        config.auto_gc = auto_gc
+
     save_config(config)
+    return config
@@ -1,6 +1,12 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 class AppConfig(BaseModel):
     # min length aala faltu mein laga diya , bas itna rok sake ki 123 ya awein kuch bhi na daal de user
     gemini_api_key: str = Field(..., min_length=10)
 
+    # ~/.querynest ka disk budget (MB) - sessions gc isse upar hone par LRU sessions compact karta hai
+    storage_budget_mb: Optional[int] = None
+    # True → chat har session khulne ke baad khud gc chalata hai (budget set hona chahiye)
+    auto_gc: bool = False
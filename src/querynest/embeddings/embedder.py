@@ -1,8 +1,42 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
+from querynest.sessions.usage import meter
+from querynest.utils.tokens import count_tokens
+from querynest.utils.tracing import span
+
 # isme jarurat nahi hai api key dene ki ye apne aap nikaal lene os environment se
 
 def get_embeddings():
     return GoogleGenerativeAIEmbeddings(
         model="models/text-embedding-004"
     )
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """
+    Kisi bhi embeddings provider ko wrap karke:
+    - har call ka span banata hai (embed.batch = documents, embed.query = retrieval ke time query)
+    - input tokens usage meter mein record karta hai
+    """
+
+    def __init__(self, inner: Embeddings):
+        self.inner = inner
+        # segment keys isi naam se bante hain
+        self.model = getattr(inner, "model", type(inner).__name__)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(count_tokens(text) for text in texts)
+        with span("embed.batch", texts=len(texts), tokens=tokens):
+            vectors = self.inner.embed_documents(texts)
+        meter.record_embedding(len(texts), tokens)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        tokens = count_tokens(text)
+        with span("embed.query", tokens=tokens):
+            vector = self.inner.embed_query(text)
+        meter.record_embedding(1, tokens)
+        return vector
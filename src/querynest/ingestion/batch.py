@@ -0,0 +1,447 @@
+"""
+This file :
+- querynest index: ek manifest (YAML / JSON / CSV) ke saare sources ki
+  non-interactive ingestion - nightly jobs ke liye
+- Manifest parse + validate (IndexJob), up-to-date check, aur worker process
+  jo ek source ki poori ingestion (load → split → embed + index) chalata hai
+
+Manifest (YAML / JSON):
+    defaults:              # optional - har source par lagte hain
+      chunk_size: 1200
+      precision: int8
+    sources:
+      - source: docs/handbook.pdf        # PDF file / directory (manifest ke folder se relative)
+        name: Handbook
+      - source: https://example.com/faq  # http(s) → web
+        extractor: fast
+Top-level sirf list bhi chalti hai. CSV: header row mein source, type, name
+aur koi bhi SessionOptions field; khaali cell = default.
+
+Up to date = session bana hua hai, compacted nahi, koi adhuri ingestion nahi,
+index options same hain, aur PDF files ka fingerprint (size + mtime) last build jaisa hai.
+Web pages ke content changes 'sessions refresh' dekhta hai.
+
+Har source alag worker process mein (apna usage meter, apna GIL) - load / parse aur
+embed dono usi slot mein chalte hain, isliye --jobs poori ingestion ki global limit hai.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faiss
+from pydantic import ValidationError
+
+from querynest.ingestion.checkpoint import CHECKPOINT_DIR, STATE_FILE, IngestCheckpoint
+from querynest.ingestion.pipeline import ingest_source
+from querynest.loaders.pdf_loader import load_pdfs
+from querynest.loaders.web_loader import EXTRACTORS, load_web_page
+from querynest.processor.text_splitter import SPLITTERS
+from querynest.sessions.identity import (
+    IDENTITY_MODES,
+    lookup_alias,
+    save_alias,
+    source_fingerprint,
+)
+from querynest.sessions.session_meta import (
+    INDEX_OPTIONS,
+    SessionMeta,
+    SessionOptions,
+    load_session_meta,
+    update_session_meta,
+)
+from querynest.sessions.usage import commit_usage
+from querynest.storage.manifest import read_manifest
+from querynest.utils.paths import SESSIONS_DIR, get_session_dir
+from querynest.vector_store.compression import PRECISIONS
+from querynest.vector_store.faiss_store import FaissStore
+from querynest.vector_store.shards import limit_build_cpus
+
+try:
+    import yaml
+except ImportError:  # optional extra "yaml" - sirf YAML manifests ke liye
+    yaml = None
+
+SOURCE_TYPES = ("pdf", "web")
+
+# manifest entry ke apne keys (baaki SessionOptions fields)
+ENTRY_KEYS = ("source", "type", "name")
+
+# IndexResult.status
+CREATED = "created"
+REBUILT = "rebuilt"
+UP_TO_DATE = "up to date"
+FAILED = "failed"
+
+
+@dataclass
+class IndexJob:
+    source: str
+    source_type: str
+    options: SessionOptions
+    # manifest mein diya ho toh (naye session ka default: file / directory naam ya URL)
+    name: Optional[str] = None
+    # resolve_session_id se (CLI bharta hai)
+    session_id: str = ""
+
+    @property
+    def display_name(self) -> str:
+        if self.name:
+            return self.name
+        if self.source_type == "pdf":
+            return self.source.rstrip("/").split("/")[-1]
+        return self.source[:50]
+
+
+@dataclass
+class IndexResult:
+    source: str
+    name: str
+    session_id: str
+    status: str
+    # kyun (re)build hua / kyun fail hua
+    reason: str = ""
+    pages: int = 0
+    chunks: int = 0
+    embedded: int = 0
+    embed_tokens: int = 0
+    # worker mein source ka poora time
+    seconds: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+def check_options(options: SessionOptions):
+    """
+    chat ke flag checks jaise hi - galat combination par ValueError
+    """
+    if options.identity not in IDENTITY_MODES:
+        raise ValueError(f"identity must be one of {', '.join(IDENTITY_MODES)}")
+    if options.extractor not in EXTRACTORS:
+        raise ValueError(f"extractor must be one of {', '.join(EXTRACTORS)}")
+    if options.splitter not in SPLITTERS:
+        raise ValueError(f"splitter must be one of {', '.join(SPLITTERS)}")
+    if options.chunk_overlap >= options.chunk_size:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+    if options.parent_child and not (
+        options.child_chunk_overlap < options.child_chunk_size < options.chunk_size
+    ):
+        raise ValueError("need child_chunk_overlap < child_chunk_size < chunk_size")
+    if options.max_tokens is not None and options.splitter != "fast":
+        raise ValueError("max_tokens requires splitter: fast")
+    if options.precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}")
+    if options.shard_size < 0:
+        raise ValueError("shard_size must be 0 or more")
+    if options.rescore_candidates < 1:
+        raise ValueError("rescore_candidates must be at least 1")
+    if not 0.0 <= options.lexical_weight <= 1.0:
+        raise ValueError("lexical_weight must be between 0 and 1")
+    if not 1 <= options.min_k <= options.max_k:
+        raise ValueError("need 1 <= min_k <= max_k")
+    if not 0.0 <= options.score_gap < 1.0:
+        raise ValueError("score_gap must be between 0 and 1")
+    if options.dedup_mode not in ("drop", "collapse"):
+        raise ValueError("dedup_mode must be 'drop' or 'collapse'")
+    if not 0 <= options.dedup_max_distance <= 63:
+        raise ValueError("dedup_max_distance must be between 0 and 63")
+
+
+# Manifest
+
+
+def _read_entries(path: Path) -> tuple[dict, list]:
+    """
+    Returns: (defaults, entries) - format file extension se
+    """
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        # khaali cells = default; poori khaali rows skip (header se zyada cells ignore)
+        entries = [
+            {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+            for row in rows
+        ]
+        return {}, [entry for entry in entries if entry]
+
+    text = path.read_text(encoding="utf-8")
+    if suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError(
+                "YAML manifests need PyYAML: pip install 'querynest-cli[yaml]' - or use JSON / CSV"
+            )
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}")
+    elif suffix == ".json":
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+    else:
+        raise ValueError(f"Unknown manifest format '{suffix}' (use .yaml, .yml, .json or .csv)")
+
+    if isinstance(data, list):
+        return {}, data
+    if isinstance(data, dict) and isinstance(data.get("sources"), list):
+        defaults = data.get("defaults") or {}
+        if not isinstance(defaults, dict):
+            raise ValueError("'defaults' must be a mapping of session options")
+        return defaults, data["sources"]
+    raise ValueError("Manifest must be a list of sources or have a 'sources' list")
+
+
+def _build_options(values: dict, where: str) -> SessionOptions:
+    unknown = sorted(set(values) - set(SessionOptions.model_fields))
+    if unknown:
+        raise ValueError(f"{where}: unknown option(s) {', '.join(unknown)}")
+
+    try:
+        options = SessionOptions(**values)
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise ValueError(f"{where}: {error['loc'][0]}: {error['msg']}")
+
+    try:
+        check_options(options)
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}")
+    return options
+
+
+def load_manifest(path: Path) -> List[IndexJob]:
+    """
+    Manifest ke sources → IndexJobs. PDF paths manifest ke folder se relative.
+    Koi bhi entry galat ho toh ValueError (entry number ke saath) - kuch index nahi hota
+    """
+    defaults, entries = _read_entries(path)
+    _build_options(defaults, "defaults")
+    # absolute (symlinks resolve kiye bina) - session id cwd par depend na kare
+    base = path.parent.absolute()
+
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        where = f"source {number}"
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: expected a mapping with a 'source'")
+
+        source = str(entry.get("source") or "").strip()
+        if not source:
+            raise ValueError(f"{where}: missing 'source'")
+
+        source_type = entry.get("type") or (
+            "web" if source.startswith(("http://", "https://")) else "pdf"
+        )
+        if source_type not in SOURCE_TYPES:
+            raise ValueError(f"{where}: type must be one of {', '.join(SOURCE_TYPES)}")
+        if source_type == "pdf":
+            # absolute path jaisa likha hai waisa (chat --pdf wala hi session id)
+            source = os.path.normpath(base / Path(source).expanduser())
+
+        options = _build_options(
+            {**defaults, **{k: v for k, v in entry.items() if k not in ENTRY_KEYS}}, where
+        )
+        name = str(entry["name"]).strip() if entry.get("name") else None
+        jobs.append(IndexJob(source, source_type, options, name))
+
+    if not jobs:
+        raise ValueError("Manifest has no sources")
+    return jobs
+
+
+# Up-to-date check
+
+
+def _same_index_options(current: SessionOptions, wanted: SessionOptions) -> List[str]:
+    """
+    Returns: index options jo alag hain
+    """
+    changed = []
+    for option in INDEX_OPTIONS:
+        have, want = getattr(current, option), getattr(wanted, option)
+        # PQ ke liye kam vectors → build int8 par fallback karta hai, wahi meta mein hai
+        if option == "precision" and (have, want) == ("int8", "pq"):
+            continue
+        if have != want:
+            changed.append(option)
+    return changed
+
+
+def stale_reason(job: IndexJob) -> Optional[str]:
+    """
+    Source ko (re)build kyun karna hai - None = up to date
+    """
+    # folder sirf ingest karne wala worker banata hai (dry run / skip par koi side effect nahi)
+    session_dir = SESSIONS_DIR / job.session_id
+    meta = load_session_meta(session_dir)
+
+    if meta is None:
+        return "new session"
+    if meta.compacted_at:
+        return "compacted by gc"
+    if meta.build is None:
+        return "no build stats"
+    if (session_dir / CHECKPOINT_DIR / STATE_FILE).exists():
+        return "interrupted ingestion"
+    if read_manifest(session_dir) is None:
+        return "index missing"
+
+    changed = _same_index_options(meta.options, job.options)
+    if changed:
+        return f"options changed: {', '.join(changed)}"
+
+    if job.source_type == "pdf":
+        path = Path(job.source).expanduser()
+        # path hi nahi hai toh worker loader ka error report karega
+        if not path.exists() or meta.build.source_fingerprint != source_fingerprint(path):
+            return "source changed"
+
+    return None
+
+
+def apply_settings(job: IndexJob) -> bool:
+    """
+    Up-to-date session par manifest ka naam + retrieval options (rebuild ke bina).
+    Returns: meta badla
+    """
+    session_dir = SESSIONS_DIR / job.session_id
+    meta = load_session_meta(session_dir)
+
+    # moved / copied corpus content hash se mila - naya path bhi alias (chat resume jaisa);
+    # resolve side-effect free hai, isliye alias yahin committed session ke liye save hota hai
+    if meta.options.identity == "content" and lookup_alias(job.source) != job.session_id:
+        save_alias(job.source, job.session_id)
+    wanted = job.options.model_copy(
+        update={option: getattr(meta.options, option) for option in INDEX_OPTIONS}
+    )
+    name = job.name or meta.name
+    if wanted == meta.options and name == meta.name:
+        return False
+
+    def apply(m: SessionMeta):
+        m.options = wanted
+        m.name = name
+
+    update_session_meta(session_dir, apply)
+    return True
+
+
+# Worker process
+
+
+def init_worker(cpus: int):
+    """
+    Process pool initializer: har worker sirf apne hisse ke cores (faiss threads + shard builds)
+    """
+    faiss.omp_set_num_threads(cpus)
+    limit_build_cpus(cpus)
+
+
+def _loader_error(output: str) -> str:
+    """
+    Loaders error print karke sys.exit karte hain - unke output ki "Error: ..." line
+    """
+    for line in output.splitlines():
+        if line.strip().startswith("Error:"):
+            return line.strip()[len("Error:") :].strip()
+    return "loader exited"
+
+
+def _load(job: IndexJob) -> list:
+    if job.source_type == "web":
+        return [load_web_page(job.source, job.session_id, job.options.extractor)]
+    return load_pdfs(job.source, show_progress=False)
+
+
+def index_source(job: IndexJob, reason: str) -> IndexResult:
+    """
+    Worker: ek source ki poori ingestion, bina prompt / progress bar ke.
+    Checkpoint chat jaisa hi - beech mein ruka ho toh agli run wahin se.
+    Koi bhi failure IndexResult(status=FAILED) banta hai (baaki sources chalte rehte hain)
+    """
+    start = time.perf_counter()
+    result = IndexResult(job.source, job.display_name, job.session_id, FAILED, reason)
+    output = io.StringIO()
+
+    try:
+        with redirect_stdout(output):
+            _index(job, result)
+    except SystemExit:
+        result.status, result.reason = FAILED, _loader_error(output.getvalue())
+    except Exception as e:
+        result.status, result.reason = FAILED, str(e) or type(e).__name__
+
+    result.seconds = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _index(job: IndexJob, result: IndexResult):
+    session_dir = get_session_dir(job.session_id)
+    existing = load_session_meta(session_dir)
+    options = job.options.model_copy()
+
+    checkpoint = IngestCheckpoint(session_dir)
+    if not checkpoint.resume(job.source, options):
+        checkpoint.start(job.display_name, job.source, options)
+
+    # messages worker ke redirected stdout mein jaate hain (loader errors wahin se)
+    build = ingest_source(
+        FaissStore(),
+        job.session_id,
+        job.source_type,
+        job.source,
+        options,
+        checkpoint,
+        load=lambda: _load(job),
+        kind="index",
+    )
+    if not build.pages and existing and existing.build:
+        # chunks checkpoint se aaye - pages pichle build ke
+        build.pages = existing.build.pages
+
+    if existing is None:
+        meta = SessionMeta(
+            id=job.session_id,
+            name=job.display_name,
+            source=job.source,
+            source_type=job.source_type,
+            created_at=SessionMeta.now(),
+            last_used_at=SessionMeta.now(),
+            options=options,
+            build=build,
+        )
+        usage = commit_usage(session_dir, meta, "ingest")
+        result.status = CREATED
+    else:
+
+        def rebuilt(m: SessionMeta):
+            m.options = options
+            m.source = job.source
+            m.name = job.name or m.name
+            m.compacted_at = None
+            m.build = build
+
+        usage = commit_usage(session_dir, update_session_meta(session_dir, rebuilt), "index")
+        result.status = REBUILT
+
+    checkpoint.clear()
+    if options.identity == "content":
+        save_alias(job.source, job.session_id)
+
+    result.pages = build.pages
+    result.chunks = build.chunks
+    result.embedded = build.embedded
+    result.embed_tokens = usage.embed_tokens
+    result.stages = build.stages
@@ -0,0 +1,144 @@
+"""
+Is file ka kaam:
+- Naye session ki ingestion ko resumable banana
+- Har stage ke baad progress session folder mein likhna:
+    ingest/checkpoint.json → session name, source, options, kaunsa stage complete hua
+    ingest/documents.jsonl → loader se aaye parsed Documents
+    ingest/chunks.jsonl    → split + dedup ke baad final chunks (index order mein)
+                             (sessions gc compaction gzip karke chunks.jsonl.gz likhta hai)
+- Embedded batches ka checkpoint shared segment store khud hai:
+  FaissStore har batch ke baad vectors segment store mein daal deta hai,
+  isliye rerun par sirf bache hue chunks embed hote hain.
+  Save se pehle ye segments session ke pending refs hain - clear() unhe release
+  karta hai (abandoned / discarded checkpoint ke segments reclaim ho jaate hain)
+
+Rerun par same chunks same order mein milte hain → index clean run jaisa hi banta hai.
+Session successfully ban jaane ke baad checkpoint delete ho jaata hai.
+"""
+
+import gzip
+import json
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from langchain_core.documents import Document
+
+from querynest.sessions.session_meta import SessionOptions
+from querynest.storage.atomic import atomic_write_bytes, atomic_write_text
+from querynest.storage.segment_store import SegmentStore
+
+CHECKPOINT_DIR = "ingest"
+STATE_FILE = "checkpoint.json"
+DOCUMENTS_FILE = "documents.jsonl"
+CHUNKS_FILE = "chunks.jsonl"
+COMPRESSED_CHUNKS_FILE = "chunks.jsonl.gz"
+
+
+def _dump_documents(documents: List[Document]) -> str:
+    return "".join(
+        json.dumps({"page_content": d.page_content, "metadata": d.metadata}, default=str) + "\n"
+        for d in documents
+    )
+
+
+def _load_documents(path: Path) -> List[Document]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [Document(**json.loads(line)) for line in f if line.strip()]
+
+
+class IngestCheckpoint:
+    def __init__(self, session_dir: Path):
+        self.session_id = session_dir.name
+        self.dir = session_dir / CHECKPOINT_DIR
+        self.state: dict = {}
+
+    def _state_path(self) -> Path:
+        return self.dir / STATE_FILE
+
+    def resume(self, source: str, options: SessionOptions) -> bool:
+        """
+        Same source + same index options ka checkpoint mila toh True.
+        Index options badal gaye ho toh purana checkpoint discard - sirf retrieval
+        options (rescore, adaptive k...) badalne par adhoori ingestion continue hoti hai
+        """
+        path = self._state_path()
+        if not path.exists():
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.clear()
+            return False
+
+        wanted = options.index_settings()
+        # purane checkpoints mein poora options dump hai - sirf index keys compare
+        stored = state.get("options") or {}
+        if state.get("source") != source or {k: stored.get(k) for k in wanted} != wanted:
+            self.clear()
+            return False
+
+        self.state = state
+        return True
+
+    def start(self, session_name: str, source: str, options: SessionOptions):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.state = {
+            "session_name": session_name,
+            "source": source,
+            "options": options.index_settings(),
+            "stage": "started",
+        }
+        self._save_state()
+
+    def _save_state(self):
+        atomic_write_text(self._state_path(), json.dumps(self.state, indent=2))
+
+    @property
+    def session_name(self) -> Optional[str]:
+        return self.state.get("session_name")
+
+    @property
+    def stage(self) -> str:
+        return self.state.get("stage", "started")
+
+    # Stages
+
+    def save_documents(self, documents: List[Document]):
+        atomic_write_text(self.dir / DOCUMENTS_FILE, _dump_documents(documents))
+        self.state["stage"] = "loaded"
+        self._save_state()
+
+    def load_documents(self) -> Optional[List[Document]]:
+        if self.stage not in ("loaded", "chunked"):
+            return None
+        return _load_documents(self.dir / DOCUMENTS_FILE)
+
+    def save_chunks(self, chunks: List[Document], compress: bool = False):
+        """
+        compress: compacted sessions ke liye (lambe samay tak disk par rehta hai)
+        """
+        data = _dump_documents(chunks)
+        if compress:
+            atomic_write_bytes(self.dir / COMPRESSED_CHUNKS_FILE, gzip.compress(data.encode("utf-8")))
+        else:
+            atomic_write_text(self.dir / CHUNKS_FILE, data)
+        self.state["stage"] = "chunked"
+        self._save_state()
+
+    def load_chunks(self) -> Optional[List[Document]]:
+        if self.stage != "chunked":
+            return None
+        path = self.dir / CHUNKS_FILE
+        if not path.exists():
+            path = self.dir / COMPRESSED_CHUNKS_FILE
+        return _load_documents(path)
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.state = {}
+        # save ho chuka ho toh ye segments ab session refs se held hain, warna reclaim
+        SegmentStore().release_pending(self.session_id)
@@ -0,0 +1,218 @@
+"""
+Is file ka kaam:
+- Loaded Documents se embed-ready chunks banana
+- chat command, app.py aur sessions refresh sab isi ko use karte hain
+  taaki ingestion stages (split → dedup) har jagah same rahe
+- ingest_source: poori checkpointed ingestion (load → split → embed + index) -
+  chat, app.py aur index isi ko call karte hain, sirf loader / messages / progress apne
+
+Stages:
+1. split_documents  → fixed size chunks
+2. dedup_chunks     → exact + near-duplicate chunks hatao (agar session options mein on hai)
+3. split_children   → parent-child sessions: har chunk (parent) ke chhote child chunks,
+                      jo embed + search hote hain; parent prompt mein jaata hai
+"""
+
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional
+
+from langchain_core.documents import Document
+
+from querynest.ingestion.checkpoint import IngestCheckpoint
+from querynest.processor.dedup import DedupReport, dedup_chunks
+from querynest.processor.text_splitter import split_documents
+from querynest.sessions.build_stats import collect_build_stats
+from querynest.sessions.session_meta import BuildStats, SessionOptions
+from querynest.utils.timing import StageTimer
+from querynest.utils.tracing import span
+from querynest.vector_store.faiss_store import FaissStore
+
+
+def prepare_chunks(
+    documents: Iterable[Document],
+    options: SessionOptions,
+    reference: Iterable[Document] = (),
+) -> tuple[List[Document], DedupReport | None]:
+    """
+    documents:
+    - loader se aaye Documents
+
+    reference:
+    - already indexed chunks (refresh ke time) jinke against dedup karna hai
+
+    Returns:
+    - (chunks, dedup report ya None agar dedup off hai)
+    """
+    with span("split", splitter=options.splitter) as s:
+        chunks = split_documents(
+            documents,
+            chunk_size=options.chunk_size,
+            chunk_overlap=options.chunk_overlap,
+            splitter=options.splitter,
+            max_tokens=options.max_tokens,
+        )
+        s.set_attribute("chunks", len(chunks))
+
+    if not options.dedup:
+        return chunks, None
+
+    with span("dedup", mode=options.dedup_mode) as s:
+        kept, report = dedup_chunks(
+            chunks,
+            max_distance=options.dedup_max_distance,
+            mode=options.dedup_mode,
+            reference=reference,
+        )
+        s.set_attribute("removed", report.removed)
+
+    return kept, report
+
+
+def parent_key(parent: Document) -> str:
+    # chhota content key - child metadata mein yahi jaata hai (child → parent mapping)
+    return hashlib.sha256(parent.page_content.encode("utf-8")).hexdigest()[:16]
+
+
+def split_children(
+    chunks: List[Document], options: SessionOptions
+) -> tuple[List[Document], Dict[str, Document]]:
+    """
+    Parent-child off ho toh chunks waise hi (parents = {}).
+    On ho toh: (child chunks jinke metadata mein "parent" key hai, key → parent chunk)
+
+    Children deterministic hain, isliye checkpoint sirf parents rakhta hai
+    """
+    if not options.parent_child:
+        return chunks, {}
+
+    with span("split.children") as s:
+        parents: Dict[str, Document] = {}
+        tagged = []
+        for chunk in chunks:
+            key = parent_key(chunk)
+            parents[key] = chunk
+            tagged.append(
+                Document(page_content=chunk.page_content, metadata={**chunk.metadata, "parent": key})
+            )
+
+        # children parent ka metadata (aur "parent" key) copy karte hain
+        children = split_documents(
+            tagged,
+            chunk_size=options.child_chunk_size,
+            chunk_overlap=options.child_chunk_overlap,
+            splitter=options.splitter,
+        )
+        s.set_attribute("children", len(children))
+
+    return children, parents
+
+
+def load_documents(
+    source_type: str, load: Callable[[], List[Document]], timer: StageTimer
+) -> List[Document]:
+    """
+    Load stage (span + timer ke saath). chat --progressive isse main thread par chalata hai -
+    loaders terminal par print / sys.exit karte hain
+    """
+    with span("load", source_type=source_type) as load_span, timer.stage("load"):
+        documents = load()
+        load_span.set_attribute("documents", len(documents))
+    return documents
+
+
+def ingest_source(
+    store: FaissStore,
+    session_id: str,
+    source_type: str,
+    source: str,
+    options: SessionOptions,
+    checkpoint: IngestCheckpoint,
+    load: Callable[[], List[Document]],
+    kind: str = "ingest",
+    say: Callable[[str], None] = print,
+    progress=None,
+    on_batch=None,
+    on_chunks=None,
+    documents: Optional[List[Document]] = None,
+    timer: StageTimer | None = None,
+) -> BuildStats:
+    """
+    load → split / dedup → embed + index, har stage ke baad checkpoint.
+    Checkpoint mein jo stage complete hai wo dubara nahi chalta
+
+    load: source ke Documents (sirf tab call hota hai jab checkpoint mein nahi)
+    say: progress messages (chat --progressive mein live status)
+    progress / on_batch: FaissStore.build ko pass (progress bar, partial index)
+    on_chunks(chunks, parents): embed hone wale chunks, build shuru hone se pehle
+    documents / timer: caller ne load_documents se pehle hi load kar liya (checkpoint mein
+    save yahin hota hai), aur us load stage ka timer
+
+    PQ ke liye vectors kam the toh options.precision actual precision ban jaata hai.
+    Meta / usage commit aur checkpoint.clear() caller ka kaam hai.
+    Returns: build stats (meta.build) - pages 0 agar chunks checkpoint se aaye
+    """
+    timer = timer or StageTimer()
+    pages = 0
+
+    with span("ingest", source_type=source_type):
+        chunks = None if documents is not None else checkpoint.load_chunks()
+
+        if chunks is None:
+            if documents is not None:
+                checkpoint.save_documents(documents)
+            else:
+                documents = checkpoint.load_documents()
+
+                if documents is None:
+                    say("Loading documents...")
+                    documents = load_documents(source_type, load, timer)
+                    checkpoint.save_documents(documents)
+                else:
+                    say(f"Using {len(documents)} parsed documents from checkpoint")
+
+            pages = len(documents)
+            say("Splitting into chunks...")
+            with timer.stage("split"):
+                chunks, dedup_report = prepare_chunks(documents, options)
+
+            if dedup_report:
+                say(dedup_report.summary())
+            checkpoint.save_chunks(chunks)
+            say(f"Created {len(chunks)} chunks")
+        else:
+            say(f"Using {len(chunks)} chunks from checkpoint")
+
+        # parent-child: checkpoint parents rakhta hai, children yahan se (deterministic)
+        with timer.stage("split"):
+            chunks, parents = split_children(chunks, options)
+        if parents:
+            say(f"Split {len(parents)} parent chunks into {len(chunks)} child chunks")
+
+        say(f"Building vector index ({len(chunks)} chunks)...")
+        if on_chunks:
+            on_chunks(chunks, parents)
+
+        compression_report = store.build(
+            chunks,
+            session_id,
+            precision=options.precision,
+            progress=progress,
+            on_batch=on_batch,
+            parents=parents,
+            shard_size=options.shard_size,
+            timer=timer,
+        )
+
+        if compression_report:
+            say(compression_report.summary())
+            # PQ ke liye vectors kam the toh actual precision record karo
+            options.precision = compression_report.precision
+
+    return collect_build_stats(
+        store,
+        session_id,
+        kind,
+        timer.stages,
+        pages,
+        pdf_source=source if source_type == "pdf" else None,
+    )
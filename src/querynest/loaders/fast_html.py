@@ -0,0 +1,138 @@
+"""
+This file :
+- "fast" HTML extraction engine
+- HTML ko sirf EK baar parse karta hai (ek lxml tree)
+- Boilerplate hatana + text gather karna dono ek hi tree walk mein hota hai
+
+Default readability engine page ko do baar parse karta hai
+(readability summary + BeautifulSoup), aur phir saari lines split/join karta hai.
+Bade pages par ye per-page tens of ms CPU le leta hai, isliye ye alternative hai.
+"""
+
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+# Ye tags kabhi readable content nahi hote - poora subtree skip
+_SKIP_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "form",
+    "button",
+    "select",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+}
+
+# Block tags ke start/end par newline daalte hain taaki paragraphs alag rahe
+_BLOCK_TAGS = {
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "li",
+    "main", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+
+# class / id mein ye words ho toh element boilerplate maana jaata hai
+_BOILERPLATE_RE = re.compile(
+    r"(^|[\s_-])(nav|navbar|menu|footer|sidebar|breadcrumbs?|cookie|banner|"
+    r"share|social|comments?|advert|ads|promo|related|newsletter|subscribe|"
+    r"popup|modal)($|[\s_-])",
+    re.IGNORECASE,
+)
+
+_SPACES_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+
+# XHTML pages ka <?xml ... encoding="..."?> - str ke saath lxml isko reject karta hai
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def _is_boilerplate(el, skip_tags) -> bool:
+    if el.tag in skip_tags:
+        return True
+
+    if el.get("aria-hidden") == "true" or el.get("hidden") is not None:
+        return True
+
+    role = el.get("role")
+    if role in ("navigation", "banner", "contentinfo", "complementary"):
+        return True
+
+    marker = f"{el.get('class', '')} {el.get('id', '')}"
+    return bool(marker.strip()) and _BOILERPLATE_RE.search(marker) is not None
+
+
+def _content_root(tree):
+    """
+    <main> / role=main / akela <article> mile toh wahi root, warna <body>
+    """
+    for path in ("//main", "//*[@role='main']"):
+        found = tree.xpath(path)
+        if found:
+            return found[0]
+
+    # listing pages mein bahut saare <article> cards hote hain - tab body hi sahi hai
+    articles = tree.xpath("//article")
+    if len(articles) == 1:
+        return articles[0]
+
+    body = tree.find("body")
+    return body if body is not None else tree
+
+
+def extract_fast_text(html: str) -> str:
+    """
+    Raw HTML se readable text nikalta hai - single parse, single walk
+    """
+    if not html or not html.strip():
+        return ""
+
+    try:
+        # text already decoded hai, encoding declaration ki zarurat nahi
+        tree = lxml_html.fromstring(_XML_DECL_RE.sub("", html, count=1))
+    except etree.ParserError:
+        # sirf whitespace / comments wala document
+        return ""
+
+    root = _content_root(tree)
+    parts = []
+
+    # article/main ke andar <header> mein usually title hota hai, site header nahi
+    skip_tags = _SKIP_TAGS if root.tag == "body" else _SKIP_TAGS - {"header"}
+
+    # comments / PIs ke events alag se aate hain ("start" / "end" mein nahi)
+    walker = etree.iterwalk(root, events=("start", "end", "comment", "pi"))
+    for event, el in walker:
+        tag = el.tag
+
+        # comments / processing instructions - sirf tail text kaam ka hai
+        if not isinstance(tag, str):
+            if el.tail:
+                parts.append(el.tail)
+            continue
+
+        if event == "start":
+            if el is not root and _is_boilerplate(el, skip_tags):
+                walker.skip_subtree()
+                continue
+
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if el.text:
+                parts.append(el.text)
+
+        else:
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if el.tail and el is not root:
+                parts.append(el.tail)
+
+    text = "".join(parts)
+
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
@@ -0,0 +1,179 @@
+"""
+This file :
+- Web pages ke raw HTTP responses disk par cache karna (ETag + Last-Modified ke saath)
+- Refresh ke time conditional request bhejna (If-None-Match / If-Modified-Since)
+- Batana ki page sach mein change hua hai ya nahi
+
+Cache har session ka alag hai (same URL do sessions mein ho sakta hai):
+ek session ka refresh doosre session ke validators update nahi karta,
+warna doosre ko 304 milta aur uska index stale reh jaata.
+
+fetch_page khud kuch save nahi karta - naye validators FetchResult.response
+mein caller ko milte hain, aur caller unhe index save hone ke BAAD
+save_cached_response se persist karta hai. Re-embed ya save fail ho toh
+purane validators rehte hain aur agla refresh page dobara try karta hai.
+
+Page unchanged maana jaata hai agar:
+- Server 304 Not Modified bheje, ya
+- 200 aaye lekin body ka content hash pehle jaisa hi ho
+
+~/.querynest/http_cache/<session_id>/<sha256(url)>/
+    ├── response.json   (headers + content hash)
+    └── body.html       (raw response body)
+
+Purane versions ka http_cache/<sha256(url)>/ layout sirf rechunk ke body
+fallback ke liye padha jaata hai (validators ke liye nahi).
+"""
+
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import requests
+from pydantic import BaseModel
+
+from querynest.storage.atomic import atomic_write_json, atomic_write_text
+from querynest.utils.paths import HTTP_CACHE_DIR
+
+USER_AGENT = "QueryNest/1.0"
+
+
+class CachedResponse(BaseModel):
+    url: str
+    status_code: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str
+    fetched_at: str
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    html: str
+    # False -> 304 mila ya body ka hash same tha (re-extract/re-embed ki zarurat nahi)
+    changed: bool
+    not_modified: bool = False
+    # 200 par naye validators - caller save_cached_response se persist karta hai
+    response: Optional[CachedResponse] = None
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _cache_dir(session_id: str, url: str) -> Path:
+    return HTTP_CACHE_DIR / session_id / _url_key(url)
+
+
+def _read_entry(cache_dir: Path) -> tuple[CachedResponse, str] | None:
+    meta_path = cache_dir / "response.json"
+    body_path = cache_dir / "body.html"
+
+    if not meta_path.exists() or not body_path.exists():
+        return None
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        cached = CachedResponse(**json.load(f))
+
+    return cached, body_path.read_text(encoding="utf-8")
+
+
+def load_cached_response(
+    session_id: str, url: str, legacy: bool = False
+) -> tuple[CachedResponse, str] | None:
+    """
+    Session ke cache se (headers, body) return karta hai, agar available ho.
+    legacy=True -> session entry na ho toh purana URL-only entry (sirf body ke kaam ka)
+    """
+    entry = _read_entry(_cache_dir(session_id, url))
+    if entry is None and legacy:
+        entry = _read_entry(HTTP_CACHE_DIR / _url_key(url))
+    return entry
+
+
+def save_cached_response(session_id: str, result: FetchResult):
+    """
+    fetch_page ke naye validators + body session ke cache mein likhta hai.
+    304 / error results (response=None) par kuch nahi hota.
+    """
+    if result.response is None:
+        return
+
+    cache_dir = _cache_dir(session_id, result.url)
+
+    # body pehle, headers baad mein - response.json kabhi purane body ko point nahi karega
+    atomic_write_text(cache_dir / "body.html", result.html)
+    atomic_write_json(cache_dir / "response.json", result.response.model_dump(), indent=2)
+
+
+def fetch_page(session_id: str, url: str, timeout: int = 10) -> FetchResult:
+    """
+    URL fetch karta hai, session ke cached validators ke saath conditional request bhej ke.
+
+    - 304 -> cached body return hoti hai, changed=False
+    - 200 -> naye validators result.response mein (save caller karega),
+             changed tabhi True jab content hash badla ho
+    - baaki status codes -> as-is return (caller decide karega)
+
+    Network errors (requests.exceptions.*) caller tak propagate hote hain.
+    """
+    cached_entry = load_cached_response(session_id, url)
+
+    headers = {"User-Agent": USER_AGENT}
+    if cached_entry:
+        cached, _ = cached_entry
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = requests.get(url, timeout=timeout, headers=headers)
+
+    if response.status_code == 304 and cached_entry:
+        cached, body = cached_entry
+        return FetchResult(
+            url=url,
+            status_code=304,
+            html=body,
+            changed=False,
+            not_modified=True,
+        )
+
+    if response.status_code != 200:
+        return FetchResult(
+            url=url,
+            status_code=response.status_code,
+            html="",
+            changed=False,
+        )
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    changed = cached_entry is None or cached_entry[0].content_hash != content_hash
+
+    return FetchResult(
+        url=url,
+        status_code=response.status_code,
+        html=response.text,
+        changed=changed,
+        response=CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=content_hash,
+            fetched_at=datetime.now(timezone.utc).isoformat(),
+        ),
+    )
+
+
+def remove_session_cache(session_id: str):
+    """
+    Session delete hone par uska HTTP cache bhi hata do
+    """
+    shutil.rmtree(HTTP_CACHE_DIR / session_id, ignore_errors=True)
@@ -9,17 +9,64 @@ text splitting baad mein karange.
 
 NOTE: Lazy loading se issues aa rahe the (later pages ka QnA kaam nahi kar raha tha)
 Isliye ab hum full loading kar rahe hain - saare pages ek saath memory mein load hote hain
+
+Parsed pages file content hash se cache hote hain (storage/page_cache.py) -
+same PDF dobara kabhi parse nahi hoti (rechunk, naya session, moved file)
 """
 
 import sys
 from pathlib import Path
 from typing import List
 
-from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader
+from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
+from tqdm import tqdm
+
+from querynest.storage.page_cache import load_pages, save_pages
+from querynest.utils.hashing import hash_file, list_pdf_files
+
+
+def load_pdf_file(pdf: Path, use_cache: bool = True) -> tuple[List[Document], bool]:
+    """
+    Ek PDF ke pages - page cache hit ho toh bina parse kiye.
+    Returns: (pages, cache se aaye ya nahi)
+    """
+    if use_cache:
+        file_hash = hash_file(pdf)
+        pages = load_pages(file_hash, str(pdf))
+        if pages is not None:
+            return pages, True
+
+    pages = PyPDFLoader(str(pdf)).load()
+    if use_cache:
+        save_pages(file_hash, pages)
+    return pages, False
 
 
-def load_pdfs(path: str) -> List[Document]:
+def load_cached_pdfs(path: str, parse_missing: bool = False) -> tuple[List[Document], List[Path]]:
+    """
+    PDF file / directory ke pages sirf page cache se (rechunk) - koi PDF chupchap parse nahi hoti.
+    Returns: (pages, cache miss wali PDFs). parse_missing=True → miss wali parse karke cache bhi
+    (missing list phir bhi wahi, report ke liye); warna unke pages nahi aate
+    """
+    input_path = Path(path)
+    pdf_files = list_pdf_files(input_path) if input_path.is_dir() else [input_path]
+
+    documents, missing = [], []
+    for pdf in pdf_files:
+        file_hash = hash_file(pdf)
+        pages = load_pages(file_hash, str(pdf))
+        if pages is None:
+            missing.append(pdf)
+            if not parse_missing:
+                continue
+            pages = PyPDFLoader(str(pdf)).load()
+            save_pages(file_hash, pages)
+        documents.extend(pages)
+    return documents, missing
+
+
+def load_pdfs(path: str, show_progress: bool = True, use_cache: bool = True) -> List[Document]:
     """
     PDF file(s) ko load karke LangChain Documents return karta hai.
 
@@ -33,8 +80,12 @@ def load_pdfs(path: str) -> List[Document]:
     NOTE:
     - Saare pages ek saath memory mein load hote hain
     - Ye ensure karta hai ki QnA later pages ke liye bhi kaam kare
+
+    show_progress=False → sirf errors print hote hain (background ingestion ke liye)
+    use_cache=False → page cache skip (hamesha parse)
     """
 
+    info = print if show_progress else (lambda *args: None)
     input_path = Path(path)
 
     # Validate path exists
@@ -58,9 +109,8 @@ def load_pdfs(path: str) -> List[Document]:
             sys.exit(1)
 
         try:
-            print(f"\nLoading PDF: {input_path.name}")
-            loader = PyPDFLoader(str(input_path))
-            documents = loader.load()  # Full load, not lazy
+            info(f"\nLoading PDF: {input_path.name}")
+            documents, cached = load_pdf_file(input_path, use_cache)  # Full load, not lazy
 
             if not documents:
                 print("\nError: PDF file is empty or unreadable")
@@ -71,7 +121,7 @@ def load_pdfs(path: str) -> List[Document]:
                 print("Exiting...\n")
                 sys.exit(1)
 
-            print(f"Loaded {len(documents)} page(s) from PDF")
+            info(f"Loaded {len(documents)} page(s) from PDF" + (" (page cache)" if cached else ""))
             return documents
 
         except Exception as e:
@@ -88,7 +138,7 @@ def load_pdfs(path: str) -> List[Document]:
     # Case 2: Directory of PDFs
     if input_path.is_dir():
         try:
-            print(f"\nLoading PDFs from directory: {input_path.name}")
+            info(f"\nLoading PDFs from directory: {input_path.name}")
 
             # Check if directory has any PDF files
             pdf_files = list(input_path.glob("**/*.pdf"))
@@ -102,16 +152,14 @@ def load_pdfs(path: str) -> List[Document]:
                 print("Exiting...\n")
                 sys.exit(1)
 
-            print(f"Found {len(pdf_files)} PDF file(s)")
+            info(f"Found {len(pdf_files)} PDF file(s)")
 
-            loader = DirectoryLoader(
-                path=str(input_path),
-                glob="**/*.pdf",
-                loader_cls=PyPDFLoader,
-                show_progress=True,  # Shows progress bar in terminal
-            )
-
-            documents = loader.load()  # Full load, not lazy
+            documents, from_cache = [], 0
+            # Shows progress bar in terminal
+            for pdf in tqdm(sorted(pdf_files), disable=not show_progress):
+                pages, cached = load_pdf_file(pdf, use_cache)  # Full load, not lazy
+                documents.extend(pages)
+                from_cache += cached
 
             if not documents:
                 print("\nError: No content could be extracted from PDFs")
@@ -122,7 +170,10 @@ def load_pdfs(path: str) -> List[Document]:
                 print("Exiting...\n")
                 sys.exit(1)
 
-            print(f"✅ Loaded {len(documents)} page(s) from {len(pdf_files)} PDF(s)")
+            info(
+                f"✅ Loaded {len(documents)} page(s) from {len(pdf_files)} PDF(s)"
+                f" ({from_cache} from page cache)"
+            )
             return documents
 
         except Exception as e:
@@ -17,6 +17,9 @@ from bs4 import BeautifulSoup
 from langchain_core.documents import Document
 from readability import Document as ReadabilityDocument
 
+from querynest.loaders.fast_html import extract_fast_text
+from querynest.loaders.http_cache import fetch_page, save_cached_response
+
 
 def _extract_clean_text(html: str) -> str:
     """
@@ -43,23 +46,58 @@ def _extract_clean_text(html: str) -> str:
     return cleaned_text
 
 
+# HTML extraction engines (session options mein naam se select hote hain)
+EXTRACTORS = {
+    "readability": _extract_clean_text,
+    "fast": extract_fast_text,
+}
+
+
+def extract_text(html: str, extractor: str = "readability") -> str:
+    """
+    Selected engine se HTML ka readable text nikalta hai
+    """
+    if extractor not in EXTRACTORS:
+        raise ValueError(
+            f"Unknown extractor: {extractor} (choose from {', '.join(EXTRACTORS)})"
+        )
+
+    return EXTRACTORS[extractor](html)
+
+
+def build_web_document(url: str, html: str, extractor: str = "readability") -> Document:
+    """
+    Raw HTML ko clean karke web Document banata hai
+    (load aur refresh dono isi ko use karte hain)
+    """
+    return Document(
+        page_content=extract_text(html, extractor),
+        metadata={
+            "source": url,
+            "type": "web",
+        },
+    )
+
+
 # loading a single web page
-def load_web_page(url: str) -> Document:
+def load_web_page(
+    url: str, session_id: str, extractor: str = "readability", show_progress: bool = True
+) -> Document:
     """
     Fetches and extracts clean text from a web page.
     Exits with clear error message if fetching fails.
+    show_progress=False → sirf errors print hote hain (load_pdfs jaisa)
     """
 
+    info = print if show_progress else (lambda *args: None)
+
     try:
-        print(f"Fetching: {url}")
+        info(f"Fetching: {url}")
 
-        response = requests.get(
-            url,
-            timeout=10,
-            headers={"User-Agent": "QueryNest/1.0"},
-        )
+        # Conditional fetch - raw response ETag/Last-Modified ke saath session ke cache mein
+        response = fetch_page(session_id, url, timeout=10)
 
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             print("\nError: Failed to fetch website")
             print(f"URL: {url}")
             print(f"Status Code: {response.status_code}")
@@ -71,9 +109,9 @@ def load_web_page(url: str) -> Document:
             print("Exiting...\n")
             sys.exit(1)
 
-        text = _extract_clean_text(response.text)
+        document = build_web_document(url, response.html, extractor)
 
-        if not text:
+        if not document.page_content:
             print("\n❌ Error: No readable content found")
             print(f"URL: {url}")
             print("\nThe page might be:")
@@ -84,15 +122,13 @@ def load_web_page(url: str) -> Document:
             print("Exiting...\n")
             sys.exit(1)
 
-        print(f"Successfully fetched: {url}")
+        # Ingest ke liye turant save safe hai: index abhi bana hi nahi, aur build fail
+        # hone par agla fetch 304 se yahi body deta hai (refresh ki tarah stale nahi hota)
+        save_cached_response(session_id, response)
 
-        return Document(
-            page_content=text,
-            metadata={
-                "source": url,
-                "type": "web",
-            },
-        )
+        info(f"Successfully fetched: {url}")
+
+        return document
 
     except requests.exceptions.Timeout:
         print("\nError: Request timed out")
@@ -139,7 +175,9 @@ def load_web_page(url: str) -> Document:
 
 
 # if user gives multiple web pages (generator style using yield func) returns iterable of document objects
-def load_web_pages(urls: Union[str, list[str]]) -> Iterable[Document]:
+def load_web_pages(
+    urls: Union[str, list[str]], session_id: str, extractor: str = "readability"
+) -> Iterable[Document]:
     """
     Loads multiple web pages.
     Exits if any page fails to load.
@@ -151,6 +189,6 @@ def load_web_pages(urls: Union[str, list[str]]) -> Iterable[Document]:
     print(f"\nFetching {len(urls)} web page(s)...\n")
 
     for url in urls:
-        yield load_web_page(url)
+        yield load_web_page(url, session_id, extractor)
 
     print(f"\nSuccessfully fetched all {len(urls)} web page(s)\n")
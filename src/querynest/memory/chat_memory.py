@@ -3,6 +3,7 @@ Is file ka kaam:
 - Session-based chat history store karna
 - JSON file me persist karna
 - Sliding window maintain karna for context awareness
+- Har message history search index (storage/history_index.py) mein bhi jaata hai
 
 Ye memory RAG ke context ke liye use krunga
 """
@@ -10,6 +11,8 @@ Ye memory RAG ke context ke liye use krunga
 import json
 from typing import Dict, List
 
+from querynest.storage.atomic import atomic_write_json, session_lock
+from querynest.storage.history_index import HistoryIndex
 from querynest.utils.paths import get_chat_path
 
 
@@ -26,6 +29,11 @@ class ChatMemory:
         # Load existing history (agar hai)
         self.history: List[Dict[str, str]] = self._load()
 
+        # chat.json sirf window rakhta hai - poori history search index mein
+        # (index banne se pehle ki history ek hi baar seed hoti hai)
+        self.search_index = HistoryIndex()
+        self.search_index.seed_session(session_id, self.chat_path)
+
     def _load(self) -> List[Dict[str, str]]:
         """
         chat.json se purani history load karta hai
@@ -37,31 +45,32 @@ class ChatMemory:
             return json.load(f)
 
     def add_user_message(self, message: str):
-        self.history.append(
-            {
-                "role": "user",
-                "content": message,
-            }
-        )
-        self._save()
+        self._add("user", message)
 
     def add_assistant_message(self, message: str):
-        self.history.append(
+        self._add("assistant", message)
+
+    def _add(self, role: str, content: str):
+        self._save(
             {
-                "role": "assistant",
-                "content": message,
+                "role": role,
+                "content": content,
             }
         )
-        self._save()
+        self.search_index.add(self.session_id, role, content)
 
-    def _save(self):
+    def _save(self, message: Dict[str, str]):
         """
-        Sliding window apply karke save karta hai
+        Message append + sliding window apply karke save karta hai.
+        Lock ke andar disk se fresh history padhte hain, taaki same session
+        ke dusre terminal ke messages overwrite na ho
         """
-        trimmed = self.history[-self.window_size * 2 :]
+        with session_lock(self.chat_path.parent):
+            history = self._load()
+            history.append(message)
+            trimmed = history[-self.window_size * 2 :]
 
-        with open(self.chat_path, "w") as f:
-            json.dump(trimmed, f, indent=2)
+            atomic_write_json(self.chat_path, trimmed, indent=2)
 
         self.history = trimmed
 
@@ -70,9 +79,18 @@ class ChatMemory:
         Chat history ko ek string me convert karta hai
         (prompt me inject karne ke liye)
         """
-        lines = []
-        for msg in self.history:
-            role = msg["role"].capitalize()
-            lines.append(f"{role}: {msg['content']}")
+        return format_messages(self.history)
+
+    def flush(self, timeout: float | None = None):
+        """
+        Background kaam (summary memory ka fold) khatam hone ka wait - yahan kuch nahi
+        """
+
+
+def format_messages(messages: List[Dict[str, str]]) -> str:
+    lines = []
+    for msg in messages:
+        role = msg["role"].capitalize()
+        lines.append(f"{role}: {msg['content']}")
 
-        return "\n".join(lines)
+    return "\n".join(lines)
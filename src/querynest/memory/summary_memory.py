@@ -0,0 +1,206 @@
+"""
+This file :
+- Rolling summary chat memory (chat --memory summary)
+- Last N turns verbatim; usse purane messages ek incrementally update hone wali
+  summary mein fold hote hain (purani summary + nayi lines → nayi summary)
+- Prompt mein summary (max summary_tokens) + verbatim messages (max history_tokens),
+  isliye lambi conversation mein bhi har turn ka prompt size flat rehta hai
+- Fold ka LLM call answer print hone ke BAAD background thread mein chalta hai -
+  user ko koi extra latency nahi
+
+State session folder ki summary.json mein:
+    summary   ab tak ki summary
+    pending   window se bahar gaye messages jo abhi fold nahi hue - fold chal raha ho
+              ya fail ho gaya ho toh ye context mein verbatim jaate hain (kuch khota nahi)
+
+chat.json pehle jaisa recent window hi hai - history show / window mode waise hi chalte hain.
+"""
+
+import json
+import threading
+from typing import Dict
+
+from langchain_core.output_parsers import StrOutputParser
+
+from querynest.memory.chat_memory import ChatMemory, format_messages
+from querynest.prompts.prompt_template import get_summary_prompt_template
+from querynest.sessions.usage import meter
+from querynest.storage.atomic import atomic_write_json, session_lock
+from querynest.utils.tokens import count_tokens, token_offsets
+
+MEMORY_MODES = ("window", "summary")
+
+SUMMARY_FILE = "summary.json"
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    offsets = token_offsets(text)
+    if len(offsets) <= max_tokens:
+        return text
+    return text[: offsets[max_tokens]].rstrip() + " …"
+
+
+class SummaryMemory(ChatMemory):
+    def __init__(
+        self,
+        session_id: str,
+        llm,
+        recent_turns: int = 4,
+        summary_tokens: int = 400,
+        history_tokens: int = 1500,
+    ):
+        """
+        llm: summary fold ke liye (chat wala hi)
+        recent_turns: kitne recent turns (user + assistant) verbatim rehte hain
+        summary_tokens: summary ki max length
+        history_tokens: verbatim messages ka total budget - isse upar wale purane messages
+                        turns poore hone se pehle hi fold ho jaate hain
+        """
+        super().__init__(session_id, window_size=recent_turns)
+        self.llm = llm
+        self.summary_tokens = summary_tokens
+        self.history_tokens = history_tokens
+        self.summary_path = self.chat_path.parent / SUMMARY_FILE
+
+        self._fold_thread: threading.Thread | None = None
+        # last fold ki failure (pending rehte hain, agle turn ke baad retry)
+        self.fold_error: Exception | None = None
+
+    def _load_state(self) -> dict:
+        if not self.summary_path.exists():
+            return {"summary": "", "pending": []}
+
+        with open(self.summary_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self, message: Dict[str, str]):
+        """
+        ChatMemory._save jaisa, lekin window se bahar gaye messages drop nahi hote -
+        summary.json ke pending mein jaate hain
+        """
+        with session_lock(self.chat_path.parent):
+            history = self._load()
+            history.append(message)
+
+            tokens = [count_tokens(msg["content"]) for msg in history]
+            evicted = []
+            # latest message hamesha verbatim rehta hai (akela budget se bada ho tab bhi)
+            while len(history) > 1 and (
+                len(history) > self.window_size * 2 or sum(tokens) > self.history_tokens
+            ):
+                evicted.append(history.pop(0))
+                tokens.pop(0)
+
+            atomic_write_json(self.chat_path, history, indent=2)
+
+            if evicted:
+                state = self._load_state()
+                state["pending"].extend(evicted)
+                atomic_write_json(self.summary_path, state, indent=2)
+
+        self.history = history
+
+    def add_assistant_message(self, message: str):
+        super().add_assistant_message(message)
+        # answer print ho chuka hai - fold ab background mein
+        self._start_fold()
+
+    def _start_fold(self):
+        if self._fold_thread is not None and self._fold_thread.is_alive():
+            # chal raha fold khatam hone par bache hue pending bhi utha leta hai
+            return
+        if not self._load_state()["pending"]:
+            return
+
+        self._fold_thread = threading.Thread(target=self._fold, name="summary-fold", daemon=True)
+        self._fold_thread.start()
+
+    def _fold(self):
+        self.fold_error = None
+        try:
+            while self._fold_batch():
+                pass
+        except Exception as e:
+            # pending disk par hain - tab tak context mein verbatim, agle turn ke baad retry
+            self.fold_error = e
+
+    def _fold_batch(self) -> bool:
+        """
+        Pending ke sabse purane messages (history_tokens tak) summary mein fold.
+        Returns: kuch fold hua aur abhi aur pending bache hain
+        """
+        state = self._load_state()
+        if not state["pending"]:
+            return False
+
+        batch, used = [], 0
+        for msg in state["pending"]:
+            tokens = count_tokens(msg["content"])
+            if batch and used + tokens > self.history_tokens:
+                break
+            batch.append(msg)
+            used += tokens
+
+        prompt = get_summary_prompt_template().format(
+            summary=state["summary"] or "(empty)",
+            lines=format_messages(batch),
+            max_words=max(1, self.summary_tokens * 3 // 4),
+        )
+        message = self.llm.invoke(prompt)
+        text = StrOutputParser().invoke(message).strip()
+
+        usage = getattr(message, "usage_metadata", None) or {}
+        meter.record_llm(
+            usage.get("input_tokens") or count_tokens(prompt),
+            usage.get("output_tokens") or count_tokens(text),
+        )
+
+        with session_lock(self.chat_path.parent):
+            fresh = self._load_state()
+            # dusre terminal ne beech mein yahi messages fold kar diye - ye result purana hai
+            if fresh["summary"] != state["summary"] or fresh["pending"][: len(batch)] != batch:
+                return False
+
+            fresh["summary"] = _truncate(text, self.summary_tokens)
+            fresh["pending"] = fresh["pending"][len(batch) :]
+            atomic_write_json(self.summary_path, fresh, indent=2)
+
+        return bool(fresh["pending"])
+
+    def get_context(self) -> str:
+        """
+        Summary + verbatim messages. Jo pending abhi fold nahi hue wo bhi (naye pehle)
+        jitne history_tokens budget mein aa jaayein
+        """
+        state = self._load_state()
+
+        messages = list(self.history)
+        used = sum(count_tokens(msg["content"]) for msg in messages)
+        for msg in reversed(state["pending"]):
+            tokens = count_tokens(msg["content"])
+            if used + tokens > self.history_tokens:
+                break
+            messages.insert(0, msg)
+            used += tokens
+
+        parts = []
+        if state["summary"]:
+            parts.append(f"Summary of the earlier conversation:\n{state['summary']}")
+        if messages:
+            parts.append(
+                format_messages(
+                    [
+                        {**msg, "content": _truncate(msg["content"], self.history_tokens)}
+                        for msg in messages
+                    ]
+                )
+            )
+
+        return "\n\n".join(parts)
+
+    def flush(self, timeout: float | None = None):
+        """
+        Chal rahe fold ka wait (exit par, taaki summary disk par pahunch jaaye)
+        """
+        if self._fold_thread is not None:
+            self._fold_thread.join(timeout)
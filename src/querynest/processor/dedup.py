@@ -0,0 +1,199 @@
+"""
+Is file ka kaam:
+- Chunks ke near-duplicates embedding se PEHLE hata dena
+- PDFs / crawled sites mein headers, footers, legal notices, nav text baar baar aate hain
+- Ye sab embed hoke retrieval mein context slots waste karte hain
+
+Approach:
+- Har chunk ka 64-bit SimHash (word 3-gram shingles par)
+- LSH banding: 64 bits ko (max_distance + 1) bands mein todte hain.
+  Pigeonhole se, agar do fingerprints mein <= max_distance bits alag hain
+  toh kam se kam EK band exactly match karega -> wahi candidates hain
+- Candidates ko Hamming distance se verify karte hain
+- Exact duplicates (normalized text same) pehle hi pakad liye jaate hain
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+import numpy as np
+from langchain_core.documents import Document
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class DedupReport:
+    total: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    # removed chunk -> kis source se tha (report ke liye)
+    removed_sources: dict = field(default_factory=dict)
+
+    @property
+    def removed(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def kept(self) -> int:
+        return self.total - self.removed
+
+    def summary(self) -> str:
+        pct = (self.removed / self.total * 100) if self.total else 0.0
+        return (
+            f"Dedup: {self.removed}/{self.total} chunks removed ({pct:.1f}%) - "
+            f"{self.exact_duplicates} exact, {self.near_duplicates} near-duplicate"
+        )
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def simhash(words: List[str], shingle_size: int = 3) -> int:
+    """
+    Words list ka 64-bit SimHash.
+    Shingles stable digest (blake2b) se hash hote hain - har run / process mein same
+    chunks drop hone chahiye (resume, rechunk, index rebuild isi par depend karte hain)
+    """
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[i : i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        ]
+
+    hashes = np.fromiter(
+        (_shingle_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+
+    # (n, 64) bit matrix -> har bit position par +1/-1 votes
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+
+    fingerprint = np.packbits(votes > 0).view(np.uint64)[0]
+    return int(fingerprint)
+
+
+def _bands(fingerprint: int, num_bands: int) -> List[int]:
+    width = 64 // num_bands
+    bands = []
+    for b in range(num_bands):
+        # last band bache hue saare bits le leta hai
+        bits = width if b < num_bands - 1 else 64 - width * (num_bands - 1)
+        bands.append((fingerprint >> (b * width)) & ((1 << bits) - 1))
+    return bands
+
+
+def dedup_chunks(
+    chunks: List[Document],
+    max_distance: int = 3,
+    mode: str = "drop",
+    min_words: int = 8,
+    reference: Iterable[Document] = (),
+) -> tuple[List[Document], DedupReport]:
+    """
+    chunks:
+    - split_documents ke output wale chunks (order preserve hota hai, pehla occurrence rehta hai)
+
+    max_distance:
+    - kitne SimHash bits tak alag chunks near-duplicate maane jaaye (0 = sirf exact)
+
+    mode:
+    - "drop"     -> duplicates hata do
+    - "collapse" -> duplicates hata do, lekin kept chunk ke metadata mein
+                    duplicate_count + duplicate_sources record karo
+
+    min_words:
+    - isse chhote chunks ke liye SimHash unstable hota hai, unka sirf exact dedup hoga
+
+    reference:
+    - already indexed chunks (eg. refresh ke time) - ye kabhi remove nahi hote,
+      sirf naye chunks inke against check hote hain
+    """
+    if mode not in ("drop", "collapse"):
+        raise ValueError(f"Unknown dedup mode: {mode} (choose from drop, collapse)")
+
+    if max_distance < 0 or max_distance > 63:
+        raise ValueError("max_distance must be between 0 and 63")
+
+    num_bands = max_distance + 1
+    tables: List[dict] = [{} for _ in range(num_bands)]
+    exact_seen: dict = {}
+    fingerprints: List[int] = []
+
+    # kept documents (reference + naye) ek hi list mein, index se refer karte hain
+    owners: List[Document | None] = []
+
+    report = DedupReport(total=len(chunks))
+    kept: List[Document] = []
+
+    def _register(doc: Document | None, words: List[str], exact_key: str):
+        idx = len(owners)
+        owners.append(doc)
+        exact_seen.setdefault(exact_key, idx)
+
+        if len(words) >= min_words and max_distance > 0:
+            fp = simhash(words)
+            fingerprints.append(fp)
+            for table, band in zip(tables, _bands(fp, num_bands)):
+                table.setdefault(band, []).append(idx)
+        else:
+            fingerprints.append(-1)
+
+    def _find_duplicate(words: List[str], exact_key: str) -> tuple[int | None, str]:
+        if exact_key in exact_seen:
+            return exact_seen[exact_key], "exact"
+
+        if len(words) < min_words or max_distance == 0:
+            return None, ""
+
+        fp = simhash(words)
+        for table, band in zip(tables, _bands(fp, num_bands)):
+            for idx in table.get(band, ()):
+                if (fingerprints[idx] ^ fp).bit_count() <= max_distance:
+                    return idx, "near"
+
+        return None, ""
+
+    for doc in reference:
+        words = _words(doc.page_content)
+        _register(None, words, hashlib.sha1(" ".join(words).encode()).hexdigest())
+
+    for chunk in chunks:
+        words = _words(chunk.page_content)
+        exact_key = hashlib.sha1(" ".join(words).encode()).hexdigest()
+
+        dup_idx, kind = _find_duplicate(words, exact_key)
+
+        if dup_idx is None:
+            _register(chunk, words, exact_key)
+            kept.append(chunk)
+            continue
+
+        if kind == "exact":
+            report.exact_duplicates += 1
+        else:
+            report.near_duplicates += 1
+
+        source = chunk.metadata.get("source", "unknown")
+        report.removed_sources[source] = report.removed_sources.get(source, 0) + 1
+
+        owner = owners[dup_idx]
+        if mode == "collapse" and owner is not None:
+            owner.metadata["duplicate_count"] = owner.metadata.get("duplicate_count", 0) + 1
+            location = source
+            if "page" in chunk.metadata:
+                location = f"{source}#page={chunk.metadata['page']}"
+            owner.metadata.setdefault("duplicate_sources", []).append(location)
+
+    return kept, report
@@ -7,13 +7,26 @@ Is file ka kaam:
 IMPORTANT:
 - Loader sirf Document deta hai
 - Splitter sirf Document → Document karta hai
+
+Do splitters hain:
+- "recursive" → LangChain RecursiveCharacterTextSplitter (default, purana behaviour)
+- "fast"      → native linear-scan splitter; har chunk ka (doc, page, start, end)
+                offset record banta hai, overlap strings copy nahi hoti
 """
 
-from typing import Iterable, List
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
 
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from querynest.utils.tokens import token_offsets
+
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+SPLITTERS = ("recursive", "fast")
+
 
 def get_text_splitter(
     chunk_size: int = 1500,
@@ -33,29 +46,197 @@ def get_text_splitter(
     return RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ". ", " ", ""],
+        separators=SEPARATORS,
     )
 
 
+@dataclass(slots=True)
+class ChunkRecord:
+    """
+    Ek chunk ka location - text copy nahi, sirf offsets.
+    doc_id: input documents list mein index (source id)
+    """
+
+    doc_id: int
+    page: Optional[int]
+    start: int
+    end: int
+
+
+def _best_break(text: str, start: int, limit: int, separators: Sequence[str]) -> int:
+    """
+    [start, limit) window mein sabse high-priority separator ke BAAD wali position.
+    Window ke second half mein hi break dhundte hain, taaki chunks bahut chhote na bane.
+    Koi separator na mile toh limit par hard cut.
+    """
+    floor = start + (limit - start) // 2
+
+    for sep in separators:
+        if not sep:
+            continue
+        pos = text.rfind(sep, floor, limit)
+        if pos != -1:
+            return pos + len(sep)
+
+    return limit
+
+
+def split_text_offsets(
+    text: str,
+    chunk_size: int = 1500,
+    chunk_overlap: int = 300,
+    separators: Sequence[str] = SEPARATORS,
+    max_tokens: Optional[int] = None,
+) -> List[tuple[int, int]]:
+    """
+    Text ko (start, end) spans mein todta hai - ek hi left-to-right scan.
+
+    - har window max chunk_size characters (aur max_tokens tokens, agar diya ho)
+    - break last high-priority separator par hota hai (str.rfind, C speed)
+    - agla chunk overlap window ke pehle paragraph / sentence / word boundary se shuru hota hai
+    - spans leading/trailing whitespace ke bina hote hain
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+    n = len(text)
+    offsets = token_offsets(text) if max_tokens else None
+
+    spans: List[tuple[int, int]] = []
+    start = 0
+
+    while start < n:
+        # leading whitespace skip
+        while start < n and text[start].isspace():
+            start += 1
+        if start >= n:
+            break
+
+        limit = min(start + chunk_size, n)
+
+        if offsets is not None:
+            first = bisect_left(offsets, start)
+            if first + max_tokens < len(offsets):
+                limit = min(limit, offsets[first + max_tokens])
+
+        end = n if limit >= n else _best_break(text, start, limit, separators)
+
+        # trailing whitespace trim (sirf span ke liye, end se hi aage badhte hain)
+        stop = end
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        if stop > start:
+            spans.append((start, stop))
+
+        if end >= n:
+            break
+
+        next_start = end
+        if chunk_overlap:
+            # overlap ko paragraph / sentence / word boundary se shuru karo
+            # (pehla separator jo overlap window mein mile)
+            next_start = end - chunk_overlap
+            for sep in separators:
+                if not sep:
+                    continue
+                pos = text.find(sep, next_start, end)
+                if pos != -1:
+                    next_start = pos + len(sep)
+                    break
+
+        # progress guarantee
+        start = max(next_start, start + 1)
+
+    return spans
+
+
+def split_records(
+    documents: Sequence[Document],
+    chunk_size: int = 1500,
+    chunk_overlap: int = 300,
+    max_tokens: Optional[int] = None,
+) -> List[ChunkRecord]:
+    """
+    Har document ke liye offset records (text materialize nahi hota)
+    """
+    records: List[ChunkRecord] = []
+
+    for doc_id, doc in enumerate(documents):
+        page = doc.metadata.get("page")
+        for start, end in split_text_offsets(
+            doc.page_content,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            max_tokens=max_tokens,
+        ):
+            records.append(ChunkRecord(doc_id, page, start, end))
+
+    return records
+
+
+def records_to_documents(
+    documents: Sequence[Document], records: Iterable[ChunkRecord]
+) -> List[Document]:
+    """
+    Records ko embed-ready Documents mein badalta hai.
+    Metadata mein start_index / end_index rehte hain (source text mein offsets)
+    """
+    chunks = []
+    for record in records:
+        doc = documents[record.doc_id]
+        chunks.append(
+            Document(
+                page_content=doc.page_content[record.start : record.end],
+                metadata={
+                    **doc.metadata,
+                    "start_index": record.start,
+                    "end_index": record.end,
+                },
+            )
+        )
+    return chunks
+
+
 def split_documents(
     documents: Iterable[Document],
     chunk_size: int = 1500,
     chunk_overlap: int = 300,
+    splitter: str = "recursive",
+    max_tokens: Optional[int] = None,
 ) -> List[Document]:
     """
     documents:
     - Iterable[Document] (lazy loader se aaya ho sakta hai)
 
+    splitter:
+    - "recursive" (LangChain) ya "fast" (native, offsets ke saath)
+
+    max_tokens:
+    - sirf "fast" splitter ke liye - chunk_size ke saath token limit bhi
+
     Returns:
     - List[Document] (small chunks)
     """
 
-    splitter = get_text_splitter(
+    if splitter not in SPLITTERS:
+        raise ValueError(f"Unknown splitter: {splitter} (choose from {', '.join(SPLITTERS)})")
+
+    if splitter == "fast":
+        documents = list(documents)
+        records = split_records(
+            documents,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            max_tokens=max_tokens,
+        )
+        return records_to_documents(documents, records)
+
+    text_splitter = get_text_splitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
     )
 
     # LangChain internally generator ko bhi handle kar leta hai
-    chunks = splitter.split_documents(documents)
+    chunks = text_splitter.split_documents(documents)
 
     return chunks
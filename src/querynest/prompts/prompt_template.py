@@ -28,3 +28,32 @@ Answer:
     )
 
     return chat_prompt
+
+
+def get_summary_prompt_template():
+    """
+    Rolling chat summary (memory/summary_memory.py) - purani summary + nayi lines → nayi summary
+    """
+    summary_prompt = PromptTemplate(
+        template="""
+Progressively summarize a conversation between a user and an assistant about a document.
+Extend the current summary with the new lines of conversation and return the new summary.
+
+Instructions:
+- Keep facts the user may refer back to: names, numbers, dates, decisions, and the user's goals
+- Keep questions that are still open
+- Drop greetings, repetition and details that later lines replaced
+- Write plain prose in at most {max_words} words
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{lines}
+
+New summary:
+""",
+        input_variables=["summary", "lines", "max_words"],
+    )
+
+    return summary_prompt
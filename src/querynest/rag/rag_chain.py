@@ -1,3 +1,5 @@
+import time
+
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import (
     RunnableLambda,
@@ -5,6 +7,10 @@ from langchain_core.runnables import (
     RunnablePassthrough,
 )
 from querynest.prompts.prompt_template import get_chat_prompt_template
+from querynest.sessions.usage import meter
+from querynest.utils.tokens import count_tokens
+from querynest.utils import tracing
+from querynest.utils.tracing import record, span
 
 
 def _format_docs(docs):
@@ -15,6 +21,64 @@ def _format_docs(docs):
     return "\n\n".join(doc.page_content for doc in docs)
 
 
+def _traced(name: str, runnable):
+    """
+    Runnable ko span mein wrap karta hai (profiling off ho toh seedha invoke)
+    """
+
+    def call(value, config):
+        with span(name):
+            return runnable.invoke(value, config=config)
+
+    return RunnableLambda(call)
+
+
+def _record_usage(prompt_value, message) -> tuple[int, int]:
+    """
+    Provider ka usage metadata ho toh wahi, warna local token estimate
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens") or count_tokens(prompt_value.to_string())
+    completion_tokens = usage.get("output_tokens") or count_tokens(
+        message.content if message and isinstance(message.content, str) else ""
+    )
+
+    meter.record_llm(prompt_tokens, completion_tokens)
+    return prompt_tokens, completion_tokens
+
+
+def _metered_llm(llm):
+    """
+    LLM call + token usage metering.
+    Profiling on ho toh LLM ko stream karke first token ka time bhi record karta hai
+    (llm = complete call, llm.first_token = pehla chunk aane tak)
+    """
+
+    def call(prompt_value, config):
+        if not tracing.enabled():
+            message = llm.invoke(prompt_value, config=config)
+            _record_usage(prompt_value, message)
+            return message
+
+        with span("llm") as llm_span:
+            message = None
+            start = time.time_ns()
+
+            for chunk in llm.stream(prompt_value, config=config):
+                if message is None:
+                    record("llm.first_token", start, time.time_ns())
+                    message = chunk
+                else:
+                    message = message + chunk
+
+            prompt_tokens, completion_tokens = _record_usage(prompt_value, message)
+            llm_span.set_attribute("prompt_tokens", prompt_tokens)
+            llm_span.set_attribute("completion_tokens", completion_tokens)
+            return message
+
+    return RunnableLambda(call)
+
+
 def build_rag_chain(llm, retriever):
     # Prompt template
     prompt = get_chat_prompt_template()
@@ -22,12 +86,17 @@ def build_rag_chain(llm, retriever):
     # Retrieval + formatting
     retrieval_chain = RunnableParallel(
         {
-            "context": retriever | RunnableLambda(_format_docs),
+            "context": _traced("retrieve", retriever) | RunnableLambda(_format_docs),
             "question": RunnablePassthrough(),
         }
     )
 
     # Final RAG chain
-    rag_chain = retrieval_chain | prompt | llm | StrOutputParser()
+    rag_chain = (
+        retrieval_chain
+        | _traced("prompt.format", prompt)
+        | _metered_llm(llm)
+        | StrOutputParser()
+    )
 
     return rag_chain
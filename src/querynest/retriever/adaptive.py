@@ -0,0 +1,74 @@
+"""
+This file :
+- Adaptive k: fixed k ki jagah scores dekh ke decide karna kitne chunks prompt mein jaayein
+- Cutoffs (sorted scores par, best pehle):
+    threshold → is similarity se neeche ka chunk nahi
+    gap       → pichle chunk se score relative `gap` se zyada gira toh wahin ruk jao
+    min_k / max_k → hamesha kam se kam min_k, zyada se zyada max_k
+- Har query ka chosen k + scores session ke retrieval.jsonl mein log hota hai
+
+Score = exact cosine similarity (--rescore ho toh lexical bonus ke saath).
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from querynest.sessions.session_meta import SessionMeta, SessionOptions
+
+RETRIEVAL_LOG_FILE = "retrieval.jsonl"
+
+
+@dataclass
+class AdaptiveK:
+    min_k: int = 2
+    max_k: int = 8
+    # 0 = threshold off
+    threshold: float = 0.0
+    # 0 = gap cutoff off
+    gap: float = 0.1
+
+    @classmethod
+    def from_options(cls, options: SessionOptions) -> Optional["AdaptiveK"]:
+        if not options.adaptive_k:
+            return None
+        return cls(
+            min_k=options.min_k,
+            max_k=options.max_k,
+            threshold=options.score_threshold,
+            gap=options.score_gap,
+        )
+
+    def cut(self, scores: np.ndarray) -> tuple[int, str]:
+        """
+        scores: descending order mein.
+        Returns: (kitne rakhne hain, kyun ruke - "threshold" / "gap" / "max_k" / "all")
+        """
+        n = min(len(scores), self.max_k)
+
+        for i in range(n):
+            if i < self.min_k:
+                continue
+
+            if self.threshold and scores[i] < self.threshold:
+                return i, "threshold"
+
+            previous = scores[i - 1]
+            if self.gap and previous > 0 and (previous - scores[i]) / previous > self.gap:
+                return i, "gap"
+
+        return n, "max_k" if n == self.max_k else "all"
+
+
+def log_choice(path: Path, k: int, reason: str, scores: List[float]):
+    record = {
+        "at": SessionMeta.now(),
+        "k": k,
+        "cutoff": reason,
+        "scores": [round(float(s), 4) for s in scores],
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
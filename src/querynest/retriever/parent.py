@@ -0,0 +1,66 @@
+"""
+This file :
+- Parent-child sessions ka retriever
+- Search chhote child chunks par hota hai (precise match),
+  phir har hit apne parent chunk mein expand hota hai
+- Same parent ke kai children aaye toh parent ek hi baar (best child ki position par)
+  → redundant context kam, prompt chhota
+"""
+
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from querynest.utils.tracing import span
+
+# fixed k: k parents ke liye itne guna children search karo (dedup ke baad bhi k bachein)
+CHILD_FACTOR = 3
+
+
+def expand_to_parents(
+    children: List[Document], parents: Dict[str, Document], limit: Optional[int] = None
+) -> List[Document]:
+    """
+    Children (best pehle) → unique parents, same order mein.
+    Parent na mile (purana / flat chunk) toh child khud
+    """
+    seen = set()
+    expanded = []
+
+    for child in children:
+        key = child.metadata.get("parent")
+        parent = parents.get(key) if key else None
+        if parent is None:
+            key = id(child)
+
+        if key in seen:
+            continue
+        seen.add(key)
+        expanded.append(parent or child)
+
+        if limit and len(expanded) >= limit:
+            break
+
+    return expanded
+
+
+class ParentRetriever(BaseRetriever):
+    # child chunks ka retriever (plain / rescoring / adaptive)
+    base: BaseRetriever
+    # FaissStore.parents (same dict, refresh ke updates bhi dikhte hain)
+    parents: Dict[str, Any]
+    # None = base jitne bheje (adaptive k)
+    k: Optional[int] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        children = self.base.invoke(query, config={"callbacks": run_manager.get_child()})
+
+        with span("retrieve.parents", children=len(children)) as s:
+            docs = expand_to_parents(children, self.parents, self.k)
+            s.set_attribute("parents", len(docs))
+
+        return docs
@@ -0,0 +1,199 @@
+"""
+This file :
+- Progressive indexing: naye session ki ingestion background thread mein chalti hai
+  aur chat turant shuru ho jaata hai
+- ProgressiveIndex → jitne chunks ab tak embed ho chuke hain unka in-memory partial FAISS index
+- Ingestion complete hone par ek hi assignment mein final (saved) index ke retriever
+  par switch - koi query kabhi aadhe switched state ko nahi dekhti
+- ProgressiveRetriever RAG chain ko ek stable retriever deta hai, andar jo bhi current ho
+- Partial index par bhi session ke retrieval options (rescore, adaptive k) lagte hain -
+  partial index float32 hai, isliye exact vectors seedha usi se
+
+Partial index sirf memory mein hai; disk par session tabhi dikhta hai jab
+FaissStore.build() poora index save karke manifest flip kar de.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from querynest.retriever.adaptive import AdaptiveK, log_choice
+from querynest.retriever.parent import CHILD_FACTOR, expand_to_parents
+from querynest.retriever.rescoring import DEFAULT_CANDIDATES, DEFAULT_LEXICAL_WEIGHT, rescore
+from querynest.retriever.scope import MetadataIndex, Scope, scoped_search
+
+
+class ProgressiveIndex:
+    def __init__(
+        self,
+        embeddings,
+        k: int = 4,
+        rescore: bool = False,
+        candidates: int = DEFAULT_CANDIDATES,
+        lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+        adaptive: AdaptiveK | None = None,
+        log_path: Path | None = None,
+    ):
+        # query embedding ke liye (FaissStore wala instrumented embeddings)
+        self.embeddings = embeddings
+        self.k = k
+
+        # final retriever (FaissStore.get_retriever) wale hi options
+        self.rescore = rescore
+        self.candidates = candidates
+        self.lexical_weight = lexical_weight
+        self.adaptive = adaptive
+        self.log_path = log_path
+
+        # partial index mein add aur search ek saath na ho (faiss index thread-safe nahi)
+        self._lock = threading.Lock()
+        self._partial: FAISS | None = None
+        self._final: BaseRetriever | None = None
+        self._done = threading.Event()
+
+        # parent-child sessions: partial results bhi parents mein expand hote hain
+        self.parents: Dict[str, Document] = {}
+        # /scope - partial index par bhi (final retriever FaissStore.scope follow karta hai)
+        self.scope = Scope()
+
+        self.indexed = 0
+        self.total = 0
+        # background ingestion ka current stage (chat prompt ke upar dikhta hai)
+        self.status = "Starting ingestion..."
+        self.error: Optional[BaseException] = None
+        # ingestion ke baad session ki build stats (chat loop meta banate waqt use karta hai)
+        self.build_stats = None
+
+    # Background ingestion side
+
+    def add(self, documents: List[Document], vectors: List[np.ndarray]):
+        """
+        FaissStore.build(on_batch=...) har embedded batch ke saath call karta hai
+        """
+        if not documents:
+            return
+
+        text_embeddings = [(doc.page_content, vec) for doc, vec in zip(documents, vectors)]
+        metadatas = [doc.metadata for doc in documents]
+
+        with self._lock:
+            if self._partial is None:
+                self._partial = FAISS.from_embeddings(
+                    text_embeddings=text_embeddings,
+                    embedding=self.embeddings,
+                    metadatas=metadatas,
+                )
+            else:
+                self._partial.add_embeddings(text_embeddings=text_embeddings, metadatas=metadatas)
+            self.indexed += len(documents)
+
+    def complete(self, retriever: BaseRetriever):
+        """
+        Poora index save ho gaya - ab saari queries final retriever se
+        """
+        with self._lock:
+            self._final = retriever
+            self._partial = None
+            self.indexed = self.total
+        self._done.set()
+
+    def fail(self, error: BaseException):
+        self.error = error
+        self._done.set()
+
+    # Chat side
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def ready(self) -> bool:
+        return self._final is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def search(self, query: str, config: Any = None) -> List[Document]:
+        final = self._final
+        if final is not None:
+            return final.invoke(query, config=config)
+
+        if self._partial is None:
+            return []
+
+        # k ka hisaab FaissStore.get_retriever jaisa: parents ke liye zyada children,
+        # adaptive ho toh max_k tak
+        k = self.k if self.adaptive or not self.parents else self.k * CHILD_FACTOR
+        if self.adaptive:
+            k = self.adaptive.max_k
+        reranked = self.rescore or self.adaptive is not None
+        n = max(self.candidates, k) if self.rescore else k
+
+        # network call lock ke bahar, sirf faiss search lock ke andar
+        query_vec = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        with self._lock:
+            if self._partial is None:
+                # beech mein complete ho gaya
+                return self._final.invoke(query, config=config)
+            ids = self._partial_search(query_vec, n)
+            docstore, id_map = self._partial.docstore, self._partial.index_to_docstore_id
+            docs = [docstore.search(id_map[i]) for i in ids]
+            # partial index flat float32 hai - yahi exact vectors hain
+            vectors = self._partial.index.reconstruct_batch(ids) if reranked and len(ids) else None
+
+        if reranked and docs:
+            docs = self._rerank(query, query_vec, docs, vectors, k)
+
+        if not self.parents:
+            return docs
+        return expand_to_parents(docs, self.parents, None if self.adaptive else self.k)
+
+    def _partial_search(self, query_vec, n: int) -> np.ndarray:
+        mask = None
+        if self.scope.active:
+            # partial index har batch par badalta hai - metadata index har query par naya (chhota hai)
+            docstore, id_map = self._partial.docstore, self._partial.index_to_docstore_id
+            metadata = MetadataIndex.build([docstore.search(i).metadata for i in id_map.values()])
+            mask = metadata.mask(self.scope)
+        return scoped_search(self._partial.index, query_vec, n, mask)
+
+    def _rerank(self, query: str, query_vec, docs: List[Document], vectors, k: int) -> List[Document]:
+        """
+        RescoringRetriever jaisa stage 2: exact + lexical score, adaptive k cutoff
+        """
+        scores = rescore(
+            query_vec,
+            vectors,
+            query,
+            [doc.page_content for doc in docs],
+            self.lexical_weight if self.rescore else 0.0,
+        )
+        order = np.argsort(-scores, kind="stable")[:k]
+
+        if self.adaptive:
+            keep, reason = self.adaptive.cut(scores[order])
+            if self.log_path:
+                log_choice(self.log_path, keep, reason, scores[order].tolist())
+            order = order[:keep]
+
+        return [docs[i] for i in order]
+
+    def as_retriever(self) -> "ProgressiveRetriever":
+        return ProgressiveRetriever(index=self)
+
+
+class ProgressiveRetriever(BaseRetriever):
+    # ProgressiveIndex (plain class, pydantic validate nahi karta)
+    index: Any
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.index.search(query, config={"callbacks": run_manager.get_child()})
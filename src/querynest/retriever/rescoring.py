@@ -0,0 +1,138 @@
+"""
+This file :
+- Two-stage retriever (--rescore)
+- Stage 1: session ke index (compressed ya float32) se bada candidate set (default 200)
+- Stage 2: candidates ko ek hi vectorized numpy pass mein re-score
+    semantic → full-precision vectors (segment store) se exact cosine similarity
+    lexical  → query terms ka candidate text mein IDF-weighted overlap
+  score = semantic + lexical_weight * lexical, aur top-k wapas
+- Dono stages ke spans (retrieve.candidates / retrieve.rescore) --profile breakdown mein dikhte hain
+- Adaptive k ho toh sorted scores par cutoff lagta hai (retriever/adaptive.py)
+- Stage 1 store ka current scope follow karta hai (retriever/scope.py)
+"""
+
+import string
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from querynest.retriever.adaptive import AdaptiveK, log_choice
+from querynest.utils.tracing import span
+
+# stage 1 ka default candidate set
+DEFAULT_CANDIDATES = 200
+DEFAULT_LEXICAL_WEIGHT = 0.3
+
+# punctuation → space, phir split (200 candidates par regex se ~2x fast)
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation})
+
+
+def _terms(text: str) -> List[str]:
+    return text.lower().translate(_PUNCTUATION).split()
+
+
+def rescore(
+    query_vec: np.ndarray,
+    vectors: np.ndarray,
+    query_text: str,
+    texts: List[str],
+    lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+) -> np.ndarray:
+    """
+    Har candidate ka combined score (zyada = better)
+    vectors: candidates ke full-precision vectors (n x dim)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    query_vec = np.asarray(query_vec, dtype=np.float32)
+
+    norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query_vec) or 1.0)
+    semantic = (vectors @ query_vec) / np.where(norms == 0, 1.0, norms)
+
+    if not lexical_weight:
+        return semantic
+
+    # chhote words (is, of, a) lexical signal nahi dete
+    query_terms = [term for term in _terms(query_text) if len(term) > 2]
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(query_terms))}
+    if not vocab:
+        return semantic
+
+    # presence[i, j] = candidate i mein query term j hai ya nahi
+    presence = np.zeros((len(texts), len(vocab)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        cols = [vocab[term] for term in set(_terms(text)) if term in vocab]
+        presence[row, cols] = 1.0
+
+    # candidate set ke andar ki IDF - har candidate mein aane wale terms ka weight kam
+    df = presence.sum(axis=0)
+    idf = np.log((len(texts) + 1) / (df + 1)) + 1.0
+    lexical = (presence @ idf) / idf.sum()
+
+    return semantic + lexical_weight * lexical
+
+
+class RescoringRetriever(BaseRetriever):
+    # FaissStore (circular import se bachne ke liye Any)
+    store: Any
+    k: int = 4
+    # stage 1 mein kitne candidates
+    candidates: int = DEFAULT_CANDIDATES
+    # stage 2 mein lexical overlap ka weight (0 = sirf exact vectors)
+    lexical_weight: float = DEFAULT_LEXICAL_WEIGHT
+    # adaptive k (retriever/adaptive.py) - diya ho toh k = adaptive.max_k tak, scores ke hisaab se kam
+    adaptive: Optional[AdaptiveK] = None
+    # har query ka chosen k + scores yahan append (adaptive k ke saath)
+    log_path: Optional[Path] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        index = self.store.store.index
+
+        query_vec = np.asarray(self.store.embeddings.embed_query(query), dtype=np.float32)
+
+        n = min(index.ntotal, max(self.candidates, self.k))
+        if n == 0:
+            return []
+
+        with span(
+            "retrieve.candidates",
+            candidates=n,
+            precision=self.store.precision,
+            scope=self.store.scope.describe(),
+        ):
+            # scope (agar hai) search ke andar hi lagta hai - saare candidates scope ke hain
+            ids = self.store.search(query_vec, n)
+            docs = self.store.documents_by_ids(ids)
+            if not docs:
+                return []
+
+        with span("retrieve.rescore", candidates=len(docs)) as rescore_span:
+            if self.store.precision == "float32":
+                # flat index ke vectors already exact hain - segment store lookup ki zarurat nahi
+                vectors = index.reconstruct_batch(ids)
+            else:
+                vectors = self.store.full_vectors(docs)
+
+            scores = rescore(
+                query_vec,
+                vectors,
+                query,
+                [doc.page_content for doc in docs],
+                self.lexical_weight,
+            )
+            order = np.argsort(-scores, kind="stable")[: self.k]
+
+            if self.adaptive:
+                keep, reason = self.adaptive.cut(scores[order])
+                rescore_span.set_attribute("k", keep)
+                rescore_span.set_attribute("cutoff", reason)
+                if self.log_path:
+                    log_choice(self.log_path, keep, reason, scores[order].tolist())
+                order = order[:keep]
+
+        return [docs[i] for i in order]
@@ -0,0 +1,224 @@
+"""
+This file :
+- Search ko session ke ek hisse tak seemit karna (chat mein /scope, CLI par --scope)
+- Scope = source files (path ka substring) + page range + source type
+- MetadataIndex: chunk metadata se per-source / per-type bitmaps aur page array,
+  FAISS id order mein - kisi bhi scope ka id mask bas numpy AND / OR hai
+- Mask FAISS search ke andar hi IDSelectorBitmap ban ke jaata hai - over-fetch karke
+  baad mein results drop nahi hote, isliye scope ke andar hamesha poore k chunks milte hain
+  (IndexPQ selector support nahi karta - wahan sirf scoped ids ke decoded vectors par search)
+
+Pages user ke liye 1-based hain; PDF loader ke metadata["page"] 0-based.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from querynest.utils.tracing import span
+
+SOURCE_TYPES = ("pdf", "web")
+
+
+def source_type_of(metadata: dict) -> str:
+    # web loader "type" set karta hai, PDF loader sirf source + page
+    return metadata.get("type") or "pdf"
+
+
+@dataclass(frozen=True)
+class Scope:
+    # source path / URL ke substrings (case-insensitive), koi bhi match ho
+    sources: Tuple[str, ...] = ()
+    # (first, last) pages, 1-based inclusive
+    pages: Optional[Tuple[int, int]] = None
+    source_type: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.sources or self.pages or self.source_type)
+
+    @classmethod
+    def parse(cls, text: str) -> "Scope":
+        """
+        "source=manual.pdf,guide.pdf pages=10-20 type=pdf" → Scope
+        Galat input par ValueError (message user ko dikhta hai)
+        """
+        values: Dict[str, Any] = {}
+
+        for token in text.split():
+            key, sep, value = token.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Expected key=value, got '{token}'")
+
+            if key in ("source", "sources"):
+                values["sources"] = tuple(v for v in value.split(",") if v)
+            elif key in ("page", "pages"):
+                first, _, last = value.partition("-")
+                try:
+                    pages = (int(first), int(last or first))
+                except ValueError:
+                    raise ValueError(f"Pages must look like 5 or 5-12, got '{value}'")
+                if not 1 <= pages[0] <= pages[1]:
+                    raise ValueError(f"Invalid page range '{value}'")
+                values["pages"] = pages
+            elif key == "type":
+                if value not in SOURCE_TYPES:
+                    raise ValueError(
+                        f"Unknown source type '{value}' (choose from {', '.join(SOURCE_TYPES)})"
+                    )
+                values["source_type"] = value
+            else:
+                raise ValueError(f"Unknown scope key '{key}' (use source / pages / type)")
+
+        return cls(**values)
+
+    def describe(self) -> str:
+        if not self.active:
+            return "whole session"
+
+        parts = []
+        if self.sources:
+            parts.append("source=" + ",".join(self.sources))
+        if self.pages:
+            first, last = self.pages
+            parts.append(f"pages={first}-{last}" if last != first else f"pages={first}")
+        if self.source_type:
+            parts.append(f"type={self.source_type}")
+        return " ".join(parts)
+
+
+@dataclass
+class MetadataIndex:
+    """
+    Ek session ke chunks ka metadata index (position = FAISS id)
+    """
+
+    size: int = 0
+    sources: Dict[str, np.ndarray] = field(default_factory=dict)
+    types: Dict[str, np.ndarray] = field(default_factory=dict)
+    # -1 = page number nahi (web chunks)
+    pages: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+
+    @classmethod
+    def build(cls, metadatas: List[dict]) -> "MetadataIndex":
+        size = len(metadatas)
+        pages = np.full(size, -1, dtype=np.int32)
+        source_ids: Dict[str, List[int]] = {}
+        type_ids: Dict[str, List[int]] = {}
+
+        for i, metadata in enumerate(metadatas):
+            source_ids.setdefault(str(metadata.get("source", "")), []).append(i)
+            type_ids.setdefault(source_type_of(metadata), []).append(i)
+            page = metadata.get("page")
+            if isinstance(page, int):
+                pages[i] = page
+
+        def bitmap(ids: List[int]) -> np.ndarray:
+            bits = np.zeros(size, dtype=bool)
+            bits[ids] = True
+            return bits
+
+        return cls(
+            size=size,
+            sources={source: bitmap(ids) for source, ids in source_ids.items()},
+            types={kind: bitmap(ids) for kind, ids in type_ids.items()},
+            pages=pages,
+        )
+
+    def matching_sources(self, patterns: Tuple[str, ...]) -> List[str]:
+        lowered = [p.lower() for p in patterns]
+        return [s for s in self.sources if any(p in s.lower() for p in lowered)]
+
+    def counts(self) -> Dict[str, int]:
+        """
+        source → chunks (/scope listing ke liye)
+        """
+        return {source: int(bits.sum()) for source, bits in self.sources.items()}
+
+    def mask(self, scope: Scope) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+
+        if scope.sources:
+            selected = np.zeros(self.size, dtype=bool)
+            for source in self.matching_sources(scope.sources):
+                selected |= self.sources[source]
+            mask &= selected
+
+        if scope.source_type:
+            mask &= self.types.get(scope.source_type, np.zeros(self.size, dtype=bool))
+
+        if scope.pages:
+            first, last = scope.pages
+            mask &= (self.pages >= first - 1) & (self.pages <= last - 1)
+
+        return mask
+
+
+def scored_search(
+    index, query_vec: np.ndarray, n: int, mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-n (L2 distances, FAISS ids), best pehle.
+    mask diya ho toh sirf uske andar ke ids search hote hain
+    """
+    query = np.asarray(query_vec, dtype=np.float32).reshape(1, -1)
+
+    if hasattr(index, "scored_search"):
+        # ShardedIndex - har shard parallel mein, apne hisse ke mask ke saath
+        return index.scored_search(query[0], n, mask)
+
+    if mask is None:
+        distances, ids = index.search(query, min(n, index.ntotal))
+        keep = ids[0] >= 0
+        return distances[0][keep], ids[0][keep]
+
+    allowed = np.flatnonzero(mask)
+    n = min(n, len(allowed))
+    if n == 0:
+        return np.empty(0, dtype=np.float32), allowed
+
+    if isinstance(index, faiss.IndexPQ):
+        # IndexPQ search params mein selector nahi leta - scoped subset hi decode karke scan
+        vectors = index.reconstruct_batch(allowed)
+        distances = ((vectors - query) ** 2).sum(axis=1)
+        order = np.argsort(distances, kind="stable")[:n]
+        return distances[order], allowed[order]
+
+    # bitmap search ke dauraan zinda rehna chahiye (swig_ptr copy nahi karta)
+    bits = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bits))
+    distances, ids = index.search(query, n, params=faiss.SearchParameters(sel=selector))
+    keep = ids[0] >= 0
+    return distances[0][keep], ids[0][keep]
+
+
+def scoped_search(
+    index, query_vec: np.ndarray, n: int, mask: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Top-n FAISS ids (best pehle), scope mask ke andar
+    """
+    return scored_search(index, query_vec, n, mask)[1]
+
+
+class ScopedRetriever(BaseRetriever):
+    """
+    Plain top-k similarity retriever jo store ka current scope follow karta hai
+    """
+
+    # FaissStore (circular import se bachne ke liye Any)
+    store: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        query_vec = self.store.embeddings.embed_query(query)
+
+        with span("retrieve.search", k=self.k, scope=self.store.scope.describe()):
+            return self.store.documents_by_ids(self.store.search(query_vec, self.k))
@@ -0,0 +1,227 @@
+"""
+This file :
+- sessions export / import: ek session ko single archive file (storage/archive.py) mein
+  pack karke dusri machine par wapas session banana
+- Archive mein: session meta, full-precision vectors, chunk text + metadata, parents,
+  compressed sessions ke faiss index(es), aur (optional) chat history
+- Import: vectors archive se mmap hoke seedha segment store + index mein -
+  koi re-embedding, PQ training ya pickle nahi
+
+Sections:
+    vectors          float32 (chunks, dim)      raw
+    text_offsets     uint64 (chunks + 1)        raw - decompressed text mein har chunk ki range
+    text             utf-8 chunk texts          compressed
+    metadata         JSON (chunk metadata + parents)  compressed
+    index.<slot>     faiss.serialize_index      raw - sirf precision != float32
+    chat             chat.json                  compressed - --no-history par nahi
+    summary          summary.json               compressed - summary memory, --no-history par nahi
+"""
+
+import json
+import os
+import uuid
+from pathlib import Path
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from querynest.loaders.http_cache import remove_session_cache
+from querynest.memory.summary_memory import SUMMARY_FILE
+from querynest.sessions.build_stats import collect_build_stats
+from querynest.sessions.gc import empty_trash, evict_session, move_to_trash
+from querynest.sessions.identity import save_alias
+from querynest.sessions.session_meta import SessionMeta, load_session_meta, save_session_meta
+from querynest.storage.archive import ArchiveWriter, SessionArchive
+from querynest.storage.atomic import atomic_write_bytes, session_lock
+from querynest.storage.history_index import HistoryIndex
+from querynest.storage.segment_store import segment_hash
+from querynest.utils.hashing import generate_content_session_id
+from querynest.utils.paths import SESSIONS_DIR, get_chat_path
+from querynest.utils.timing import StageTimer
+from querynest.vector_store.faiss_store import FaissStore
+from querynest.vector_store.shards import ShardedIndex
+
+ARCHIVE_SUFFIX = ".qnsession"
+
+ARCHIVE_FORMAT = "querynest-session"
+
+
+def export_session(session_id: str, path: Path, include_history: bool = True) -> dict:
+    """
+    Returns: summary (chunks, precision, bytes) - CLI report ke liye
+    """
+    session_dir = SESSIONS_DIR / session_id
+    meta = load_session_meta(session_dir)
+    if meta is None:
+        raise ValueError("Session not found")
+
+    store = FaissStore()
+    if not store.load(session_id):
+        if meta.compacted_at:
+            raise ValueError("Session was compacted by 'sessions gc' - chat with it once to rebuild it")
+        raise ValueError("Vector index not found for this session")
+
+    documents = store.documents()
+    vectors = store.full_vectors(documents)
+
+    encoded = [doc.page_content.encode("utf-8") for doc in documents]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+
+    writer = ArchiveWriter()
+    writer.add_array("vectors", vectors)
+    writer.add_array("text_offsets", offsets)
+    writer.add_blob("text", b"".join(encoded))
+    writer.add_blob(
+        "metadata",
+        json.dumps(
+            {
+                "chunks": [doc.metadata for doc in documents],
+                "parents": {
+                    key: {"page_content": p.page_content, "metadata": p.metadata}
+                    for key, p in store.parents.items()
+                },
+            },
+            default=str,
+        ).encode("utf-8"),
+    )
+
+    # compressed index dobara train na karna pade (PQ) - jaisa hai waisa
+    indexes = []
+    if store.precision != "float32":
+        index = store.store.index
+        indexes = index.shards if isinstance(index, ShardedIndex) else [index]
+        for slot, shard in enumerate(indexes):
+            writer.add_array(f"index.{slot}", faiss.serialize_index(shard))
+
+    chat_path = get_chat_path(session_id)
+    summary_path = session_dir / SUMMARY_FILE
+    if include_history and chat_path.exists():
+        writer.add_blob("chat", chat_path.read_bytes())
+    if include_history and summary_path.exists():
+        writer.add_blob("summary", summary_path.read_bytes())
+
+    size = writer.write(
+        path,
+        {
+            "format": ARCHIVE_FORMAT,
+            "exported_at": SessionMeta.now(),
+            "model": store.model_name,
+            "dim": int(vectors.shape[1]),
+            "chunks": len(documents),
+            "precision": store.precision,
+            "shard_size": store.shard_size,
+            "indexes": len(indexes),
+            "meta": meta.model_dump(),
+        },
+    )
+
+    return {"chunks": len(documents), "precision": store.precision, "bytes": size}
+
+
+def import_session(path: Path, replace: bool = False) -> SessionMeta:
+    """
+    Archive se session. Same id ka session pehle se ho toh FileExistsError
+    (replace=True → purana session tabhi hatta hai jab naya poora ban chuka ho)
+    """
+    archive = SessionArchive(path)
+    header = archive.header
+    if header.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"{path} is not a QueryNest session archive")
+
+    meta = SessionMeta(**header["meta"])
+
+    store = FaissStore()
+    if header["model"] != store.model_name:
+        # vectors doosre model ke hain - queries ka embedding match nahi karega
+        raise ValueError(
+            f"Archive was embedded with '{header['model']}', this install uses '{store.model_name}'"
+        )
+
+    session_dir = SESSIONS_DIR / meta.id
+    existed = (session_dir / "meta.json").exists()
+    if existed and not replace:
+        raise FileExistsError(f"Session {meta.id} already exists")
+
+    timer = StageTimer()
+    with timer.stage("load"):
+        offsets = archive.array("text_offsets")
+        text = archive.blob("text")
+        metadata = json.loads(archive.blob("metadata"))
+
+        documents = [
+            Document(page_content=text[start:end].decode("utf-8"), metadata=chunk_metadata)
+            for start, end, chunk_metadata in zip(
+                offsets[:-1].tolist(), offsets[1:].tolist(), metadata["chunks"]
+            )
+        ]
+        parents = {key: Document(**parent) for key, parent in metadata["parents"].items()}
+
+        indexes = None
+        if header["indexes"]:
+            indexes = [
+                faiss.deserialize_index(archive.array(f"index.{slot}"))
+                for slot in range(header["indexes"])
+            ]
+
+    # naya session pehle staging folder mein - archive kharab ho ya beech mein crash,
+    # purana session (replace par) jaisa tha waisa rehta hai. Crash ke bache staging
+    # folders meta.json ke bina hain → gc unhe abandoned ingestion ki tarah hata deta hai
+    staging_id = f"{meta.id}.import-{uuid.uuid4().hex[:8]}"
+    staging_dir = SESSIONS_DIR / staging_id
+    try:
+        store.restore(
+            staging_id,
+            documents,
+            archive.array("vectors"),
+            parents=parents,
+            precision=header["precision"],
+            shard_size=header["shard_size"],
+            indexes=indexes,
+            timer=timer,
+        )
+        # pages source machine ke build se (archive mein pages nahi, sirf chunks)
+        meta.build = collect_build_stats(
+            store, staging_id, "import", timer.stages, meta.build.pages if meta.build else 0
+        )
+
+        if archive.has("chat"):
+            atomic_write_bytes(get_chat_path(staging_id), archive.blob("chat"))
+        if archive.has("summary"):
+            atomic_write_bytes(staging_dir / SUMMARY_FILE, archive.blob("summary"))
+        save_session_meta(staging_dir, meta)
+    except BaseException:
+        evict_session(staging_dir)
+        raise
+
+    # save() jaisa order: naye refs add → swap → purane refs drop
+    segments = store.segments
+    hashes = [segment_hash(store.model_name, doc.page_content) for doc in documents]
+    segments.add_session_refs(meta.id, hashes)
+    segments.release_session(staging_id)
+
+    with session_lock(session_dir):
+        # lock file session_dir bana deta hai - naya session ho tab bhi khali folder hatao
+        move_to_trash(session_dir)
+        os.replace(staging_dir, session_dir)
+    segments.set_session_refs(meta.id, hashes)
+    # trash mein gayi adhoori ingestion (agar thi) ke pending segments
+    segments.release_pending(meta.id)
+    empty_trash()
+
+    if existed:
+        # purane session ki chats ki entries - nayi chat.json agle search sync mein index hoti hai
+        HistoryIndex().remove_session(meta.id)
+        remove_session_cache(meta.id)
+
+    # content identity: source is machine par bhi hai toh path → session alias
+    # (warna resolve_session_id har chat par poora content hash karta)
+    if (
+        meta.source_type == "pdf"
+        and meta.options.identity == "content"
+        and Path(meta.source).expanduser().exists()
+        and generate_content_session_id(meta.source) == meta.id
+    ):
+        save_alias(meta.source, meta.id)
+    return meta
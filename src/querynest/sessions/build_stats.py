@@ -0,0 +1,59 @@
+"""
+This file :
+- Index build ke baad session ki BuildStats (SessionMeta.build):
+  pages / chunks, embedding model + dim, index type, disk size, stage timings
+- sessions info mein dikhti hai, sessions list --sort se sort hoti hai - kaunse sessions
+  faster settings ke saath re-index karne hain ya evict karne hain, ye isi se pata chalta hai
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from querynest.sessions.gc import path_size
+from querynest.sessions.identity import source_fingerprint
+from querynest.sessions.session_meta import BuildStats, SessionMeta
+from querynest.utils.paths import SESSIONS_DIR
+from querynest.vector_store.faiss_store import FaissStore
+from querynest.vector_store.shards import ShardedIndex
+
+
+def index_type(store: FaissStore) -> str:
+    index = store.store.index
+    if isinstance(index, ShardedIndex):
+        return f"{len(index.shards)} × {type(index.shards[0]).__name__} ({store.precision})"
+    return f"{type(index).__name__} ({store.precision})"
+
+
+def collect_build_stats(
+    store: FaissStore,
+    session_id: str,
+    kind: str,
+    stages: Dict[str, float],
+    pages: int = 0,
+    pdf_source: Optional[str] = None,
+) -> BuildStats:
+    """
+    store: abhi build / save hua store. stages: StageTimer.stages
+    pdf_source: PDF file / directory - uska fingerprint bhi record hota hai
+    """
+    index = store.store.index
+    exclusive, _ = store.segments.session_bytes(session_id)
+
+    fingerprint = None
+    if pdf_source and Path(pdf_source).expanduser().exists():
+        fingerprint = source_fingerprint(Path(pdf_source).expanduser())
+
+    return BuildStats(
+        built_at=SessionMeta.now(),
+        kind=kind,
+        pages=pages,
+        chunks=index.ntotal,
+        parents=len(store.parents),
+        embedded=store.embedded,
+        embedding_model=store.model_name,
+        dim=index.d,
+        index_type=index_type(store),
+        disk_bytes=path_size(SESSIONS_DIR / session_id) + exclusive,
+        stages={name: round(seconds, 3) for name, seconds in stages.items()},
+        source_fingerprint=fingerprint,
+    )
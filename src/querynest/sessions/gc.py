@@ -0,0 +1,426 @@
+"""
+This file :
+- ~/.querynest ko ek disk budget ke andar rakhna (sessions gc, auto_gc)
+- Sessions LRU order mein (meta.last_used_at, sabse purana pehle) evict hote hain
+  jab tak total usage budget ke neeche na aa jaaye
+- "compact" (default): vectors + index files hatao aur segment refs release karo,
+  lekin chunk text ingest checkpoint mein rakho (ingest/chunks.jsonl.gz).
+  Agli baar chat khulne par sirf re-embed hota hai - load / parse / split nahi.
+  meta.json, chat history (+ summary), usage log, traces / retrieval log waise hi rehte hain
+- "delete": poora session (sessions delete jaisa)
+- auto_gc (chat / index start par) AUTO_GC_INTERVAL mein ek hi baar scan karta hai
+- Dono modes mein kachra bhi saaf hota hai (budget ke hisaab se pehle):
+  meta.json ke bina session folders (adhoori ingestion) jinme STALE_INGEST_DAYS
+  se koi activity nahi, aur segment store ke unreferenced segments jo kisi zinda
+  ingestion ke pending refs nahi hain (abandoned ingestions / crashed refreshes)
+
+Budget poore ~/.querynest ka hai, lekin shared caches (parsed pages, HTTP responses)
+evict nahi hote - wahi rebuild / rechunk ko sasta rakhte hain.
+Segment store ki reclaimed jagah VACUUM ke baad hi disk par wapas milti hai.
+"""
+
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from querynest.config.config_loader import load_config
+from querynest.ingestion.checkpoint import CHECKPOINT_DIR, IngestCheckpoint
+from querynest.loaders.http_cache import remove_session_cache
+from querynest.memory.summary_memory import SUMMARY_FILE
+from querynest.retriever.adaptive import RETRIEVAL_LOG_FILE
+from querynest.sessions.identity import remove_aliases
+from querynest.sessions.session_meta import SessionMeta, load_session_meta, save_session_meta
+from querynest.sessions.usage import USAGE_LOG_FILE
+from querynest.storage.atomic import LOCK_FILE, file_lock, session_lock
+from querynest.storage.history_index import HistoryIndex
+from querynest.storage.page_cache import cache_size
+from querynest.storage.segment_store import SegmentStore
+from querynest.utils.paths import BASE_DIR, HTTP_CACHE_DIR, SESSIONS_DIR, TRASH_DIR
+from querynest.utils.tracing import TRACE_FILE
+from querynest.vector_store.faiss_store import FaissStore
+
+GC_MODES = ("compact", "delete")
+
+MB = 1024 * 1024
+
+# itne din koi activity nahi (checkpoint files, pending segments) → ingestion abandoned
+STALE_INGEST_DAYS = 7
+DAY = 24 * 60 * 60
+
+# compacted chunk text gzip hota hai - estimate ke liye itna chhota maan lo
+TEXT_COMPRESSION = 3
+
+# compaction ke baad session folder mein sirf ye (+ ingest/ checkpoint)
+# (traces / retrieval log user ke diagnostics hain - gc unhe nahi chhoota)
+KEEP_FILES = {
+    "meta.json",
+    "chat.json",
+    SUMMARY_FILE,
+    USAGE_LOG_FILE,
+    LOCK_FILE,
+    TRACE_FILE,
+    RETRIEVAL_LOG_FILE,
+}
+
+# ek waqt mein ek hi gc (do terminals ka auto gc ek hi session par na chale)
+GC_LOCK_PATH = BASE_DIR / "gc.lock"
+
+# auto_gc ka last run (mtime) - har chat par poora scan nahi
+AUTO_GC_STAMP = BASE_DIR / "gc.last_run"
+AUTO_GC_INTERVAL = 60 * 60
+
+
+def path_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    if not path.exists():
+        return 0
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def storage_usage(segments: SegmentStore) -> Dict[str, int]:
+    """
+    ~/.querynest ke hisse (bytes) - budget inke total se compare hota hai
+    """
+    return {
+        "sessions": path_size(SESSIONS_DIR),
+        "segments": segments.disk_bytes(),
+        "pages": cache_size()[1],
+        "http_cache": path_size(HTTP_CACHE_DIR),
+        "history": HistoryIndex().disk_bytes(),
+        # crash ke baad bache tombstones (agla delete saaf karta hai)
+        "trash": path_size(TRASH_DIR),
+    }
+
+
+@dataclass
+class SessionFootprint:
+    meta: SessionMeta
+    session_dir: Path
+    # compaction mein hatne wali files (index, shards, segment refs...)
+    index_bytes: int
+    # meta, chat history, usage / trace logs (+ compacted session ka chunk text)
+    kept_bytes: int
+    # segment store mein sirf isi session ke segments (release par reclaim)
+    segment_bytes: int
+    # session ke chunks ka text - compaction ke baad checkpoint mein rehta hai
+    text_bytes: int
+
+    @property
+    def compacted(self) -> bool:
+        return self.meta.compacted_at is not None
+
+    def reclaimable(self, mode: str) -> int:
+        """
+        Evict karne par kitni jagah bachegi (estimate)
+        """
+        if mode == "delete":
+            return self.index_bytes + self.kept_bytes + self.segment_bytes
+        if self.compacted:
+            return 0
+        return max(0, self.index_bytes + self.segment_bytes - self.text_bytes // TEXT_COMPRESSION)
+
+
+def session_footprint(session_dir: Path, segments: SegmentStore) -> Optional[SessionFootprint]:
+    meta = load_session_meta(session_dir)
+    if meta is None:
+        # adhoori ingestion (sirf checkpoint) - gc isko nahi chhoota
+        return None
+
+    index_bytes, kept_bytes = 0, 0
+    for path in session_dir.iterdir():
+        kept = path.name in KEEP_FILES or (
+            path.name == CHECKPOINT_DIR and meta.compacted_at is not None
+        )
+        if kept:
+            kept_bytes += path_size(path)
+        else:
+            index_bytes += path_size(path)
+
+    segment_bytes, text_bytes = segments.session_bytes(meta.id)
+    return SessionFootprint(meta, session_dir, index_bytes, kept_bytes, segment_bytes, text_bytes)
+
+
+@dataclass
+class StaleIngest:
+    """
+    meta.json ke bina session folder - ingestion jo kabhi resume / complete nahi hui
+    """
+    session_dir: Path
+    # checkpoint files (iske pending segments GcPlan.orphan_bytes mein gine jaate hain)
+    size: int
+    # last activity (unix time)
+    active_at: float
+
+    @property
+    def age_days(self) -> float:
+        return (time.time() - self.active_at) / DAY
+
+
+def _last_activity(session_dir: Path, pending: Dict[str, float]) -> float:
+    """
+    Folder ki sabse nayi file ka mtime, ya sabse naya pending segment (embedding chal rahi ho)
+    """
+    times = [session_dir.stat().st_mtime, pending.get(session_dir.name, 0.0)]
+    times.extend(p.stat().st_mtime for p in session_dir.rglob("*") if p.is_file())
+    return max(times)
+
+
+def _scan_ingests(
+    segments: SegmentStore, cutoff: float, excluded: Iterable[str] = ()
+) -> tuple[List[StaleIngest], List[str]]:
+    """
+    meta.json ke bina folders → (abandoned, zinda ingestions ke session ids)
+    """
+    pending = segments.pending_sessions()
+    excluded = set(excluded)
+    stale, live = [], []
+
+    if SESSIONS_DIR.exists():
+        for session_dir in SESSIONS_DIR.iterdir():
+            if not session_dir.is_dir() or (session_dir / "meta.json").exists():
+                continue
+            active_at = _last_activity(session_dir, pending)
+            if active_at >= cutoff or session_dir.name in excluded:
+                live.append(session_dir.name)
+            else:
+                stale.append(StaleIngest(session_dir, path_size(session_dir), active_at))
+
+    return stale, live
+
+
+@dataclass
+class GcPlan:
+    budget: int
+    mode: str
+    usage: Dict[str, int]
+    # saare sessions, least recently used pehle
+    sessions: List[SessionFootprint]
+    evict: List[SessionFootprint] = field(default_factory=list)
+    # abandoned ingestions - hamesha hatte hain
+    stale: List[StaleIngest] = field(default_factory=list)
+    # unreferenced segments jo kisi zinda ingestion ke pending nahi (sweep)
+    orphan_bytes: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.usage.values())
+
+    @property
+    def garbage(self) -> int:
+        return sum(s.size for s in self.stale) + self.orphan_bytes
+
+    @property
+    def reclaimable(self) -> int:
+        return self.garbage + sum(s.reclaimable(self.mode) for s in self.evict)
+
+    @property
+    def projected(self) -> int:
+        return self.total - self.reclaimable
+
+
+def plan_gc(
+    budget: int,
+    mode: str = "compact",
+    exclude: Iterable[str] = (),
+    segments: SegmentStore | None = None,
+) -> GcPlan:
+    """
+    budget (bytes) ke neeche aane ke liye kaunse sessions evict honge - disk par kuch nahi badalta.
+    exclude: ye sessions kabhi evict nahi hote (jo chat abhi khula hai)
+    """
+    if mode not in GC_MODES:
+        raise ValueError(f"Unknown gc mode '{mode}' (choose from {', '.join(GC_MODES)})")
+
+    segments = segments or SegmentStore()
+    excluded = set(exclude)
+
+    sessions = []
+    if SESSIONS_DIR.exists():
+        for session_dir in SESSIONS_DIR.iterdir():
+            if session_dir.is_dir():
+                footprint = session_footprint(session_dir, segments)
+                if footprint:
+                    sessions.append(footprint)
+    sessions.sort(key=lambda s: s.meta.last_used_at)
+
+    cutoff = time.time() - STALE_INGEST_DAYS * DAY
+    stale, live = _scan_ingests(segments, cutoff, excluded)
+
+    plan = GcPlan(
+        budget=budget,
+        mode=mode,
+        usage=storage_usage(segments),
+        sessions=sessions,
+        stale=stale,
+        orphan_bytes=segments.orphan_bytes(live, since=cutoff),
+    )
+
+    for footprint in sessions:
+        if plan.projected <= budget:
+            break
+        if footprint.meta.id in excluded or not footprint.reclaimable(mode):
+            continue
+        plan.evict.append(footprint)
+
+    return plan
+
+
+def compact_session(session_dir: Path) -> int:
+    """
+    Index / vectors hatao, chunk text ingest checkpoint mein rakho.
+    Returns: reclaimed segments
+    """
+    # har session ke liye naya store (parents / scope pichle session se na aaye)
+    store = FaissStore()
+    session_id = session_dir.name
+
+    with session_lock(session_dir):
+        meta = load_session_meta(session_dir)
+        if meta is None:
+            return 0
+
+        # parent-child sessions ke parents - children rebuild par dobara split hote hain
+        if store.load(session_id):
+            checkpoint = IngestCheckpoint(session_dir)
+            checkpoint.start(meta.name, meta.source, meta.options)
+            checkpoint.save_chunks(store.parent_documents(), compress=True)
+
+        # pehle meta: beech mein crash ho toh bhi chat isko rebuild karna jaanta hai
+        meta.compacted_at = SessionMeta.now()
+        save_session_meta(session_dir, meta)
+
+        for path in session_dir.iterdir():
+            if path.name in KEEP_FILES or path.name == CHECKPOINT_DIR:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+
+    return store.segments.release_session(session_id)
+
+
+def move_to_trash(session_dir: Path) -> Path:
+    """
+    Session folder ko tombstone bana deta hai (atomic rename, .lock file bhi saath).
+    Caller session_lock ke andar call kare; delete baad mein empty_trash karta hai
+    """
+    TRASH_DIR.mkdir(parents=True, exist_ok=True)
+    tombstone = TRASH_DIR / f"{session_dir.name}-{uuid.uuid4().hex[:8]}"
+    os.replace(session_dir, tombstone)
+    return tombstone
+
+
+def empty_trash():
+    """
+    Tombstones delete (pichle crash ke bache hue bhi) - koi aur process bhi
+    same tombstone saaf kar raha ho toh errors ignore
+    """
+    if not TRASH_DIR.exists():
+        return
+    for tombstone in TRASH_DIR.iterdir():
+        shutil.rmtree(tombstone, ignore_errors=True)
+
+
+def evict_session(session_dir: Path, segments: SegmentStore | None = None) -> int:
+    """
+    Poora session + aliases + history search entries + HTTP cache + segment refs.
+    Returns: reclaimed segments
+    """
+    # koi writer beech mein ho toh uske khatam hone ka wait. Lock ke andar sirf rename -
+    # held lock wali dir kabhi rmtree nahi hoti
+    with session_lock(session_dir):
+        move_to_trash(session_dir)
+    empty_trash()
+    remove_aliases(session_dir.name)
+    HistoryIndex().remove_session(session_dir.name)
+    remove_session_cache(session_dir.name)
+
+    # shared segments jinka ab koi session user nahi hai (adhoori ingestion ke pending bhi)
+    segments = segments or SegmentStore()
+    return segments.release_session(session_dir.name) + segments.release_pending(
+        session_dir.name
+    )
+
+
+@dataclass
+class GcResult:
+    evicted: List[SessionFootprint]
+    before: int
+    after: int
+    reclaimed_segments: int
+    # hataye gaye abandoned ingestion folders
+    removed_ingests: List[StaleIngest] = field(default_factory=list)
+
+    @property
+    def freed(self) -> int:
+        return max(0, self.before - self.after)
+
+
+def run_gc(plan: GcPlan, segments: SegmentStore | None = None) -> GcResult:
+    if not plan.evict and not plan.garbage:
+        return GcResult([], plan.total, plan.total, 0)
+
+    segments = segments or SegmentStore()
+    reclaimed = 0
+
+    # dobara scan: plan ke baad resume / shuru hui ingestion na hate, na uske segments
+    cutoff = time.time() - STALE_INGEST_DAYS * DAY
+    stale_now, live = _scan_ingests(segments, cutoff)
+    planned = {stale.session_dir for stale in plan.stale}
+    removed = [stale for stale in stale_now if stale.session_dir in planned]
+
+    for stale in removed:
+        reclaimed += evict_session(stale.session_dir, segments)
+
+    for footprint in plan.evict:
+        if plan.mode == "delete":
+            reclaimed += evict_session(footprint.session_dir, segments)
+        else:
+            reclaimed += compact_session(footprint.session_dir)
+
+    reclaimed += segments.sweep(live, since=cutoff)
+
+    if reclaimed:
+        segments.vacuum()
+
+    after = sum(storage_usage(segments).values())
+    return GcResult(plan.evict, plan.total, after, reclaimed, removed)
+
+
+def _auto_gc_due() -> bool:
+    try:
+        return time.time() - AUTO_GC_STAMP.stat().st_mtime >= AUTO_GC_INTERVAL
+    except FileNotFoundError:
+        return True
+
+
+def auto_gc(exclude: Iterable[str] = ()) -> Optional[GcResult]:
+    """
+    config mein auto_gc + storage_budget_mb set ho toh compact-mode gc,
+    AUTO_GC_INTERVAL mein zyada se zyada ek baar. Kuch evict nahi hua (ya skip) toh None
+    """
+    config = load_config()
+    if not config or not config.auto_gc or not config.storage_budget_mb:
+        return None
+
+    if not _auto_gc_due():
+        return None
+
+    # plan bhi lock ke andar - dusre gc ke aadhe kaam par plan nahi banta
+    segments = SegmentStore()
+    with file_lock(GC_LOCK_PATH):
+        # lock ka wait karte hue dusre terminal ne abhi chala diya
+        if not _auto_gc_due():
+            return None
+        plan = plan_gc(config.storage_budget_mb * MB, exclude=exclude, segments=segments)
+        result = run_gc(plan, segments)
+        AUTO_GC_STAMP.touch()
+
+    # sirf kachra saaf hua toh chup-chaap (message sirf evicted sessions ka)
+    return result if result.evicted else None
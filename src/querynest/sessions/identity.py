@@ -0,0 +1,143 @@
+"""
+This file :
+- Source se session id resolve karna
+- Do identity modes:
+    "source"  → purana behaviour, source string ka hash (default)
+    "content" → PDF file hash / directory Merkle hash se id
+- Path → session id aliases alag file (~/.querynest/aliases.json) mein store karna
+
+Alias sirf committed session ke liye save hota hai (resolve kabhi save nahi karta),
+taaki fail hui ingest ya dry run ka alias kisi non-existent session ko point na kare.
+
+Alias ke saath file ka stat fingerprint (size + mtime) bhi rehta hai.
+Jab tak fingerprint same hai, dubara hashing nahi hoti → resume instant.
+Corpus move / copy ho toh alias miss hoga, content hash same aayega → wahi session resume.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from querynest.storage.atomic import atomic_write_json, file_lock
+from querynest.utils.hashing import (
+    generate_content_session_id,
+    generate_session_id,
+    list_pdf_files,
+)
+from querynest.utils.paths import ALIASES_PATH
+
+IDENTITY_MODES = ("source", "content")
+
+
+def _alias_key(path: str) -> str:
+    # case-sensitive absolute path (Linux paths sirf case mein alag ho sakte hain)
+    return str(Path(path).expanduser().resolve())
+
+
+def source_fingerprint(path: Path) -> str:
+    """
+    Sasta change-detector: size + mtime (directory ke liye saare PDFs ka)
+    """
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for pdf in list_pdf_files(path):
+            stat = pdf.stat()
+            digest.update(f"{pdf.relative_to(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_aliases() -> dict:
+    if not ALIASES_PATH.exists():
+        return {}
+
+    with open(ALIASES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_aliases(aliases: dict):
+    atomic_write_json(ALIASES_PATH, aliases, indent=2)
+
+
+def _aliases_lock():
+    # read-modify-write do processes mein saath ho toh ek ka alias gum na ho
+    return file_lock(ALIASES_PATH.with_suffix(".lock"))
+
+
+def lookup_alias(path: str) -> str | None:
+    """
+    Path ka alias valid ho (file change nahi hui) toh session id, warna None
+    """
+    input_path = Path(path).expanduser()
+    if not input_path.exists():
+        return None
+
+    entry = load_aliases().get(_alias_key(path))
+    if not entry:
+        return None
+
+    if entry.get("fingerprint") != source_fingerprint(input_path):
+        return None
+
+    return entry["session_id"]
+
+
+def save_alias(path: str, session_id: str):
+    input_path = Path(path).expanduser()
+    if not input_path.exists():
+        return
+
+    entry = {
+        "session_id": session_id,
+        "fingerprint": source_fingerprint(input_path),
+    }
+    with _aliases_lock():
+        aliases = load_aliases()
+        aliases[_alias_key(path)] = entry
+        _save_aliases(aliases)
+
+
+def remove_aliases(session_id: str) -> int:
+    """
+    Session delete hone par uske saare aliases hata deta hai
+    """
+    with _aliases_lock():
+        aliases = load_aliases()
+        remaining = {k: v for k, v in aliases.items() if v.get("session_id") != session_id}
+
+        removed = len(aliases) - len(remaining)
+        if removed:
+            _save_aliases(remaining)
+    return removed
+
+
+def resolve_session_id(source: str, source_type: str, identity: str = "source") -> str:
+    """
+    source_type "pdf" ke liye:
+    1. valid alias mila → wahi session id (koi hashing nahi)
+    2. identity == "content" → content hash se id
+    3. warna purana source-string hash
+
+    Web sources hamesha source-string hash use karte hain.
+
+    Koi side effect nahi (dry runs bhi isse call karte hain) - alias caller
+    save_alias se tab save kare jab session ka meta commit ho jaaye.
+    """
+    if identity not in IDENTITY_MODES:
+        raise ValueError(
+            f"Unknown identity mode: {identity} (choose from {', '.join(IDENTITY_MODES)})"
+        )
+
+    if source_type != "pdf":
+        return generate_session_id(source)
+
+    alias = lookup_alias(source)
+    if alias:
+        return alias
+
+    if identity == "content" and Path(source).expanduser().exists():
+        return generate_content_session_id(source)
+
+    return generate_session_id(source)
@@ -2,13 +2,170 @@
 This file :
 - Session metadata ka structure define karna
 - meta.json read/write handle karna
+  (atomic writes; read-modify-write session lock ke andar - update_session_meta)
 """
 
 from datetime import datetime, timezone
 from pathlib import Path
-from pydantic import BaseModel
+from typing import Callable, Dict, Optional
+from pydantic import BaseModel, Field
 import json
 
+from querynest.storage.atomic import atomic_write_json, session_lock
+
+# ye options badle toh index dobara banana padta hai; baaki (rescore, adaptive k...)
+# sirf retrieval ke hain - meta mein update ho jaate hain
+INDEX_OPTIONS = (
+    "extractor",
+    "splitter",
+    "chunk_size",
+    "chunk_overlap",
+    "max_tokens",
+    "dedup",
+    "dedup_max_distance",
+    "dedup_mode",
+    "parent_child",
+    "child_chunk_size",
+    "child_chunk_overlap",
+    "precision",
+    "shard_size",
+)
+
+
+class SessionOptions(BaseModel):
+    """
+    Per-session ingestion settings.
+    Purane meta.json mein ye nahi hote, isliye sab ke defaults hain.
+    """
+
+    # session id kaise bana: "source" (path/URL string) / "content" (file / directory hash)
+    identity: str = "source"
+
+    # web pages ke liye HTML extraction engine ("readability" / "fast")
+    extractor: str = "readability"
+
+    # chunking ("recursive" = LangChain, "fast" = native offsets splitter)
+    splitter: str = "recursive"
+    chunk_size: int = 1500
+    chunk_overlap: int = 300
+    # sirf "fast" splitter ke liye - per chunk token limit
+    max_tokens: Optional[int] = None
+
+    # near-duplicate chunk elimination (headers, footers, nav text etc.) - lossy, isliye opt-in
+    dedup: bool = False
+    # SimHash bits ka max difference jisko duplicate maana jaaye (0 = sirf exact)
+    dedup_max_distance: int = 3
+    # "drop" / "collapse"
+    dedup_mode: str = "drop"
+
+    # parent-child index: chhote child chunks embed / search hote hain,
+    # prompt mein unka parent chunk (chunk_size wala) jaata hai
+    parent_child: bool = False
+    child_chunk_size: int = 400
+    child_chunk_overlap: int = 80
+
+    # vector storage precision ("float32" / "float16" / "int8" / "pq")
+    precision: str = "float32"
+    # 0 = ek index; warna har shard mein max itne chunks (parallel build + search)
+    shard_size: int = 0
+    # two-stage retrieval: bada candidate set, phir full-precision vectors + lexical overlap se re-score
+    rescore: bool = False
+    rescore_candidates: int = 200
+    lexical_weight: float = 0.3
+
+    # adaptive k: min_k..max_k chunks, similarity threshold / score gap par cutoff (0 = off)
+    adaptive_k: bool = False
+    min_k: int = 2
+    max_k: int = 8
+    score_threshold: float = 0.0
+    score_gap: float = 0.1
+
+    def index_settings(self) -> dict:
+        """
+        Sirf wo options jinse index ka content / session id banta hai
+        (ingest checkpoint inhi ko compare karta hai)
+        """
+        return {"identity": self.identity, **{o: getattr(self, o) for o in INDEX_OPTIONS}}
+
+
+class SessionUsage(BaseModel):
+    """
+    Token usage (aggregate). Ingestion, refresh aur har chat turn ke baad add hota hai.
+    Token counts provider ke usage metadata se, warna local estimate (utils/tokens.py)
+    """
+
+    # embedding provider ko bheje gaye texts (segment store hits count nahi hote)
+    embed_calls: int = 0
+    embed_texts: int = 0
+    embed_tokens: int = 0
+
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # sabse bada single prompt (oversized context pakadne ke liye)
+    max_prompt_tokens: int = 0
+
+    turns: int = 0
+    # kitni baar documents embed hue (new session + refresh)
+    ingestions: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.embed_tokens + self.prompt_tokens + self.completion_tokens
+
+    def merge(self, other: "SessionUsage"):
+        for field in type(self).model_fields:
+            if field == "max_prompt_tokens":
+                self.max_prompt_tokens = max(self.max_prompt_tokens, other.max_prompt_tokens)
+            else:
+                setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+class BuildStats(BaseModel):
+    """
+    Session ke last index build (ingest / restore / rechunk / import / index) ki stats.
+    Purane sessions mein nahi hoti (meta.build = None)
+    """
+
+    built_at: str
+    # kis command ne banaya: "ingest" / "restore" / "rechunk" / "import" / "index" / "refresh"
+    kind: str = "ingest"
+
+    # loaded documents (PDF pages / web pages); checkpoint / archive se bane ho toh pichli value
+    pages: int = 0
+    # index mein chunks (parent-child: children) + unke parents
+    chunks: int = 0
+    parents: int = 0
+    # segment store mein nahi mile, isliye provider se embed hue
+    embedded: int = 0
+
+    embedding_model: str = ""
+    dim: int = 0
+    # faiss index class + precision (sharded: shards × class)
+    index_type: str = ""
+    # session folder + sirf isi session ke segments (build ke waqt)
+    disk_bytes: int = 0
+
+    # stage → seconds (load, split, embed, index, save; import: load, segments, index, save)
+    stages: Dict[str, float] = Field(default_factory=dict)
+
+    # PDF sources: build ke waqt files ka size + mtime fingerprint (identity.source_fingerprint) -
+    # querynest index isi se up-to-date sources skip karta hai. Web / import: None
+    source_fingerprint: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.stages.values())
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    @property
+    def embed_per_second(self) -> float:
+        embed = self.stages.get("embed", 0.0)
+        return self.embedded / embed if embed and self.embedded else 0.0
+
 
 class SessionMeta(BaseModel):
     id: str
@@ -17,6 +174,11 @@ class SessionMeta(BaseModel):
     source_type: str
     created_at: str
     last_used_at: str
+    # sessions gc ne index hataya (chunk text rakha) - agli chat par re-embed hota hai
+    compacted_at: Optional[str] = None
+    options: SessionOptions = Field(default_factory=SessionOptions)
+    usage: SessionUsage = Field(default_factory=SessionUsage)
+    build: Optional[BuildStats] = None
 
     @staticmethod
     def now() -> str:
@@ -26,8 +188,8 @@ class SessionMeta(BaseModel):
 
 def save_session_meta(session_dir: Path, meta: SessionMeta):
     meta_path = session_dir / "meta.json"
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta.model_dump(), f, indent=2)
+    with session_lock(session_dir):
+        atomic_write_json(meta_path, meta.model_dump(), indent=2)
 
 
 def load_session_meta(session_dir: Path) -> SessionMeta | None:
@@ -37,3 +199,21 @@ def load_session_meta(session_dir: Path) -> SessionMeta | None:
 
     with open(meta_path, "r", encoding="utf-8") as f:
         return SessionMeta(**json.load(f))
+
+
+def update_session_meta(
+    session_dir: Path, update: Callable[[SessionMeta], None]
+) -> SessionMeta | None:
+    """
+    Lock ke andar disk se fresh meta padh ke `update` apply karke save karta hai,
+    taaki dusre terminal ke changes (usage, rename...) overwrite na ho.
+    meta.json na ho toh None
+    """
+    with session_lock(session_dir):
+        meta = load_session_meta(session_dir)
+        if meta is None:
+            return None
+
+        update(meta)
+        save_session_meta(session_dir, meta)
+        return meta
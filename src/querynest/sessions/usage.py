@@ -0,0 +1,107 @@
+"""
+This file :
+- Process-wide token meter (embedding input, prompt, completion tokens)
+- Embedding wrapper aur RAG chain har call par yahan record karte hain
+- commit_usage() meter ko drain karke session ke meta.json mein aggregate karta hai
+  aur ek per-turn / per-ingestion record usage.jsonl mein append karta hai
+
+Cost sirf estimate hai (list prices neeche), asli billing provider dashboard par.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from querynest.sessions.session_meta import (
+    SessionMeta,
+    SessionUsage,
+    save_session_meta,
+    update_session_meta,
+)
+from querynest.storage.atomic import session_lock
+
+USAGE_LOG_FILE = "usage.jsonl"
+
+# USD per 1M tokens (gemini-2.5-flash text input / output, paid-tier embedding input)
+PRICES_PER_MILLION = {
+    "embed": 0.15,
+    "prompt": 0.30,
+    "completion": 2.50,
+}
+
+
+def estimate_cost(usage: SessionUsage) -> float:
+    return (
+        usage.embed_tokens * PRICES_PER_MILLION["embed"]
+        + usage.prompt_tokens * PRICES_PER_MILLION["prompt"]
+        + usage.completion_tokens * PRICES_PER_MILLION["completion"]
+    ) / 1_000_000
+
+
+class UsageMeter:
+    """
+    Thread-safe counters (RunnableParallel retrieval alag thread mein chalta hai)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage = SessionUsage()
+
+    def record_embedding(self, texts: int, tokens: int):
+        with self._lock:
+            self._usage.embed_calls += 1
+            self._usage.embed_texts += texts
+            self._usage.embed_tokens += tokens
+
+    def record_llm(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self._usage.llm_calls += 1
+            self._usage.prompt_tokens += prompt_tokens
+            self._usage.completion_tokens += completion_tokens
+            self._usage.max_prompt_tokens = max(self._usage.max_prompt_tokens, prompt_tokens)
+
+    def drain(self) -> SessionUsage:
+        """
+        Ab tak ka usage return karke counters reset
+        """
+        with self._lock:
+            usage, self._usage = self._usage, SessionUsage()
+        return usage
+
+
+meter = UsageMeter()
+
+
+def commit_usage(session_dir: Path, meta: SessionMeta | None, kind: str) -> SessionUsage:
+    """
+    kind: "turn" / "ingest" / "refresh" / "rechunk" / "restore" / "summary" / "index"
+    ("index" = querynest index ne existing session rebuild kiya)
+    ("summary" = chat band hone par summary memory ke background fold ka bacha usage)
+    Meter drain karke meta.usage mein add + save, aur usage.jsonl mein record
+    """
+    usage = meter.drain()
+    if kind == "turn":
+        usage.turns = 1
+    elif kind == "ingest" or usage.embed_calls:
+        usage.ingestions = 1
+
+    with session_lock(session_dir):
+        if meta is not None:
+            if kind == "ingest":
+                # naya session - yahi meta pehli baar save hota hai
+                meta.usage.merge(usage)
+                save_session_meta(session_dir, meta)
+            else:
+                # dusre terminal ka usage bhi disk par ho sakta hai - usi mein add karo
+                fresh = update_session_meta(session_dir, lambda m: m.usage.merge(usage))
+                if fresh is not None:
+                    meta.usage = fresh.usage
+
+        if usage.total_tokens or usage.turns:
+            record = {"at": SessionMeta.now(), "kind": kind, **usage.model_dump()}
+            record.pop("turns")
+            record.pop("ingestions")
+            with open(session_dir / USAGE_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    return usage
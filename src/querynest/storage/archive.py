@@ -0,0 +1,169 @@
+"""
+This file :
+- Single-file session archive ka format (sessions export / import)
+- Layout (little-endian):
+    "QNSESSN\\0"          8 bytes magic
+    header length        uint64
+    header               JSON - versioned manifest (session meta, model, sections ki table)
+    padding              pehla section 64-byte aligned offset par
+    sections             har section 64-byte aligned, offsets data start se relative
+- Raw sections (vectors, chunk text offsets, faiss indexes) uncompressed hain -
+  np.memmap seedha archive file se map karta hai, koi copy / parse nahi
+- Blob sections (chunk text, metadata, chat history) compressed:
+  zstandard installed ho toh zstd, warna gzip (codec header mein likha hota hai)
+
+Pickle kahin nahi - sirf JSON + raw arrays, isliye dusre version / machine ka archive
+padhna safe hai. Reader naye ARCHIVE_VERSION wala archive nahi kholta.
+"""
+
+import gzip
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # optional - gzip fallback
+    zstandard = None
+
+MAGIC = b"QNSESSN\0"
+ARCHIVE_VERSION = 1
+ALIGN = 64
+
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _compress(data: bytes) -> Tuple[str, bytes]:
+    if zstandard:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive is zstd-compressed - install 'zstandard' to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise RuntimeError(f"Unknown archive codec '{codec}'")
+
+
+class ArchiveWriter:
+    def __init__(self):
+        # name → (section info, payload)
+        self._sections: Dict[str, Tuple[dict, Union[bytes, np.ndarray]]] = {}
+
+    def add_array(self, name: str, array: np.ndarray):
+        """
+        Raw, aligned - reader isko mmap karta hai
+        """
+        array = np.ascontiguousarray(array)
+        info = {"kind": "array", "dtype": array.dtype.str, "shape": list(array.shape)}
+        self._sections[name] = (info, array)
+
+    def add_blob(self, name: str, data: bytes):
+        codec, payload = _compress(data)
+        self._sections[name] = ({"kind": "blob", "codec": codec}, payload)
+
+    def write(self, path: Path, header: dict) -> int:
+        """
+        tmp file mein likh ke rename (aadha archive kabhi final naam par nahi dikhta).
+        Returns: archive size (bytes)
+        """
+        offset = 0
+        table = {}
+        for name, (info, payload) in self._sections.items():
+            offset = _aligned(offset)
+            length = payload.nbytes if isinstance(payload, np.ndarray) else len(payload)
+            table[name] = {**info, "offset": offset, "length": length}
+            offset += length
+
+        header = {**header, "version": ARCHIVE_VERSION, "sections": table}
+        encoded = json.dumps(header, default=str).encode("utf-8")
+        data_start = _aligned(_PREFIX.size + len(encoded))
+
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_PREFIX.pack(MAGIC, len(encoded)))
+                f.write(encoded)
+                for name, (_, payload) in self._sections.items():
+                    f.seek(data_start + table[name]["offset"])
+                    # contiguous array ka buffer seedha (poore matrix ki copy nahi)
+                    f.write(payload.data if isinstance(payload, np.ndarray) else payload)
+                f.truncate(data_start + offset)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        return data_start + offset
+
+
+class SessionArchive:
+    """
+    Archive reader - header turant, sections maangne par (arrays mmap se)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size:
+                raise ValueError(f"{self.path} is not a QueryNest session archive")
+            magic, length = _PREFIX.unpack(prefix)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a QueryNest session archive")
+            self.header: dict = json.loads(f.read(length).decode("utf-8"))
+
+        if self.header.get("version", 0) > ARCHIVE_VERSION:
+            raise ValueError(
+                f"Archive was written by a newer QueryNest (archive version {self.header['version']})"
+            )
+
+        self.sections: Dict[str, dict] = self.header["sections"]
+        self._data_start = _aligned(_PREFIX.size + length)
+
+    def has(self, name: str) -> bool:
+        return name in self.sections
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Read-only np.memmap, archive file ke andar se
+        """
+        info = self.sections[name]
+        if info["kind"] != "array":
+            raise ValueError(f"Archive section '{name}' is not an array")
+
+        shape = tuple(info["shape"])
+        if info["length"] == 0:
+            return np.empty(shape, dtype=np.dtype(info["dtype"]))
+        return np.memmap(
+            self.path,
+            dtype=np.dtype(info["dtype"]),
+            mode="r",
+            offset=self._data_start + info["offset"],
+            shape=shape,
+        )
+
+    def blob(self, name: str) -> bytes:
+        info = self.sections[name]
+        if info["kind"] != "blob":
+            raise ValueError(f"Archive section '{name}' is not a blob")
+
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start + info["offset"])
+            data = f.read(info["length"])
+        return _decompress(info["codec"], data)
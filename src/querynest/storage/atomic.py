@@ -0,0 +1,114 @@
+"""
+This file :
+- Crash-safe + multi-process-safe file writes
+- atomic_write_* → same folder mein temp file, fsync, phir os.replace
+  (reader ko ya toh purani file dikhegi ya poori nayi - aadhi likhi kabhi nahi)
+- file_lock → advisory exclusive lock (sirf writers lete hain;
+  readers lock nahi lete, isliye writer ke wajah se kabhi block nahi hote)
+
+Read-modify-write (meta.json, chat.json, aliases.json) hamesha lock ke andar
+disk se fresh padh ke hota hai, taaki do terminals ek dusre ke changes overwrite na karein.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = ".lock"
+
+# same thread mein nested file_lock(path) deadlock na ho (flock per open file hota hai)
+_held = threading.local()
+
+
+def _fsync_dir(directory: Path):
+    # rename ko durable banane ke liye (Windows par directory open nahi hoti)
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    _fsync_dir(path.parent)
+
+
+def atomic_write_text(path: Path, text: str):
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_json(path: Path, data: Any, **kwargs):
+    atomic_write_text(path, json.dumps(data, **kwargs))
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Exclusive advisory lock (process crash hone par OS khud release kar deta hai).
+    Same thread mein re-entrant hai
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    key = str(path.resolve())
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = {}
+
+    if held.get(key):
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            held[key] = 0
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def session_lock(session_dir: Path):
+    """
+    Ek session ke saare writers (index, meta, chat, usage) isi lock se serialize hote hain
+    """
+    return file_lock(Path(session_dir) / LOCK_FILE)
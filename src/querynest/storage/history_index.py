@@ -0,0 +1,266 @@
+"""
+This file :
+- Saare sessions ki chat history ka full-text index (history search)
+- Har message append hote hi yahan bhi insert hota hai (ChatMemory) - search ke waqt
+  koi chat.json nahi khulta. chat.json sirf recent window rakhta hai, index poori history
+- SQLite FTS5 (porter stemming) + bm25 ranking; sqlite FTS5 ke bina build hua ho toh
+  plain LIKE scan (saare terms wale messages, naye pehle)
+- Purane sessions (index banne se pehle ke chat.json) ek hi baar seed hote hain -
+  session pehli baar khulne par ya pehle search par
+
+~/.querynest/history.db (SQLite, WAL mode - multiple terminals safe)
+"""
+
+import json
+import re
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from querynest.utils.paths import HISTORY_DB_PATH, SESSIONS_DIR
+
+# snippet mein match ke aas-paas ke markers (CLI inko highlight mein badalta hai)
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# snippet mein kitne tokens
+_SNIPPET_TOKENS = 16
+
+_TERM_RE = re.compile(r"(\w+)(\*?)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    at TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id);
+CREATE TABLE IF NOT EXISTS indexed_sessions (
+    session_id TEXT PRIMARY KEY
+);
+"""
+
+# external content table - text messages table mein ek hi baar, FTS sirf index rakhta hai
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+
+@dataclass
+class HistoryHit:
+    session_id: str
+    role: str
+    at: str
+    # match ke aas-paas ka text, matches MATCH_START / MATCH_END ke beech
+    snippet: str
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _terms(query: str) -> List[tuple]:
+    """
+    (term, prefix?) - "embed*" → prefix match
+    """
+    return [(term, bool(star)) for term, star in _TERM_RE.findall(query)]
+
+
+def _match_expression(terms: List[tuple]) -> str:
+    """
+    Har term quoted (user ke text mein FTS5 operators / syntax errors nahi), sab required
+    """
+    return " ".join(f'"{term}"' + ("*" if prefix else "") for term, prefix in terms)
+
+
+def _like_snippet(content: str, terms: List[tuple]) -> str:
+    """
+    FTS5 ke bina: pehle match ke aas-paas ke words, saare terms marked
+    """
+    pattern = re.compile(
+        "|".join(re.escape(term) + (r"\w*" if prefix else "") for term, prefix in terms),
+        re.IGNORECASE,
+    )
+    words = content.split()
+    first = next((i for i, word in enumerate(words) if pattern.search(word)), 0)
+    start = max(0, first - _SNIPPET_TOKENS // 2)
+    window = " ".join(words[start : start + _SNIPPET_TOKENS])
+
+    marked = pattern.sub(lambda m: f"{MATCH_START}{m.group(0)}{MATCH_END}", window)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + _SNIPPET_TOKENS < len(words) else ""
+    return f"{prefix}{marked}{suffix}"
+
+
+class HistoryIndex:
+    def __init__(self, db_path: Path = HISTORY_DB_PATH):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                # sqlite bina FTS5 ke compile hua hai
+                self.fts = False
+
+    @contextmanager
+    def _connect(self):
+        # har operation ka apna connection - threads / processes dono ke liye safe
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Writes
+
+    def add(self, session_id: str, role: str, content: str, at: Optional[str] = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (session_id, role, at, content) VALUES (?, ?, ?, ?)",
+                (session_id, role, at or _now(), content),
+            )
+
+    def seed_session(self, session_id: str, chat_path: Path) -> bool:
+        """
+        Index banne se pehle ki history (chat.json) ek hi baar seed karta hai.
+        chat.json mein per-message time nahi hai - file ka mtime use hota hai.
+        Returns: abhi seed hua
+        """
+        with self._connect() as conn:
+            # do terminals ek saath seed na karein (duplicate messages)
+            conn.execute("BEGIN IMMEDIATE")
+            seeded = conn.execute(
+                "SELECT 1 FROM indexed_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if seeded:
+                return False
+
+            messages, at = [], _now()
+            if chat_path.exists():
+                with open(chat_path, "r", encoding="utf-8") as f:
+                    messages = json.load(f)
+                at = datetime.fromtimestamp(chat_path.stat().st_mtime, timezone.utc).isoformat()
+
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, at, content) VALUES (?, ?, ?, ?)",
+                [(session_id, msg["role"], at, msg["content"]) for msg in messages],
+            )
+            conn.execute("INSERT INTO indexed_sessions (session_id) VALUES (?)", (session_id,))
+            return True
+
+    def sync(self, sessions_dir: Path = SESSIONS_DIR) -> int:
+        """
+        Jo sessions abhi tak index nahi hue unki chat.json seed karo
+        (baaki sessions ki koi file nahi khulti). Returns: seeded sessions
+        """
+        if not sessions_dir.exists():
+            return 0
+
+        with self._connect() as conn:
+            indexed = {sid for (sid,) in conn.execute("SELECT session_id FROM indexed_sessions")}
+
+        seeded = 0
+        for session_dir in sessions_dir.iterdir():
+            chat_path = session_dir / "chat.json"
+            if session_dir.name not in indexed and chat_path.exists():
+                seeded += self.seed_session(session_dir.name, chat_path)
+
+        return seeded
+
+    def remove_session(self, session_id: str) -> int:
+        with self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (session_id,)
+            ).rowcount
+            conn.execute("DELETE FROM indexed_sessions WHERE session_id = ?", (session_id,))
+        return removed
+
+    # Reads
+
+    def search(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        role: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[HistoryHit]:
+        """
+        Saare terms wale messages, best match pehle (FTS5 bm25).
+        session_id: poora id ya prefix (tables mein chhota id dikhta hai).
+        Query mein koi word na ho toh ValueError
+        """
+        terms = _terms(query)
+        if not terms:
+            raise ValueError("Search query has no words")
+
+        filters, params = [], []
+        if session_id:
+            filters.append("m.session_id LIKE ?")
+            params.append(f"{session_id}%")
+        if role:
+            filters.append("m.role = ?")
+            params.append(role)
+
+        with self._connect() as conn:
+            if self.fts:
+                where = " AND ".join(["messages_fts MATCH ?"] + filters)
+                rows = conn.execute(
+                    "SELECT m.session_id, m.role, m.at, "
+                    f"snippet(messages_fts, 0, ?, ?, '…', {_SNIPPET_TOKENS}) "
+                    "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                    f"WHERE {where} ORDER BY bm25(messages_fts) LIMIT ?",
+                    [MATCH_START, MATCH_END, _match_expression(terms), *params, limit],
+                ).fetchall()
+                return [HistoryHit(*row) for row in rows]
+
+            where = " AND ".join(["m.content LIKE ?"] * len(terms) + filters)
+            rows = conn.execute(
+                "SELECT m.session_id, m.role, m.at, m.content FROM messages m "
+                f"WHERE {where} ORDER BY m.at DESC, m.id DESC LIMIT ?",
+                [*(f"%{term}%" for term, _ in terms), *params, limit],
+            ).fetchall()
+
+        return [
+            HistoryHit(sid, role_, at, _like_snippet(content, terms))
+            for sid, role_, at, content in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            messages, sessions = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT session_id) FROM messages"
+            ).fetchone()
+        return {"messages": messages, "sessions": sessions}
+
+    def disk_bytes(self) -> int:
+        """
+        db + WAL files ka asli size
+        """
+        return sum(
+            path.stat().st_size
+            for path in (
+                self.db_path,
+                self.db_path.with_name(self.db_path.name + "-wal"),
+                self.db_path.with_name(self.db_path.name + "-shm"),
+            )
+            if path.exists()
+        )
@@ -0,0 +1,95 @@
+"""
+This file :
+- Har session ka ek versioned manifest.json
+- Index ki har save ek nayi "generation" hai: files generation number ke naam se likhi jaati hain
+    segments-000007.json  (chunk store refs + metadata)
+    vectors-000007.faiss  (sirf compressed sessions)
+  aur aakhir mein manifest.json atomically replace hota hai jo inhe point karta hai
+- Reader pehle manifest padhta hai, phir usme likhi files → index, chunk refs aur
+  metadata hamesha ek hi generation ke hote hain (aadha likha / mixed state kabhi nahi)
+- Purani generations prune hoti hain, pichli ek rakhi jaati hai taaki
+  jo reader abhi use padh raha hai uske neeche se file gayab na ho
+- Sharded sessions (schema 2): files = {"shards": [stems]}; unchanged shards purani
+  generation ke naam se hi reuse hote hain, isliye shard files tab prune hoti hain
+  jab na current na pichla manifest unhe point kare
+
+Writers ko session_lock() ke andar commit karna chahiye.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from querynest.sessions.session_meta import SessionMeta
+from querynest.storage.atomic import atomic_write_json
+
+MANIFEST_FILE = "manifest.json"
+# 2 = sharded index (purane versions ise padh nahi sakte); unsharded abhi bhi 1 likhte hain
+MANIFEST_SCHEMA = 2
+
+# current + pichli generation disk par rehti hai
+KEEP_GENERATIONS = 2
+
+_GENERATION_RE = re.compile(r"^(segments|vectors)-(\d{6})\.(json|faiss)$")
+_SHARD_RE = re.compile(r"^(shard-\d{4}-\d{6})\.(json|faiss)$")
+
+
+def read_manifest(session_dir: Path) -> Optional[dict]:
+    path = Path(session_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("schema", 0) > MANIFEST_SCHEMA:
+        raise RuntimeError(
+            f"Session was written by a newer QueryNest (manifest schema {manifest['schema']})"
+        )
+    return manifest
+
+
+def next_generation(session_dir: Path) -> int:
+    manifest = read_manifest(session_dir)
+    return (manifest["generation"] + 1) if manifest else 1
+
+
+def generation_file(kind: str, generation: int) -> str:
+    suffix = "json" if kind == "segments" else "faiss"
+    return f"{kind}-{generation:06d}.{suffix}"
+
+
+def commit_manifest(session_dir: Path, generation: int, files: dict, **info) -> dict:
+    """
+    files: {"segments": name, "index": name ya None} ya {"shards": [stem, ...]}
+    Generation files pehle se likhi honi chahiye - ye sirf pointer flip karta hai
+    """
+    session_dir = Path(session_dir)
+    previous = read_manifest(session_dir)
+    manifest = {
+        "schema": 2 if "shards" in files else 1,
+        "generation": generation,
+        "updated_at": SessionMeta.now(),
+        "files": files,
+        **info,
+    }
+    atomic_write_json(session_dir / MANIFEST_FILE, manifest, indent=2)
+    _prune(session_dir, generation, [manifest, previous])
+    return manifest
+
+
+def _prune(session_dir: Path, generation: int, kept: list):
+    oldest_kept = generation - KEEP_GENERATIONS + 1
+    live_shards = {
+        stem for m in kept if m for stem in m["files"].get("shards", [])
+    }
+
+    for path in session_dir.iterdir():
+        match = _GENERATION_RE.match(path.name)
+        if match and int(match.group(2)) < oldest_kept:
+            path.unlink(missing_ok=True)
+
+        match = _SHARD_RE.match(path.name)
+        if match and match.group(1) not in live_shards:
+            path.unlink(missing_ok=True)
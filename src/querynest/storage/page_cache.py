@@ -0,0 +1,119 @@
+"""
+This file :
+- PDFs ka parsed page text disk par cache karna (PDF parsing sabse slow step hai)
+- Key = PDF file ke bytes ka sha256 → same file kahin bhi ho / kisi bhi session mein,
+  dobara parse nahi hoti
+- Har file ek compressed JSONL: ek line = ek page (page number + text + metadata)
+
+~/.querynest/pages/<sha256(file)>.jsonl.zst   (zstandard installed ho toh)
+~/.querynest/pages/<sha256(file)>.jsonl.gz    (warna stdlib gzip)
+
+"source" metadata cache mein nahi rehta - load ke time current path lagta hai,
+isliye moved / copied files bhi hit karti hain.
+Session delete / gc is cache ko nahi chhoote (rechunk ke liye zaroori hai).
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from langchain_core.documents import Document
+
+from querynest.storage.atomic import atomic_write_bytes
+from querynest.utils.paths import PAGES_DIR
+
+try:
+    import zstandard
+except ImportError:  # optional - gzip fallback
+    zstandard = None
+
+# padhne mein dono chalte hain (cache dusre install ne likha ho sakta hai)
+_CODECS = (".jsonl.zst", ".jsonl.gz")
+
+
+def _suffix() -> str:
+    return ".jsonl.zst" if zstandard else ".jsonl.gz"
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(path: Path) -> Optional[bytes]:
+    raw = path.read_bytes()
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            return None
+        return zstandard.ZstdDecompressor().decompress(raw)
+    return gzip.decompress(raw)
+
+
+def cached_path(file_hash: str) -> Optional[Path]:
+    for suffix in _CODECS:
+        path = PAGES_DIR / f"{file_hash}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def load_pages(file_hash: str, source: str) -> Optional[List[Document]]:
+    """
+    Cache hit → pages (source = current path), miss / unreadable → None
+    """
+    path = cached_path(file_hash)
+    if path is None:
+        return None
+
+    try:
+        data = _decompress(path)
+    except Exception:
+        # corrupt / aadhi file → miss maan ke dubara parse
+        return None
+    if data is None:
+        return None
+
+    documents = []
+    for line in data.decode("utf-8").splitlines():
+        if not line:
+            continue
+        record = json.loads(line)
+        documents.append(
+            Document(
+                page_content=record["text"],
+                metadata={**record["metadata"], "source": source, "page": record["page"]},
+            )
+        )
+    return documents
+
+
+def save_pages(file_hash: str, documents: List[Document]):
+    lines = []
+    for position, doc in enumerate(documents):
+        metadata = {k: v for k, v in doc.metadata.items() if k not in ("source", "page")}
+        lines.append(
+            json.dumps(
+                {
+                    "page": doc.metadata.get("page", position),
+                    "text": doc.page_content,
+                    "metadata": metadata,
+                },
+                default=str,
+            )
+        )
+
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    atomic_write_bytes(PAGES_DIR / f"{file_hash}{_suffix()}", _compress(data))
+
+
+def cache_size() -> tuple[int, int]:
+    """
+    (files, bytes) - sessions info / gc reports ke liye
+    """
+    if not PAGES_DIR.exists():
+        return 0, 0
+
+    files = [p for p in PAGES_DIR.iterdir() if p.name.endswith(_CODECS)]
+    return len(files), sum(p.stat().st_size for p in files)
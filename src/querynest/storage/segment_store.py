@@ -0,0 +1,407 @@
+"""
+This file :
+- Sab sessions ke beech shared, content-addressed segment store
+- Ek "segment" = ek chunk ka text + uska embedding vector
+- Segment key = sha256(embedding model + text), isliye same chunk
+  chahe kitne bhi sessions mein ho, text + vector sirf EK baar store hota hai
+- Sessions sirf segment keys ke references rakhte hain (reference counting ke saath)
+  taaki session delete hone par unreferenced segments reclaim ho sake
+- Ingestion ke dauraan embed hue batches (session save se pehle, refcount 0)
+  pending_refs mein us session ke naam rehte hain: checkpoint.clear() / save unhe
+  release karta hai, aur gc abandoned ingestions ke pending refs sweep karta hai
+
+~/.querynest/segments/segments.db (SQLite, WAL mode - multiple terminals safe)
+"""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from querynest.utils.paths import SEGMENTS_DB_PATH
+
+# SQLite ke "IN (?, ?, ...)" variables ki limit se neeche
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    hash TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    refcount INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS session_refs (
+    session_id TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (session_id, hash)
+);
+CREATE INDEX IF NOT EXISTS idx_session_refs_hash ON session_refs(hash);
+CREATE TABLE IF NOT EXISTS pending_refs (
+    session_id TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, hash)
+);
+CREATE INDEX IF NOT EXISTS idx_pending_refs_hash ON pending_refs(hash);
+CREATE INDEX IF NOT EXISTS idx_segments_refcount ON segments(refcount);
+"""
+
+# refcount 0 segment tabhi reclaim jab koi ingestion use pending bhi na rakhe
+_RECLAIM = (
+    "DELETE FROM segments WHERE hash = ? AND refcount <= 0 "
+    "AND hash NOT IN (SELECT hash FROM pending_refs)"
+)
+
+
+def segment_hash(model: str, text: str) -> str:
+    """
+    Vectors model pe depend karte hain, isliye model bhi key ka part hai
+    """
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _batches(items: List[str]) -> Iterable[List[str]]:
+    for i in range(0, len(items), _BATCH):
+        yield items[i : i + _BATCH]
+
+
+class SegmentStore:
+    def __init__(self, db_path: Path = SEGMENTS_DB_PATH):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            # WAL: readers writer ka wait nahi karte (setting db file mein persist hoti hai)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # har operation ka apna connection - threads / processes dono ke liye safe
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Reads
+
+    def get_vectors(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Jo segments already stored hain unke vectors (missing wale result mein nahi honge)
+        """
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._connect() as conn:
+            for batch in _batches(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT hash, vector FROM segments WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def get_texts(self, hashes: List[str]) -> Dict[str, str]:
+        """
+        hash → text (vectors padhe bina - compressed sessions ke liye)
+        """
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._connect() as conn:
+            for batch in _batches(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT hash, text FROM segments WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                found.update(rows)
+
+        return found
+
+    def get_segments(self, hashes: List[str]) -> Dict[str, Tuple[str, np.ndarray]]:
+        """
+        hash → (text, vector)
+        """
+        found: Dict[str, Tuple[str, np.ndarray]] = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._connect() as conn:
+            for batch in _batches(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT hash, text, vector FROM segments WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                for h, text, blob in rows:
+                    found[h] = (text, np.frombuffer(blob, dtype=np.float32))
+
+        return found
+
+    # Writes
+
+    def put(
+        self, model: str, rows: Iterable[Tuple[str, str, np.ndarray]], owner: str | None = None
+    ):
+        """
+        rows: (hash, text, vector) - already present segments ignore hote hain
+        owner: session id - rows uske pending refs ban jaate hain (save / checkpoint.clear
+        tak), taaki abandoned ingestion ke segments gc pehchaan sake
+        """
+        payload = []
+        for h, text, vector in rows:
+            vec = np.asarray(vector, dtype=np.float32)
+            payload.append((h, model, text, vec.shape[0], vec.tobytes()))
+
+        if not payload:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO segments (hash, model, text, dim, vector) "
+                "VALUES (?, ?, ?, ?, ?)",
+                payload,
+            )
+            if owner:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pending_refs (session_id, hash, created_at) "
+                    "VALUES (?, ?, ?)",
+                    [(owner, h, now) for h, *_ in payload],
+                )
+
+    def hold(self, owner: str, hashes: List[str]):
+        """
+        Pehle se stored lekin unreferenced (refcount 0) segments bhi owner ke pending refs -
+        reuse hone wale segments ko gc sweep save se pehle na hataye.
+        Resume par purane pending refs ka time bhi naya ho jaata hai
+        """
+        now = time.time()
+        with self._connect() as conn:
+            for batch in _batches(list(dict.fromkeys(hashes))):
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(
+                    "INSERT OR REPLACE INTO pending_refs (session_id, hash, created_at) "
+                    f"SELECT ?, hash, ? FROM segments WHERE hash IN ({placeholders}) "
+                    "AND refcount <= 0",
+                    [owner, now, *batch],
+                )
+
+    def pending_sessions(self) -> Dict[str, float]:
+        """
+        session id → uske sabse naye pending ref ka time (gc: ingestion zinda hai ya nahi)
+        """
+        with self._connect() as conn:
+            return dict(
+                conn.execute("SELECT session_id, MAX(created_at) FROM pending_refs GROUP BY 1")
+            )
+
+    def release_pending(self, session_id: str) -> int:
+        """
+        Session ke pending refs hata deta hai (save ho gaya ya ingestion abandon hui).
+        Returns: kitne segments reclaim hue (na kisi session ke, na kisi aur ke pending)
+        """
+        with self._connect() as conn:
+            hashes = [
+                (h,)
+                for (h,) in conn.execute(
+                    "SELECT hash FROM pending_refs WHERE session_id = ?", (session_id,)
+                )
+            ]
+            conn.execute("DELETE FROM pending_refs WHERE session_id = ?", (session_id,))
+
+            reclaimed = 0
+            for row in hashes:
+                reclaimed += conn.execute(_RECLAIM, row).rowcount
+
+        return reclaimed
+
+    def add_session_refs(self, session_id: str, hashes: Iterable[str]):
+        """
+        Sirf naye references add karta hai (kuch drop nahi hota)
+        """
+        with self._connect() as conn:
+            current = {
+                h
+                for (h,) in conn.execute(
+                    "SELECT hash FROM session_refs WHERE session_id = ?", (session_id,)
+                )
+            }
+            added = list(set(hashes) - current)
+
+            conn.executemany(
+                "INSERT INTO session_refs (session_id, hash) VALUES (?, ?)",
+                [(session_id, h) for h in added],
+            )
+            conn.executemany(
+                "UPDATE segments SET refcount = refcount + 1 WHERE hash = ?",
+                [(h,) for h in added],
+            )
+
+    def set_session_refs(self, session_id: str, hashes: Iterable[str]):
+        """
+        Session ke references ko exactly `hashes` set bana deta hai
+        (naye refs add, purane hata ke refcount adjust)
+        """
+        wanted = set(hashes)
+
+        with self._connect() as conn:
+            current = {
+                h
+                for (h,) in conn.execute(
+                    "SELECT hash FROM session_refs WHERE session_id = ?", (session_id,)
+                )
+            }
+
+            added = list(wanted - current)
+            dropped = list(current - wanted)
+
+            conn.executemany(
+                "INSERT INTO session_refs (session_id, hash) VALUES (?, ?)",
+                [(session_id, h) for h in added],
+            )
+            conn.executemany(
+                "UPDATE segments SET refcount = refcount + 1 WHERE hash = ?",
+                [(h,) for h in added],
+            )
+
+            conn.executemany(
+                "DELETE FROM session_refs WHERE session_id = ? AND hash = ?",
+                [(session_id, h) for h in dropped],
+            )
+            conn.executemany(
+                "UPDATE segments SET refcount = refcount - 1 WHERE hash = ?",
+                [(h,) for h in dropped],
+            )
+
+            # sirf apne dropped segments reclaim karo - dusre process ke abhi-abhi
+            # put() kiye (refcount 0, pending) segments ko nahi chhedna
+            conn.executemany(_RECLAIM, [(h,) for h in dropped])
+
+    def release_session(self, session_id: str) -> int:
+        """
+        Session ke saare references hata deta hai.
+        Returns: kitne segments reclaim hue (jinka koi aur session user nahi tha)
+        """
+        with self._connect() as conn:
+            hashes = [
+                (h,)
+                for (h,) in conn.execute(
+                    "SELECT hash FROM session_refs WHERE session_id = ?", (session_id,)
+                )
+            ]
+
+            conn.executemany(
+                "UPDATE segments SET refcount = refcount - 1 WHERE hash = ?", hashes
+            )
+            conn.execute("DELETE FROM session_refs WHERE session_id = ?", (session_id,))
+
+            reclaimed = 0
+            for row in hashes:
+                reclaimed += conn.execute(_RECLAIM, row).rowcount
+
+        return reclaimed
+
+    @staticmethod
+    def _live_pending(keep: List[str], since: float) -> Tuple[str, list]:
+        # zinda pending refs: `keep` sessions ke, ya `since` ke baad ke (chal rahi ingestion)
+        placeholders = ",".join("?" * len(keep))
+        return f"(session_id IN ({placeholders}) OR created_at >= ?)", [*keep, since]
+
+    def orphan_bytes(self, keep: Iterable[str] = (), since: float = 0.0) -> int:
+        """
+        Kisi session ke refs nahi, aur kisi zinda ingestion ke pending bhi nahi -
+        abandoned ingestions / crashed refreshes ke segments (gc sweep inhe hatata hai)
+        """
+        live, params = self._live_pending(list(keep), since)
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(text) + LENGTH(vector)), 0) FROM segments "
+                f"WHERE refcount <= 0 AND hash NOT IN (SELECT hash FROM pending_refs WHERE {live})",
+                params,
+            ).fetchone()[0]
+
+    def sweep(self, keep: Iterable[str] = (), since: float = 0.0) -> int:
+        """
+        Purane pending refs (`keep` sessions ke alawa) drop, phir saare orphan segments delete.
+        put() segment + pending ek hi transaction mein likhta hai, isliye chal rahi
+        ingestion ka naya batch kabhi orphan nahi dikhta.
+        Returns: kitne segments reclaim hue
+        """
+        live, params = self._live_pending(list(keep), since)
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM pending_refs WHERE NOT {live}", params)
+            return conn.execute(
+                "DELETE FROM segments WHERE refcount <= 0 "
+                "AND hash NOT IN (SELECT hash FROM pending_refs)"
+            ).rowcount
+
+    def session_bytes(self, session_id: str) -> Tuple[int, int]:
+        """
+        (exclusive bytes, text bytes) - gc ka estimate:
+        exclusive = jin segments ka ye session akela user hai (release par reclaim honge),
+        text = session ke saare chunks ka text (compaction ke baad bhi rehta hai)
+        """
+        with self._connect() as conn:
+            exclusive, text = conn.execute(
+                "SELECT COALESCE(SUM(CASE WHEN s.refcount <= 1 "
+                "THEN LENGTH(s.text) + LENGTH(s.vector) ELSE 0 END), 0), "
+                "COALESCE(SUM(LENGTH(s.text)), 0) "
+                "FROM session_refs r JOIN segments s ON s.hash = r.hash "
+                "WHERE r.session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return exclusive, text
+
+    def disk_bytes(self) -> int:
+        """
+        db + WAL files ka asli size
+        """
+        return sum(
+            path.stat().st_size
+            for path in (
+                self.db_path,
+                self.db_path.with_name(self.db_path.name + "-wal"),
+                self.db_path.with_name(self.db_path.name + "-shm"),
+            )
+            if path.exists()
+        )
+
+    def vacuum(self):
+        """
+        Deleted segments ki jagah SQLite file mein hi free pages banke rehti hai -
+        VACUUM + WAL checkpoint ke baad hi disk par wapas milti hai (gc ke end mein)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            # VACUUM transaction ke andar nahi chal sakta (isliye _connect nahi)
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            segments, text_bytes, vector_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(text)), 0), "
+                "COALESCE(SUM(LENGTH(vector)), 0) FROM segments"
+            ).fetchone()
+            refs = conn.execute("SELECT COUNT(*) FROM session_refs").fetchone()[0]
+
+        return {
+            "segments": segments,
+            "references": refs,
+            "text_bytes": text_bytes,
+            "vector_bytes": vector_bytes,
+        }
@@ -4,9 +4,18 @@ This file:
 - ek deterministic session id banana jisse aage agr same web, pdf de toh session continue ho sake and we dont need to do ingestion, indexing steps again
 
 Same source → same session id
+
+Content identity ke liye:
+- hash_file      → file ke bytes ka sha256
+- hash_directory → directory ke PDFs ke file hashes se Merkle root
 """
 
 import hashlib
+from pathlib import Path
+from typing import List
+
+# 1 MB blocks mein padhte hain taaki badi PDFs memory mein poori load na ho
+_READ_BLOCK = 1 << 20
 
 
 def generate_session_id(source: str) -> str:
@@ -19,3 +28,66 @@ def generate_session_id(source: str) -> str:
     normalized = source.strip().lower()
     return hashlib.sha256(normalized.encode()).hexdigest()
 
+
+def hash_file(path: Path) -> str:
+    """
+    File content ka sha256 (hex)
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_READ_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def merkle_root(leaf_hashes: List[str]) -> str:
+    """
+    Sorted leaf hashes se binary Merkle tree ka root.
+    Order-independent hai (leaves pehle sort hote hain),
+    isliye same files ka set → same root
+    """
+    level = sorted(leaf_hashes)
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+
+    return level[0]
+
+
+def list_pdf_files(directory: Path) -> List[Path]:
+    """
+    Directory ke saare PDFs (wahi glob jo pdf loader use karta hai)
+    """
+    return sorted(p for p in directory.glob("**/*.pdf") if p.is_file())
+
+
+def hash_directory(directory: Path) -> str:
+    """
+    Directory ke PDFs ke content hashes ka Merkle root
+    """
+    return merkle_root([hash_file(p) for p in list_pdf_files(directory)])
+
+
+def generate_content_session_id(path: str) -> str:
+    """
+    PDF file / directory ke CONTENT se session id.
+    - same PDF do alag paths par → same session
+    - alag files (chahe path sirf case mein alag ho) → kabhi collide nahi
+    """
+    input_path = Path(path).expanduser()
+
+    if input_path.is_dir():
+        root = hash_directory(input_path)
+        kind = "pdf-dir"
+    else:
+        root = hash_file(input_path)
+        kind = "pdf-file"
+
+    return hashlib.sha256(f"{kind}:{root}".encode()).hexdigest()
@@ -4,10 +4,12 @@ this file will :
 - directories automatically create karna on start
 """
 
+import os
 from pathlib import Path
 
 # Base directory for QueryNest ie we will save it in user's home directory as a hidden folder .querynest
-BASE_DIR = Path.home() / ".querynest"
+# QUERYNEST_HOME se override ho sakta hai (benchmarks / isolated runs ke liye)
+BASE_DIR = Path(os.environ.get("QUERYNEST_HOME") or Path.home() / ".querynest")
 
 # Config file path ie config file that will save the api keys
 CONFIG_PATH = BASE_DIR / "config.json"
@@ -16,14 +18,37 @@ CONFIG_PATH = BASE_DIR / "config.json"
 # iska ye fayda hoga ki baar baar index nahi banana pdega ya page load nahi krna pdega 
 SESSIONS_DIR = BASE_DIR / "sessions"
 
+# Shared content-addressed segment store - chunk text + vectors sirf ek baar store hote hain,
+# sessions sirf references rakhte hain
+SEGMENTS_DIR = BASE_DIR / "segments"
+SEGMENTS_DB_PATH = SEGMENTS_DIR / "segments.db"
+
+# Saare sessions ki chat history ka full-text index (history search)
+HISTORY_DB_PATH = BASE_DIR / "history.db"
+
+# Source path → session id aliases (content-hash identity ke liye)
+ALIASES_PATH = BASE_DIR / "aliases.json"
+
+# PDFs ka parsed page text (file content hash se) - rechunk bina re-parse ke
+PAGES_DIR = BASE_DIR / "pages"
+
+# Raw HTTP responses (ETag / Last-Modified ke saath) taaki web sessions cheaply refresh ho sake
+HTTP_CACHE_DIR = BASE_DIR / "http_cache"
+
+# Delete ho rahe sessions (tombstones) - lock ke andar rename, rmtree lock ke bahar
+TRASH_DIR = BASE_DIR / "trash"
+
 
 def ensure_base_dirs():
     """
     Agar ~/.querynest ya sessions folder exist nahi karta
     toh automatically create kar de
     """
-    BASE_DIR.mkdir(exist_ok=True)
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
     SESSIONS_DIR.mkdir(exist_ok=True)
+    HTTP_CACHE_DIR.mkdir(exist_ok=True)
+    SEGMENTS_DIR.mkdir(exist_ok=True)
+    PAGES_DIR.mkdir(exist_ok=True)
 
 
 def get_session_dir(session_id: str) -> Path:
@@ -0,0 +1,30 @@
+"""
+This file :
+- Always-on stage timer - session build stats (SessionMeta.build) ke liye
+- Tracing (utils/tracing.py) sirf --profile par chalta hai; ye har ingestion mein,
+  sirf ek perf_counter pair per stage
+
+Usage:
+    timer = StageTimer()
+    with timer.stage("load"):
+        ...
+    timer.stages  # {"load": 1.23}
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StageTimer:
+    def __init__(self):
+        # stage → seconds (same stage dobara chale toh add hota hai)
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
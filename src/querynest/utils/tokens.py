@@ -0,0 +1,55 @@
+"""
+This file :
+- Token counting ek jagah (token-aware chunking, prompt budgets, metering)
+- tiktoken (cl100k_base) load ho sake toh wahi use hota hai
+- Warna (offline / BPE file download nahi hui) regex based estimate
+
+NOTE: Gemini ka exact tokenizer locally available nahi hai,
+isliye ye counts hamesha approximate hain - budgets aur reports ke liye kaafi hai
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+# words aur punctuation ko alag tokens maante hain (fallback estimate)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken pehli baar BPE file download karta hai - offline ho toh fail hoga
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def token_offsets(text: str) -> List[int]:
+    """
+    Har token ka starting character offset (sorted).
+    Isse kisi bhi [start, end) span ke tokens bisect se count ho jaate hain
+    """
+    if not text:
+        return []
+
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        _, offsets = encoding.decode_with_offsets(tokens)
+        return offsets
+
+    return [m.start() for m in _TOKEN_RE.finditer(text)]
@@ -0,0 +1,255 @@
+"""
+This file :
+- Lightweight span tracing (load, split, embed, index, retrieve, prompt, LLM)
+- Profiling off ho toh span() ek shared no-op object return karta hai
+  (ek global check, koi allocation / clock read nahi) → overhead negligible
+- Profiling on ho toh har root span (eg. ek chat turn) khatam hone par
+  us trace ke saare spans JSON lines file mein export hote hain
+
+Export format = OTLP/JSON (ExportTraceServiceRequest, ek line = ek trace),
+jise OpenTelemetry Collector ka `otlpjsonfile` receiver seedha padh sakta hai.
+
+Usage:
+    with span("index.build", chunks=len(chunks)) as s:
+        ...
+        s.set_attribute("precision", actual)
+"""
+
+import json
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SERVICE_NAME = "querynest"
+
+# chat --profile ka default export (session folder mein)
+TRACE_FILE = "traces.jsonl"
+
+_current: ContextVar[Optional["Span"]] = ContextVar("querynest_span", default=None)
+
+# None = profiling off
+_tracer: Optional["Tracer"] = None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = (
+        "tracer",
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self._token = None
+
+        parent = _current.get()
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        else:
+            self.trace_id = secrets.token_hex(16)
+            self.parent_id = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc_type is not None and not issubclass(exc_type, (KeyboardInterrupt, GeneratorExit)):
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+    # OTLP/JSON
+
+    def to_otlp(self) -> dict:
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        # OTLP/JSON mein int64 string ke roop mein jaata hai
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Tracer:
+    def __init__(self, export_path: Optional[Path] = None):
+        self.export_path = export_path
+        self._lock = threading.Lock()
+        # trace_id → finished spans (root khatam hone tak)
+        self._pending: Dict[str, List[Span]] = {}
+        self._listeners: List[Callable[[List[Span]], None]] = []
+
+    def on_trace(self, listener: Callable[[List[Span]], None]):
+        """
+        Har complete trace (root span khatam) ke spans listener ko milte hain
+        """
+        self._listeners.append(listener)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            spans = self._pending.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_id is not None:
+                return
+            del self._pending[span.trace_id]
+
+        spans.sort(key=lambda s: s.start_ns)
+        if self.export_path:
+            self._export(spans)
+        for listener in self._listeners:
+            listener(spans)
+
+    def _export(self, spans: List[Span]):
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SERVICE_NAME},
+                            "spans": [s.to_otlp() for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        self.export_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.export_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request, separators=(",", ":")) + "\n")
+
+
+def enable(export_path: Optional[Path] = None) -> Tracer:
+    global _tracer
+    _tracer = Tracer(export_path)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes):
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, attributes)
+
+
+def record(name: str, start_ns: int, end_ns: int, **attributes):
+    """
+    Already-measured interval ko current span ke child ki tarah record karta hai
+    (eg. LLM first token, jo stream ke beech mein pata chalta hai)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return
+
+    s = Span(tracer, name, attributes)
+    s.start_ns = start_ns
+    s.end_ns = end_ns
+    tracer._finish(s)
+
+
+def breakdown(spans: List[Span]) -> List[tuple[str, float, float]]:
+    """
+    Trace ko (indented name, seconds, % of root) rows mein badalta hai
+    (children apne parent ke neeche, start time order mein)
+    """
+    if not spans:
+        return []
+
+    children: Dict[Optional[str], List[Span]] = {}
+    for s in spans:
+        children.setdefault(s.parent_id, []).append(s)
+
+    roots = children.get(None, [])
+    total = sum(r.duration for r in roots) or 1e-9
+
+    rows = []
+
+    def walk(node: Span, depth: int):
+        rows.append(("  " * depth + node.name, node.duration, node.duration / total * 100))
+        for child in children.get(node.span_id, []):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+
+    return rows
+
+
+def format_breakdown(spans: List[Span]) -> str:
+    rows = breakdown(spans)
+    width = max((len(name) for name, _, _ in rows), default=10) + 2
+    lines = [f"{'stage':<{width}}{'ms':>10}{'%':>8}"]
+    lines += [f"{name:<{width}}{seconds * 1000:>10.1f}{pct:>7.1f}%" for name, seconds, pct in rows]
+    return "\n".join(lines)
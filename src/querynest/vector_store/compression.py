@@ -0,0 +1,184 @@
+"""
+This file :
+- Compressed FAISS indexes banana (per-session precision option)
+    float32 → exact IndexFlatL2 (default, 4 bytes / dim)
+    float16 → IndexScalarQuantizer QT_fp16 (2 bytes / dim, ~2x)
+    int8    → IndexScalarQuantizer QT_8bit (1 byte / dim, ~4x)
+    pq      → IndexPQ (d/8 sub-quantizers, ~32x at 8 bits)
+- Build ke time recall-vs-size report banana taaki quality loss dikh sake
+
+Full-precision vectors shared segment store mein rehte hain,
+isliye top candidates ko hamesha exact re-score kiya ja sakta hai.
+Matlab compression RAM (resume par sirf index load hota hai) bachata hai, disk nahi -
+disk par index + float32 copy dono hain, report yahi asli bytes dikhati hai.
+"""
+
+from dataclasses import dataclass
+
+import faiss
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8", "pq")
+
+# PQ training ke liye faiss har centroid ke liye itne points maangta hai
+_PQ_POINTS_PER_CENTROID = 39
+
+
+@dataclass
+class CompressionReport:
+    precision: str
+    vectors: int
+    dim: int
+    # segment store ki float32 copy (re-scoring / export / rechunk reuse ke liye)
+    full_bytes: int
+    # index file (codes + PQ codebooks) - resume par RAM mein bhi itna hi
+    index_bytes: int
+    recall_at_k: float
+    rescored_recall_at_k: float
+    k: int
+    note: str = ""
+
+    @property
+    def disk_bytes(self) -> int:
+        return self.index_bytes + self.full_bytes
+
+    def summary(self) -> str:
+        text = (
+            f"Vectors: {self.precision} index {self.index_bytes / 1e6:.2f} MB in RAM; on disk "
+            f"{self.disk_bytes / 1e6:.2f} MB with the float32 copy kept for re-scoring "
+            f"({self.full_bytes / 1e6:.2f} MB), "
+            f"recall@{self.k} {self.recall_at_k:.3f} "
+            f"(with exact re-scoring {self.rescored_recall_at_k:.3f})"
+        )
+        if self.note:
+            text += f" [{self.note}]"
+        return text
+
+
+def _pq_params(n: int, dim: int) -> tuple[int, int] | None:
+    """
+    (sub-quantizers, bits) - ya None agar itne kam vectors hain ki PQ train na ho sake
+    """
+    nbits = min(8, int(np.log2(max(n, 1) / _PQ_POINTS_PER_CENTROID))) if n else 0
+    if nbits < 4:
+        return None
+
+    # har sub-vector ~8 dims ka (768 → 96 sub-quantizers)
+    m = max(1, dim // 8)
+    while dim % m:
+        m -= 1
+
+    return m, nbits
+
+
+def train_index(vectors: np.ndarray, precision: str) -> tuple[faiss.Index, str]:
+    """
+    Returns: (trained, khaali index, actual precision)
+    PQ ke liye vectors kam ho toh int8 fallback hota hai
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision} (choose from {', '.join(PRECISIONS)})")
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if precision == "pq":
+        params = _pq_params(n, dim)
+        if params is None:
+            precision = "int8"
+        else:
+            m, nbits = params
+            index = faiss.IndexPQ(dim, m, nbits)
+
+    if precision == "float32":
+        index = faiss.IndexFlatL2(dim)
+    elif precision == "float16":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16)
+    elif precision == "int8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit)
+
+    if not index.is_trained:
+        index.train(vectors)
+
+    return index, precision
+
+
+def build_index(vectors: np.ndarray, precision: str) -> tuple[faiss.Index, str]:
+    """
+    Returns: (trained + filled index, actual precision)
+    """
+    index, precision = train_index(vectors, precision)
+    index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    return index, precision
+
+
+def empty_copy(index: faiss.Index) -> faiss.Index:
+    """
+    Same training (PQ codebooks) wala khaali index - naye vectors bina dobara train kiye
+    """
+    copy = faiss.clone_index(index)
+    copy.reset()
+    return copy
+
+
+def exact_rerank(
+    query: np.ndarray, candidates: np.ndarray, vectors: np.ndarray, k: int
+) -> np.ndarray:
+    """
+    Candidate ids ko full-precision L2 distance se re-order karta hai (ek numpy pass)
+    """
+    diffs = vectors - query[None, :]
+    distances = np.einsum("ij,ij->i", diffs, diffs)
+    order = np.argsort(distances, kind="stable")[:k]
+    return candidates[order]
+
+
+def recall_report(
+    vectors: np.ndarray,
+    index: faiss.Index,
+    precision: str,
+    requested: str,
+    k: int = 10,
+    rescore_factor: int = 4,
+    sample: int = 200,
+) -> CompressionReport:
+    """
+    Stored vectors ke sample ko queries bana ke exact vs compressed top-k compare karta hai
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    k = min(k, n)
+
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(n, size=min(sample, n), replace=False)]
+
+    exact = faiss.IndexFlatL2(dim)
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    _, approx = index.search(queries, k)
+    _, candidates = index.search(queries, min(n, k * rescore_factor))
+
+    hits, rescored_hits = 0, 0
+    for q, true_ids, approx_ids, cand_ids in zip(queries, truth, approx, candidates):
+        cand_ids = cand_ids[cand_ids >= 0]
+        reranked = exact_rerank(q, cand_ids, vectors[cand_ids], k)
+
+        true_set = set(true_ids.tolist())
+        hits += len(true_set & set(approx_ids.tolist()))
+        rescored_hits += len(true_set & set(reranked.tolist()))
+
+    total = len(queries) * k
+    note = f"{requested} needs more vectors to train, used {precision}" if precision != requested else ""
+
+    return CompressionReport(
+        precision=precision,
+        vectors=n,
+        dim=dim,
+        full_bytes=n * dim * 4,
+        index_bytes=int(faiss.serialize_index(index).size),
+        recall_at_k=hits / total if total else 1.0,
+        rescored_recall_at_k=rescored_hits / total if total else 1.0,
+        k=k,
+        note=note,
+    )
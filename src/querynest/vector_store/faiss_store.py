@@ -3,25 +3,105 @@ This file :
 - LangChain Community FAISS vector store manage karna
 - Session-based save / load support dena
 - Retriever provide karna (RAG ke liye)
+
+Storage:
+- Chunk text + vectors shared segment store (~/.querynest/segments) mein rehte hain
+- Session folder mein segments-<generation>.json hota hai: har FAISS id ke liye
+  segment key + us session ka chunk metadata
+- Load par index segment store ke vectors se memory mein ban jaata hai (koi re-embedding nahi)
+- Purane sessions (index.faiss + index.pkl) load hote hi segment store mein migrate ho jaate hain
+- Compressed precision (float16 / int8 / pq) wale sessions apna compressed index
+  vectors-<generation>.faiss mein rakhte hain - load par float32 vectors memory mein nahi aate
+- Parent-child sessions ke parent chunks bhi usi segments-<generation>.json mein
+  ("parents": key → text + metadata); children ke metadata["parent"] mein key
+- manifest.json batata hai kaunsi generation current hai (storage/manifest.py);
+  save session lock ke andar hota hai, load bina lock ke
+- Sharded sessions (--shard-size): index kai shards mein (vector_store/shards.py) -
+  har shard ki apni .faiss + .json files, build parallel processes mein,
+  search saare shards par parallel; save sirf badle hue shards likhta hai
+- Scope (/scope): chunk metadata ka in-memory index (retriever/scope.py), pehli scoped
+  search par banta hai; index badalte hi (build / add / remove) invalidate
+- sessions import: restore() archive ke vectors (aur compressed index) se seedha session
 """
 
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 
-from querynest.embeddings.embedder import get_embeddings
+from querynest.embeddings.embedder import InstrumentedEmbeddings, get_embeddings
+from querynest.retriever.adaptive import AdaptiveK
+from querynest.retriever.parent import CHILD_FACTOR, ParentRetriever
+from querynest.retriever.rescoring import (
+    DEFAULT_CANDIDATES,
+    DEFAULT_LEXICAL_WEIGHT,
+    RescoringRetriever,
+)
+from querynest.retriever.scope import MetadataIndex, Scope, ScopedRetriever, scoped_search
+from querynest.storage.atomic import atomic_write_json, session_lock
+from querynest.storage.manifest import (
+    commit_manifest,
+    generation_file,
+    next_generation,
+    read_manifest,
+)
+from querynest.storage.segment_store import SegmentStore, segment_hash
 from querynest.utils.paths import get_session_dir
+from querynest.utils.timing import StageTimer
+from querynest.utils.tracing import span
+from querynest.vector_store.compression import CompressionReport, build_index, recall_report
+from querynest.vector_store.shards import ShardedIndex, build_shards, read_shard, shard_stem
+
+# manifest se pehle ke sessions (unversioned names)
+SEGMENT_REFS_FILE = "segments.json"
+COMPRESSED_INDEX_FILE = "vectors.faiss"
+LEGACY_INDEX_FILES = ("index.faiss", "index.pkl")
+
+# itne chunks ek embed call mein, har batch ke baad segment store mein commit (checkpoint)
+EMBED_BATCH_SIZE = 100
 
 
 class FaissStore:
-    def __init__(self):
-        self.embeddings = get_embeddings()
+    def __init__(self, embeddings=None):
+        # embeddings inject kiye ja sakte hain (benchmarks mein fake provider)
+        self.embeddings = InstrumentedEmbeddings(embeddings or get_embeddings())
 
         # Actual FAISS store (initially None)
         self.store: FAISS | None = None
 
+        self.segments = SegmentStore()
+
+        # "float32" / "float16" / "int8" / "pq" (load ya build ke time set hota hai)
+        self.precision = "float32"
+        # 0 = ek index; warna har shard mein max itne chunks (load ya build ke time)
+        self.shard_size = 0
+
+        # segment keys model-specific hote hain
+        self.model_name = self.embeddings.model
+
+        # load / build / restore ka session - naye embedded segments save tak
+        # isi ke pending refs hote hain (segment_store.py)
+        self.session_id: str | None = None
+
+        # parent-child sessions: parent key → parent chunk (children ke metadata["parent"])
+        self.parents: Dict[str, Document] = {}
+
+        # pichle build / add mein kitne chunks sach mein embed hue (segment store mein nahi mile)
+        self.embedded = 0
+
+        # search filter (retriever/scope.py) - saare retrievers isi ko follow karte hain
+        self.scope = Scope()
+        self._metadata_index: MetadataIndex | None = None
+        self._scope_mask: np.ndarray | None = None
+
     # Load existing session if it exists ofc
     def load(self, session_id: str) -> bool:
         """
@@ -33,54 +113,694 @@ class FaissStore:
         - False -> new session
         """
 
+        self.session_id = session_id
         session_dir = get_session_dir(session_id)
 
         if not session_dir.exists():
             return False
 
-        try:
-            self.store = FAISS.load_local(
-                folder_path=str(session_dir),
-                embeddings=self.embeddings,
-                allow_dangerous_deserialization=True,
+        self._invalidate_metadata()
+
+        with span("index.load") as s:
+            try:
+                manifest = read_manifest(session_dir)
+                sharded = manifest is not None and "shards" in manifest["files"]
+                files = None if sharded else self._current_files(session_dir)
+
+                if sharded:
+                    try:
+                        loaded = self._load_shards(session_dir, manifest)
+                    except FileNotFoundError:
+                        # beech mein nayi generation commit hui - naye manifest se dubara
+                        loaded = self._load_shards(session_dir, read_manifest(session_dir))
+                elif files:
+                    try:
+                        loaded = self._load_from_segments(*files)
+                    except FileNotFoundError:
+                        # load ke beech writer ne nayi generation commit karke
+                        # purani prune kar di - naye manifest se dubara
+                        loaded = self._load_from_segments(*self._current_files(session_dir))
+                else:
+                    # purana format - load karke segment store mein migrate
+                    self.store = FAISS.load_local(
+                        folder_path=str(session_dir),
+                        embeddings=self.embeddings,
+                        allow_dangerous_deserialization=True,
+                    )
+                    self._migrate_legacy(session_id)
+                    loaded = True
+
+            except Exception:
+                loaded = False
+
+            s.set_attribute("loaded", loaded)
+            return loaded
+
+    def _current_files(self, session_dir: Path) -> tuple[Path, Path | None] | None:
+        """
+        (segment refs file, compressed index file ya None) - manifest se,
+        ya manifest se pehle ke sessions ke liye purane naam. Koi nahi → None
+        """
+        manifest = read_manifest(session_dir)
+        if manifest:
+            files = manifest["files"]
+            index = files.get("index")
+            return session_dir / files["segments"], session_dir / index if index else None
+
+        if (session_dir / SEGMENT_REFS_FILE).exists():
+            return session_dir / SEGMENT_REFS_FILE, session_dir / COMPRESSED_INDEX_FILE
+
+        return None
+
+    def _load_from_segments(self, refs_path: Path, index_path: Path | None) -> bool:
+        with open(refs_path, "r", encoding="utf-8") as f:
+            refs = json.load(f)
+
+        chunks = refs["chunks"]
+        if not chunks:
+            return False
+
+        self.parents = {
+            key: Document(**parent) for key, parent in refs.get("parents", {}).items()
+        }
+
+        hashes = [c["segment"] for c in chunks]
+        precision = refs.get("precision", "float32")
+
+        if precision != "float32" and index_path is not None and index_path.exists():
+            # compressed index seedha disk se - sirf texts segment store se
+            texts = self.segments.get_texts(hashes)
+            if len(texts) < len(set(hashes)):
+                return False
+
+            self.store = self._wrap_index(
+                faiss.read_index(str(index_path)),
+                [texts[h] for h in hashes],
+                [c["metadata"] for c in chunks],
             )
+            self.precision = precision
             return True
 
-        except Exception:
+        found = self.segments.get_segments(hashes)
+
+        # koi segment missing hai → index incomplete, naya session maan lo
+        if len(found) < len(set(hashes)):
+            return False
+
+        self.store = FAISS.from_embeddings(
+            text_embeddings=[found[c["segment"]] for c in chunks],
+            embedding=self.embeddings,
+            metadatas=[c["metadata"] for c in chunks],
+        )
+        self.precision = "float32"
+        return True
+
+    def _load_shards(self, session_dir: Path, manifest: dict) -> bool:
+        stems = manifest["files"]["shards"]
+
+        def read(stem: str):
+            with open(session_dir / f"{stem}.json", "r", encoding="utf-8") as f:
+                refs = json.load(f)
+            return refs, read_shard(session_dir / f"{stem}.faiss")
+
+        # shards ek dusre se independent hain - saath mein padho
+        with ThreadPoolExecutor(max_workers=min(len(stems), os.cpu_count() or 1)) as pool:
+            parts = list(pool.map(read, stems))
+
+        chunks = [chunk for refs, _ in parts for chunk in refs["chunks"]]
+        if not chunks:
             return False
 
+        hashes = [c["segment"] for c in chunks]
+        texts = self.segments.get_texts(hashes)
+        if len(texts) < len(set(hashes)):
+            return False
+
+        self.parents = {
+            key: Document(**parent)
+            for refs, _ in parts
+            for key, parent in refs.get("parents", {}).items()
+        }
+        self.precision = manifest.get("precision", "float32")
+        self.shard_size = manifest["shard_size"]
+
+        index = ShardedIndex(
+            [shard for _, shard in parts],
+            self.shard_size,
+            self.precision,
+            stems=list(stems),
+            directory=session_dir,
+        )
+        self.store = self._wrap_index(
+            index, [texts[h] for h in hashes], [c["metadata"] for c in chunks]
+        )
+        return True
+
+    def _wrap_index(self, index, texts: List[str], metadatas: List[dict]) -> FAISS:
+        """
+        Kisi bhi faiss index ko LangChain FAISS store mein wrap karta hai
+        (ids index order mein)
+        """
+        ids = [str(uuid.uuid4()) for _ in texts]
+        docstore = InMemoryDocstore(
+            {
+                doc_id: Document(page_content=text, metadata=metadata)
+                for doc_id, text, metadata in zip(ids, texts, metadatas)
+            }
+        )
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=dict(enumerate(ids)),
+        )
+
+    def full_vectors(self, documents: List[Document]) -> np.ndarray:
+        """
+        Documents ke full-precision (float32) vectors, segment store se
+        """
+        hashes = [segment_hash(self.model_name, doc.page_content) for doc in documents]
+        found = self.segments.get_vectors(hashes)
+        return np.vstack([found[h] for h in hashes])
+
+    def _migrate_legacy(self, session_id: str):
+        """
+        index.faiss ke vectors segment store mein daal ke refs file likh deta hai
+        """
+        documents = self.documents()
+        vectors = self.store.index.reconstruct_n(0, self.store.index.ntotal)
+
+        self.segments.put(
+            self.model_name,
+            (
+                (segment_hash(self.model_name, doc.page_content), doc.page_content, vec)
+                for doc, vec in zip(documents, vectors)
+            ),
+            owner=session_id,
+        )
+        self.save(session_id)
+
+    def _embed(self, texts: List[str], progress=None, on_batch=None) -> List[np.ndarray]:
+        """
+        Sirf wahi texts embed hote hain jo segment store mein pehle se nahi hain
+        (kisi bhi session ne pehle embed kiye ho toh reuse).
+
+        Har batch ke vectors turant segment store mein commit hote hain (session ke
+        pending refs ke saath) - beech mein fail / Ctrl-C ho toh rerun wahin se aage badhta hai.
+        progress(done, total) har batch ke baad call hota hai.
+        on_batch(positions, vectors): jin texts ke vectors ab ready hain (progressive indexing)
+        """
+        hashes = [segment_hash(self.model_name, text) for text in texts]
+        if self.session_id:
+            # reuse hone wale unreferenced segments bhi save tak gc sweep se bache
+            self.segments.hold(self.session_id, hashes)
+        found = self.segments.get_vectors(hashes)
+
+        missing = {}
+        positions = {}
+        for i, (h, text) in enumerate(zip(hashes, texts)):
+            if h not in found:
+                missing.setdefault(h, text)
+                positions.setdefault(h, []).append(i)
+
+        total = len(found) + len(missing)
+        self.embedded = len(missing)
+        if progress:
+            progress(len(found), total)
+        if on_batch:
+            ready = [i for i, h in enumerate(hashes) if h in found]
+            if ready:
+                on_batch(ready, [found[hashes[i]] for i in ready])
+
+        pending = list(missing.items())
+        for i in range(0, len(pending), EMBED_BATCH_SIZE):
+            batch = pending[i : i + EMBED_BATCH_SIZE]
+            vectors = self.embeddings.embed_documents([text for _, text in batch])
+            rows = [
+                (h, text, np.asarray(vec, dtype=np.float32))
+                for (h, text), vec in zip(batch, vectors)
+            ]
+            self.segments.put(self.model_name, rows, owner=self.session_id)
+            found.update({h: vec for h, _, vec in rows})
+
+            if progress:
+                progress(len(found), total)
+            if on_batch:
+                ready = [(i, vec) for h, _, vec in rows for i in positions[h]]
+                on_batch([i for i, _ in ready], [vec for _, vec in ready])
+
+        return [found[h] for h in hashes]
+
     # Build new index
 
-    def build(self, documents: List[Document], session_id: str):
+    def build(
+        self,
+        documents: List[Document],
+        session_id: str,
+        precision: str = "float32",
+        progress=None,
+        on_batch=None,
+        parents: Dict[str, Document] | None = None,
+        shard_size: int = 0,
+        timer: StageTimer | None = None,
+    ) -> CompressionReport | None:
         """
         Naya FAISS index banata hai using LangChain Documents
         aur disk par save karta hai.
+
+        precision != "float32" ho toh compressed index banta hai aur
+        recall-vs-size report return hoti hai
+
+        progress(done, total): embedding progress (already stored chunks pehle se done)
+        on_batch(documents, vectors): har embedded batch ke chunks + vectors
+        (index save hone se pehle partial index ke liye)
+
+        parents: parent-child sessions (documents = children), pipeline.split_children se
+
+        shard_size > 0: index shard_size chunks ke shards mein, har shard alag process
+        mein banta hai (compression report pehle shard ki)
+
+        timer: embed / index / save stages ka time (session build stats)
         """
 
         if not documents:
             raise ValueError("No documents provided to build FAISS index")
 
-        self.store = FAISS.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-        )
+        timer = timer or StageTimer()
 
-        self.save(session_id)
+        self.session_id = session_id
+        self.parents.clear()
+        self.parents.update(parents or {})
+        self._invalidate_metadata()
+
+        with span("index.build", chunks=len(documents), precision=precision):
+            texts = [doc.page_content for doc in documents]
+
+            def batch_hook(positions, vectors):
+                on_batch([documents[i] for i in positions], vectors)
+
+            with timer.stage("embed"):
+                vectors = self._embed(texts, progress, batch_hook if on_batch else None)
+            if shard_size:
+                # shard workers vectors segment store se khud padhte hain
+                del vectors
+                return self._build_sharded(documents, session_id, precision, shard_size, timer)
+
+            report = None
+
+            with timer.stage("index"):
+                if precision == "float32":
+                    self.store = FAISS.from_embeddings(
+                        text_embeddings=list(zip(texts, vectors)),
+                        embedding=self.embeddings,
+                        metadatas=[doc.metadata for doc in documents],
+                    )
+                    self.precision = "float32"
+                else:
+                    matrix = np.vstack(vectors)
+                    index, actual = build_index(matrix, precision)
+                    report = recall_report(matrix, index, actual, precision)
+
+                    self.store = self._wrap_index(
+                        index, texts, [doc.metadata for doc in documents]
+                    )
+                    self.precision = actual
+
+            self.shard_size = 0
+            with timer.stage("save"):
+                self.save(session_id)
+            return report
+
+    def _build_sharded(
+        self,
+        documents: List[Document],
+        session_id: str,
+        precision: str,
+        shard_size: int,
+        timer: StageTimer,
+    ) -> CompressionReport | None:
+        session_dir = get_session_dir(session_id)
+        hashes = [segment_hash(self.model_name, doc.page_content) for doc in documents]
+
+        # workers isi generation ke naam se shard files likhte hain, save usi ko commit karta hai
+        with session_lock(session_dir):
+            generation = next_generation(session_dir)
+            shards = -(-len(documents) // shard_size)
+
+            with span("index.shards", shards=shards, shard_size=shard_size), timer.stage("index"):
+                stems, actual, report = build_shards(
+                    self.segments.db_path, hashes, shard_size, precision, session_dir, generation
+                )
+            # pichli crashed build ke isi generation wale refs (save unhe reuse na kare)
+            for stem in stems:
+                (session_dir / f"{stem}.json").unlink(missing_ok=True)
+
+            index = ShardedIndex(
+                [read_shard(session_dir / f"{stem}.faiss") for stem in stems],
+                shard_size,
+                actual,
+                stems=stems,
+                directory=session_dir,
+            )
+            self.store = self._wrap_index(
+                index, [doc.page_content for doc in documents], [doc.metadata for doc in documents]
+            )
+            self.precision = actual
+            self.shard_size = shard_size
+            with timer.stage("save"):
+                self.save(session_id)
+
+        if report:
+            report.note = f"shard 1 of {shards}" + (f", {report.note}" if report.note else "")
+        return report
+
+    def restore(
+        self,
+        session_id: str,
+        documents: List[Document],
+        vectors: np.ndarray,
+        parents: Dict[str, Document] | None = None,
+        precision: str = "float32",
+        shard_size: int = 0,
+        indexes: List[faiss.Index] | None = None,
+        timer: StageTimer | None = None,
+    ):
+        """
+        Already embedded chunks se session (sessions import) - koi embedding / training nahi.
+        vectors: (n, d) float32, archive se mmap bhi ho sakta hai
+        indexes: compressed sessions ke saved faiss index (sharded ho toh har shard ka ek);
+        None → float32 index seedha vectors se
+        timer: segments / index / save stages ka time
+        """
+        timer = timer or StageTimer()
+        texts = [doc.page_content for doc in documents]
+        self.session_id = session_id
+
+        with timer.stage("segments"):
+            self.segments.put(
+                self.model_name,
+                (
+                    (segment_hash(self.model_name, text), text, vec)
+                    for text, vec in zip(texts, vectors)
+                ),
+                owner=session_id,
+            )
+
+        self.parents.clear()
+        self.parents.update(parents or {})
+        self._invalidate_metadata()
+        self.embedded = 0
+
+        with timer.stage("index"):
+            if indexes is None:
+                step = shard_size or len(texts)
+                indexes = [
+                    build_index(vectors[i : i + step], "float32")[0]
+                    for i in range(0, len(texts), step)
+                ]
+
+            if shard_size:
+                index = ShardedIndex(indexes, shard_size, precision)
+            else:
+                index = indexes[0]
+
+            self.store = self._wrap_index(index, texts, [doc.metadata for doc in documents])
+
+        self.precision = precision
+        self.shard_size = shard_size
+        with timer.stage("save"):
+            self.save(session_id)
 
     # Save the current faiss session to didsk
     def save(self, session_id: str):
+        """
+        Session folder mein nayi generation (segment references + metadata,
+        compressed index) likh ke manifest flip karta hai,
+        aur segment store mein is session ke refs update karta hai
+        """
         if not self.store:
             raise RuntimeError("FAISS store not initialized")
 
         session_dir = get_session_dir(session_id)
-        self.store.save_local(str(session_dir))
+
+        with span("index.save"), session_lock(session_dir):
+            documents = self.documents()
+            hashes = [segment_hash(self.model_name, doc.page_content) for doc in documents]
+            generation = next_generation(session_dir)
+
+            parents = {}
+            if self.parents:
+                # sirf wahi parents jinke children abhi index mein hain (refresh ke baad prune)
+                # (in-place - ParentRetriever isi dict ko padhta hai)
+                live = {doc.metadata.get("parent") for doc in documents}
+                for key in [key for key in self.parents if key not in live]:
+                    del self.parents[key]
+                parents = {
+                    key: {"page_content": p.page_content, "metadata": p.metadata}
+                    for key, p in self.parents.items()
+                }
+
+            info = {}
+            if isinstance(self.store.index, ShardedIndex):
+                files = {
+                    "shards": self._save_shards(session_dir, generation, documents, hashes, parents)
+                }
+                info["shard_size"] = self.shard_size
+            else:
+                refs = {
+                    "version": 1,
+                    "model": self.model_name,
+                    "precision": self.precision,
+                    "chunks": [
+                        {"segment": h, "metadata": doc.metadata}
+                        for h, doc in zip(hashes, documents)
+                    ],
+                }
+                if parents:
+                    refs["parents"] = parents
+                refs_name = generation_file("segments", generation)
+                atomic_write_json(session_dir / refs_name, refs, default=str)
+
+                index_name = None
+                if self.precision != "float32":
+                    # float32 index segment store ke vectors se hi ban jaata hai
+                    index_name = generation_file("vectors", generation)
+                    tmp = session_dir / f".{index_name}.tmp"
+                    faiss.write_index(self.store.index, str(tmp))
+                    os.replace(tmp, session_dir / index_name)
+
+                files = {"segments": refs_name, "index": index_name}
+
+            # crash kahin bhi ho, current generation ke segments hamesha referenced rahein:
+            # naye refs add → manifest flip → purane refs drop
+            self.segments.add_session_refs(session_id, hashes)
+            commit_manifest(
+                session_dir,
+                generation,
+                files,
+                model=self.model_name,
+                precision=self.precision,
+                chunks=len(documents),
+                **info,
+            )
+            self.segments.set_session_refs(session_id, hashes)
+            # naye segments ab refs se held hain
+            self.segments.release_pending(session_id)
+
+            # manifest se pehle ke / migrate ho chuke files ki zarurat nahi
+            for name in (SEGMENT_REFS_FILE, COMPRESSED_INDEX_FILE, *LEGACY_INDEX_FILES):
+                (session_dir / name).unlink(missing_ok=True)
+
+    def _save_shards(
+        self,
+        session_dir: Path,
+        generation: int,
+        documents: List[Document],
+        hashes: List[str],
+        parents: dict,
+    ) -> List[str]:
+        """
+        Sirf badle hue / naye shards ki files likhta hai, baaki pichli generation se reuse.
+        Returns: manifest ke liye shard stems (id order mein)
+        """
+        index: ShardedIndex = self.store.index
+        index.directory = session_dir
+        offsets = index.offsets()
+
+        for slot, shard in enumerate(index.shards):
+            stem = index.stems[slot]
+            index_exists = stem is not None and (session_dir / f"{stem}.faiss").exists()
+            if index_exists and (session_dir / f"{stem}.json").exists():
+                continue
+
+            if not index_exists:
+                # badla hua shard (ya dusre writer ne purani file prune kar di)
+                stem = shard_stem(slot, generation)
+                index.write_shard(slot, stem)
+
+            start, end = offsets[slot], offsets[slot] + shard.ntotal
+            refs = {
+                "version": 1,
+                "model": self.model_name,
+                "precision": self.precision,
+                "chunks": [
+                    {"segment": h, "metadata": doc.metadata}
+                    for h, doc in zip(hashes[start:end], documents[start:end])
+                ],
+            }
+            keys = {doc.metadata.get("parent") for doc in documents[start:end]}
+            shard_parents = {key: parents[key] for key in keys if key in parents}
+            if shard_parents:
+                refs["parents"] = shard_parents
+            atomic_write_json(session_dir / f"{stem}.json", refs, default=str)
+
+        return list(index.stems)
+
+    # Incremental updates (web refresh jaise cases ke liye)
+    def remove_source(self, source: str) -> int:
+        """
+        Ek source (eg. ek URL) ke saare chunks index se hata deta hai.
+        Returns: kitne chunks hataye
+        """
+        if not self.store:
+            raise RuntimeError("FAISS store not initialized")
+
+        ids = [
+            doc_id
+            for doc_id in self.store.index_to_docstore_id.values()
+            if self.store.docstore.search(doc_id).metadata.get("source") == source
+        ]
+
+        if ids:
+            self.store.delete(ids)
+            self._invalidate_metadata()
+
+        return len(ids)
+
+    def parent_documents(self) -> List[Document]:
+        """
+        Parent-child sessions mein parents, warna index ke chunks
+        (refresh ke time dedup reference)
+        """
+        return list(self.parents.values()) if self.parents else self.documents()
+
+    def documents(self) -> List[Document]:
+        """
+        Index mein stored saare chunks (docstore order mein)
+        """
+        if not self.store:
+            raise RuntimeError("FAISS store not initialized")
+
+        return [
+            self.store.docstore.search(doc_id)
+            for doc_id in self.store.index_to_docstore_id.values()
+        ]
+
+    def add_documents(
+        self, documents: List[Document], parents: Dict[str, Document] | None = None
+    ):
+        """
+        Existing index mein naye chunks embed karke add karta hai
+        (parent-child sessions mein children + unke parents)
+        """
+        if not self.store:
+            raise RuntimeError("FAISS store not initialized")
+
+        self.parents.update(parents or {})
+
+        if documents:
+            texts = [doc.page_content for doc in documents]
+            self.store.add_embeddings(
+                text_embeddings=list(zip(texts, self._embed(texts))),
+                metadatas=[doc.metadata for doc in documents],
+            )
+            self._invalidate_metadata()
+            # refresh build stats - yahan segment store se reuse nahi, sab embed hote hain
+            self.embedded += len(documents)
+
+    # Metadata filtering (/scope)
+
+    def _invalidate_metadata(self):
+        self._metadata_index = None
+        self._scope_mask = None
+
+    def set_scope(self, scope: Scope):
+        self.scope = scope
+        self._scope_mask = None
+
+    def metadata_index(self) -> MetadataIndex:
+        if self._metadata_index is None:
+            with span("index.metadata", chunks=self.store.index.ntotal):
+                self._metadata_index = MetadataIndex.build(
+                    [doc.metadata for doc in self.documents()]
+                )
+        return self._metadata_index
+
+    def search(self, query_vec, n: int) -> np.ndarray:
+        """
+        Top-n FAISS ids (best pehle), current scope ke andar -
+        filter FAISS search ke andar hi lagta hai
+        """
+        mask = None
+        if self.scope.active:
+            if self._scope_mask is None:
+                self._scope_mask = self.metadata_index().mask(self.scope)
+            mask = self._scope_mask
+
+        return scoped_search(self.store.index, query_vec, n, mask)
+
+    def documents_by_ids(self, ids) -> List[Document]:
+        return [self.store.docstore.search(self.store.index_to_docstore_id[i]) for i in ids]
 
     # Retriever is returned by this
-    def get_retriever(self, k: int = 4):
+    def get_retriever(
+        self,
+        k: int = 4,
+        rescore: bool = False,
+        candidates: int = DEFAULT_CANDIDATES,
+        lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+        adaptive: AdaptiveK | None = None,
+        log_path: Path | None = None,
+    ):
+        """
+        rescore=True: two-stage retrieval - index se `candidates` chunks,
+        phir full-precision vectors + lexical overlap se exact re-scoring
+
+        adaptive: fixed k ki jagah min_k..max_k, exact similarity scores ke cutoffs se
+        (rescore ke bina: sirf max_k candidates, lexical weight 0)
+
+        Parent-child sessions: upar wala retriever children dhoondhta hai,
+        result unke unique parents hote hain
+
+        Har retriever search ke time self.scope follow karta hai (set_scope se badalta hai)
+        """
         if not self.store:
             raise RuntimeError("FAISS store not initialized")
 
-        return self.store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": k},
-        )
+        if self.parents:
+            base = self._child_retriever(
+                k if adaptive else k * CHILD_FACTOR,
+                rescore,
+                candidates,
+                lexical_weight,
+                adaptive,
+                log_path,
+            )
+            return ParentRetriever(base=base, parents=self.parents, k=None if adaptive else k)
+
+        return self._child_retriever(k, rescore, candidates, lexical_weight, adaptive, log_path)
+
+    def _child_retriever(self, k, rescore, candidates, lexical_weight, adaptive, log_path):
+        if rescore or adaptive:
+            if adaptive:
+                k = adaptive.max_k
+            return RescoringRetriever(
+                store=self,
+                k=k,
+                candidates=candidates if rescore else k,
+                lexical_weight=lexical_weight if rescore else 0.0,
+                adaptive=adaptive,
+                log_path=log_path,
+            )
+
+        return ScopedRetriever(store=self, k=k)
@@ -0,0 +1,305 @@
+"""
+This file :
+- Bade sessions ka sharded FAISS index (--shard-size)
+- Har shard apna alag faiss index file hai: alag se load / mmap ho sakta hai
+    shard-0003-000007.faiss  (index)
+    shard-0003-000007.json   (us shard ke chunk refs + metadata + parents)
+  naam = slot + jis generation mein wo shard likha gaya; badla nahi toh agli
+  generations wahi files reuse karti hain (append sirf aakhri / naye shard ko likhta hai)
+- Build: har shard alag worker process mein (vectors seedha segment store se, parent
+  process ko poora matrix nahi chahiye), files seedha session folder mein
+- Precision poore session ki ek: PQ pehle shard par ek baar train hota hai aur saare
+  shards (baad mein append hue bhi) wahi codebooks use karte hain - chhota aakhri shard
+  apna alag int8 fallback nahi chunta
+- Search: saare shards threads mein parallel (faiss search GIL chhod deta hai),
+  har shard ka top-n, phir merge karke global top-n
+- ShardedIndex faiss index jaisa hi dikhta hai (d, ntotal, search, add, remove_ids,
+  reconstruct_batch) - LangChain FAISS isko normal index ki tarah wrap karta hai
+
+Global FAISS id = shard offset + shard ke andar ki position (LangChain ka id order).
+faiss ke naye versions mein flat shards sach mein mmap hote hain (IO_FLAG_MMAP_IFC);
+purane versions file poori padhte hain.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from querynest.retriever.scope import scored_search
+from querynest.storage.segment_store import SegmentStore
+from querynest.vector_store.compression import (
+    CompressionReport,
+    build_index,
+    empty_copy,
+    recall_report,
+    train_index,
+)
+
+# naye faiss mein flat codes ka asli mmap, purane mein IVF lists wala flag (flat ke liye no-op)
+_MMAP_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+# shard search ke threads (process bhar mein ek pool)
+_search_pool: Optional[ThreadPoolExecutor] = None
+
+# shard build ke liye kitne cores (None = saare) - querynest index ke workers apna hissa set karte hain
+_build_cpus: Optional[int] = None
+
+
+def limit_build_cpus(cpus: int):
+    """
+    Is process ke shard builds max itne cores use karein (processes × faiss threads)
+    """
+    global _build_cpus
+    _build_cpus = max(1, cpus)
+
+
+def shard_stem(slot: int, generation: int) -> str:
+    return f"shard-{slot:04d}-{generation:06d}"
+
+
+def read_shard(path: Path, mmap: bool = True) -> faiss.Index:
+    return faiss.read_index(str(path), _MMAP_FLAG if mmap else 0)
+
+
+def _write_index(index: faiss.Index, path: Path):
+    tmp = path.with_name(f".{path.name}.tmp")
+    faiss.write_index(index, str(tmp))
+    os.replace(tmp, path)
+
+
+def _load_matrix(db_path: str, hashes: List[str]) -> np.ndarray:
+    found = SegmentStore(Path(db_path)).get_vectors(hashes)
+    return np.vstack([found[h] for h in hashes])
+
+
+def _build_shard(
+    db_path: str,
+    hashes: List[str],
+    precision: str,
+    requested: str,
+    trained: Optional[bytes],
+    path: str,
+    threads: int,
+    report: bool,
+) -> Optional[CompressionReport]:
+    """
+    Worker process: segment store se vectors → index → file.
+    trained: serialized khaali PQ index (sab shards ke shared codebooks), warna shard khud train
+    Returns: compression report - sirf pehle shard ke liye
+    """
+    faiss.omp_set_num_threads(threads)
+
+    matrix = _load_matrix(db_path, hashes)
+    if trained is not None:
+        index = faiss.deserialize_index(np.frombuffer(trained, dtype=np.uint8))
+        index.add(matrix)
+    else:
+        index, _ = build_index(matrix, precision)
+    _write_index(index, Path(path))
+
+    if report and precision != "float32":
+        return recall_report(matrix, index, precision, requested)
+    return None
+
+
+def build_shards(
+    db_path: Path,
+    hashes: List[str],
+    shard_size: int,
+    precision: str,
+    directory: Path,
+    generation: int,
+) -> Tuple[List[str], str, Optional[CompressionReport]]:
+    """
+    hashes ko shard_size ke tukdon mein baant ke har shard parallel mein build.
+    Returns: (shard stems, session ki actual precision - har shard ki yahi, pehle shard ki report)
+    """
+    slices = [hashes[i : i + shard_size] for i in range(0, len(hashes), shard_size)]
+    stems = [shard_stem(slot, generation) for slot in range(len(slices))]
+    paths = [str(directory / f"{stem}.faiss") for stem in stems]
+
+    cpus = _build_cpus or os.cpu_count() or 1
+
+    # precision yahin ek baar: PQ pehle (poore) shard par train, warna sabke liye int8 fallback
+    actual, trained = precision, None
+    if precision == "pq":
+        faiss.omp_set_num_threads(cpus)
+        index, actual = train_index(_load_matrix(str(db_path), slices[0]), precision)
+        if actual == "pq":
+            trained = faiss.serialize_index(index).tobytes()
+
+    workers = max(1, min(len(slices), cpus))
+    threads = max(1, cpus // workers)
+    jobs = [
+        (str(db_path), part, actual, precision, trained, path, threads, slot == 0)
+        for slot, (part, path) in enumerate(zip(slices, paths))
+    ]
+
+    if workers == 1:
+        results = [_build_shard(*job) for job in jobs]
+    else:
+        # spawn: parent ke faiss / OpenMP threads fork ke saath safe nahi hain
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_build_shard, *zip(*jobs)))
+
+    return stems, actual, results[0]
+
+
+class ShardedIndex:
+    def __init__(
+        self,
+        shards: List[faiss.Index],
+        shard_size: int,
+        precision: str,
+        stems: List[Optional[str]] | None = None,
+        directory: Path | None = None,
+    ):
+        self.shards = shards
+        # har shard mein max itne vectors (add ke time naya shard)
+        self.shard_size = shard_size
+        # naye shards isi precision se bante hain
+        self.precision = precision
+        # disk par shard kis file se hai - None = memory mein badla, save par likhna hai
+        self.stems: List[Optional[str]] = stems or [None] * len(shards)
+        self.directory = directory
+        # mmap se khule shards (modify karne se pehle normal read)
+        self._mapped = [stem is not None for stem in self.stems]
+
+    @property
+    def d(self) -> int:
+        return self.shards[0].d
+
+    @property
+    def ntotal(self) -> int:
+        return sum(shard.ntotal for shard in self.shards)
+
+    @property
+    def is_trained(self) -> bool:
+        return True
+
+    @property
+    def metric_type(self):
+        return self.shards[0].metric_type
+
+    def offsets(self) -> np.ndarray:
+        """
+        Har shard ka pehla global id
+        """
+        return np.cumsum([0] + [shard.ntotal for shard in self.shards[:-1]], dtype=np.int64)
+
+    def _locate(self, ids) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.asarray(ids, dtype=np.int64)
+        slots = np.searchsorted(self.offsets(), ids, side="right") - 1
+        return slots, ids - self.offsets()[slots]
+
+    # Search
+
+    def scored_search(
+        self, query: np.ndarray, n: int, mask: np.ndarray | None = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (distances, global ids) - har shard par parallel search, phir merge.
+        mask: global id mask (scope) - har shard ko apna hissa milta hai
+        """
+        global _search_pool
+        offsets = self.offsets()
+
+        def search_shard(slot: int):
+            shard = self.shards[slot]
+            part = None if mask is None else mask[offsets[slot] : offsets[slot] + shard.ntotal]
+            distances, ids = scored_search(shard, query, n, part)
+            return distances, ids + offsets[slot]
+
+        workers = min(len(self.shards), os.cpu_count() or 1)
+        if workers == 1:
+            # ek core par thread handoff search se mehenga padta hai
+            results = [search_shard(slot) for slot in range(len(self.shards))]
+        else:
+            if _search_pool is None:
+                _search_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+            results = list(_search_pool.map(search_shard, range(len(self.shards))))
+
+        distances = np.concatenate([d for d, _ in results])
+        ids = np.concatenate([i for _, i in results])
+        order = np.argsort(distances, kind="stable")[:n]
+        return distances[order], ids[order]
+
+    def search(self, x, k: int, params=None):
+        # LangChain FAISS wrapper isi faiss signature ko call karta hai
+        x = np.asarray(x, dtype=np.float32)
+        distances = np.full((len(x), k), np.inf, dtype=np.float32)
+        labels = np.full((len(x), k), -1, dtype=np.int64)
+
+        for row, query in enumerate(x):
+            d, i = self.scored_search(query, k)
+            distances[row, : len(d)] = d
+            labels[row, : len(i)] = i
+
+        return distances, labels
+
+    def reconstruct_batch(self, ids) -> np.ndarray:
+        slots, local = self._locate(ids)
+        vectors = np.empty((len(slots), self.d), dtype=np.float32)
+        for slot in np.unique(slots):
+            rows = np.flatnonzero(slots == slot)
+            vectors[rows] = self.shards[slot].reconstruct_batch(local[rows])
+        return vectors
+
+    def reconstruct_n(self, start: int, count: int) -> np.ndarray:
+        return self.reconstruct_batch(np.arange(start, start + count))
+
+    # Updates (refresh / add_documents) - sirf jo shards badle wahi dubara likhe jaate hain
+
+    def _writable(self, slot: int) -> faiss.Index:
+        if self._mapped[slot] and self.directory is not None and self.stems[slot]:
+            self.shards[slot] = read_shard(self.directory / f"{self.stems[slot]}.faiss", mmap=False)
+            self._mapped[slot] = False
+        self.stems[slot] = None
+        return self.shards[slot]
+
+    def add(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+
+        # pehle aakhri shard bharo, phir naye shards
+        room = self.shard_size - self.shards[-1].ntotal
+        if room > 0:
+            self._writable(len(self.shards) - 1).add(x[:room])
+            x = x[room:]
+
+        for i in range(0, len(x), self.shard_size):
+            part = x[i : i + self.shard_size]
+            if self.precision == "pq":
+                # pehle shard ke codebooks - chhota naya shard int8 par fallback na kare
+                index = empty_copy(self.shards[0])
+                index.add(part)
+            else:
+                index, _ = build_index(part, self.precision)
+            self.shards.append(index)
+            self.stems.append(None)
+            self._mapped.append(False)
+
+    def remove_ids(self, ids) -> int:
+        slots, local = self._locate(ids)
+        removed = 0
+        for slot in np.unique(slots):
+            removed += self._writable(slot).remove_ids(local[slots == slot])
+
+        # khaali shards hata do (kam se kam ek rehta hai - d ke liye)
+        keep = [i for i, shard in enumerate(self.shards) if shard.ntotal] or [0]
+        self.shards = [self.shards[i] for i in keep]
+        self.stems = [self.stems[i] for i in keep]
+        self._mapped = [self._mapped[i] for i in keep]
+        return removed
+
+    def write_shard(self, slot: int, stem: str):
+        """
+        save(): badla hua shard nayi file mein (purani file pichli generation ke readers ke liye)
+        """
+        _write_index(self.shards[slot], self.directory / f"{stem}.faiss")
+        self.stems[slot] = stem